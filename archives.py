@@ -0,0 +1,69 @@
+"""
+single entry point for the archives scripts: python3 archives.py <command> [options]
+
+    python3 archives.py --help                 list the commands
+    python3 archives.py dacs-fix --help        options of one command
+    python3 archives.py dacs-fix in.xml out.xml --backend lxml
+
+each command runs the main() of its script with the rest of the command
+line; the script (and bs4, lxml, pandas, holidays... behind it) is only
+imported when its command runs, so listing the commands or running a small
+one doesn't pay for the others. benchmarks/bench_startup.py keeps an eye
+on the import time of every command
+"""
+import importlib
+import os
+import sys
+
+# the project calculators live in project_management/ and import each other by name
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "project_management")
+
+# command: (module, description)
+COMMANDS = {
+    "dacs-fix": ("dacs_date_fixer", "Rewrite <unitdate> text as DACS dates"),
+    "folder-fix": ("folder_format_fixer", "Fix folder number ranges"),
+    "title-date": ("title-date_combine", "Move dates from <unittitle> into <unitdate>"),
+    "title-fix": ("title_fix_ead", "Capitalize each word of <unittitle>"),
+    "tag-delete": ("tag_deleter", "Remove tags and their content"),
+    "pipeline": ("ead_pipeline", "Run several EAD fixes on one parse"),
+    "batch": ("ead_batch", "Run the EAD pipeline over many files in parallel"),
+    "shards": ("ead_shards", "Run the EAD pipeline on one large file, split over several processes"),
+    "export-components": ("export-components", "Export EAD components to CSV"),
+    "er-to-csv": ("er_json_to_csv", "Convert an FTK JSON export to CSV"),
+    "er-batch": ("er_json_batch", "Convert many FTK JSON exports into one CSV"),
+    "title-tag": ("title_tag_adder", "Wrap spreadsheet columns in <title> tags"),
+    "plan": ("ap_project_planner", "Estimate a processing project's effort and end date"),
+    "schedule": ("portfolio_scheduler", "Schedule many processing projects over shared staff"),
+    "end-date": ("project_calculator", "End date after a number of working days"),
+    "hybrid-end-date": ("hybrid_project_calculator", "End date for a project worked on some weekdays only"),
+    "project-days": ("project_days_calculator", "Working days between two dates"),
+}
+
+def usage():
+    prog = os.path.basename(sys.argv[0])
+    width = max(len(command) for command in COMMANDS)
+    lines = [f"usage: {prog} <command> [options]", "", "commands:"]
+    lines += [f"  {command:<{width}}  {description}" for command, (_, description) in COMMANDS.items()]
+    lines += ["", f"run '{prog} <command> --help' for the options of a command"]
+    return "\n".join(lines)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"Error: Unknown command '{command}'.\n\n{usage()}")
+        return 2
+
+    if PROJECT_DIR not in sys.path:
+        sys.path.append(PROJECT_DIR)
+    module = importlib.import_module(COMMANDS[command][0])
+    # the command's own usage and error messages (and --stats argv) read like it was run directly
+    sys.argv = [f"{os.path.basename(sys.argv[0])} {command}", *rest]
+    return module.main(rest)
+
+if __name__ == "__main__":
+    sys.exit(main())
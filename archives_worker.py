@@ -0,0 +1,308 @@
+"""
+resident worker for the archives scripts: one long-running process answers
+many small jobs, so the imports (bs4, lxml, holidays...) and the holiday
+tables are loaded once instead of on every call
+
+    python3 archives_worker.py                              JSON lines on stdin, answers on stdout
+    python3 archives_worker.py --socket /tmp/archives.sock  the same protocol on a Unix socket
+
+every request is one line of JSON, every response one line of JSON with
+the same id; requests run in a pool of --workers processes (each with
+everything imported and warmed up), so responses can come back out of order
+
+    {"id": 1, "method": "update_unitdate_text", "params": {"xml": "<ead>...</ead>"}}
+    {"id": 1, "result": "<ead>...</ead>"}
+    {"id": 2, "error": {"type": "ValueError", "message": "..."}}
+
+anything a script prints while handling a request comes back in "output"
+
+methods and their params (files are paths on this machine):
+    update_unitdate_text     xml, or input_file + output_file; backend (bs4)
+    fix_folder_ranges        xml, or input_file + output_file; backend (bs4)
+    extract_ead_data_to_csv  xml_file, csv_file; backend (bs4), stream (false)
+    flatten_json             json (an FTK export), or input_file (+ output_file to write the CSV)
+    end_date                 start_date (MM/DD/YY), duration
+    hybrid_end_date          start_date (MM/DD/YY), duration, days_per_week, working_days ([0, 2, 4])
+    working_days             start_date, end_date (MM/DD/YY), working_days (Mon-Fri)
+    completion_date          start_date (YYYY-MM-DD), working_days, work_days ([0, 1, 2, 3, 4])
+    ping, methods
+"""
+import argparse
+import contextlib
+import datetime
+import importlib
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "project_management"))
+
+# modules a worker imports before its first request
+MODULES = [
+    "dacs_date_fixer", "folder_format_fixer", "export-components", "er_json_to_csv",
+    "project_calculator", "hybrid_project_calculator", "project_days_calculator", "ap_project_planner",
+    "holiday_calendars",
+]
+
+def _module(name):
+    return importlib.import_module(name)
+
+def warm():
+    """Imports every module and builds this year's holiday tables (pool initializer)."""
+    for name in MODULES:
+        _module(name)
+    year = datetime.date.today().year
+    calendars = _module("holiday_calendars")
+    calendars.us_holidays(year, year + 4)
+    calendars.us_holidays().get(datetime.date(year, 1, 1))
+
+def warm_process():
+    """Pool initializer of a worker process: SIGTERM kills it outright, as it would without the handler in main."""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    warm()
+
+def _param(params, name):
+    if name not in params:
+        raise ValueError(f"Missing parameter '{name}'")
+    return params[name]
+
+def _checked(result):
+    """The calculators return their errors as text; turn them into error responses."""
+    if isinstance(result, str) and "Error:" in result:
+        raise ValueError(result.split("Error:", 1)[1].strip())
+    return result
+
+def _call_reporting_errors(function, *args):
+    """Calls a function that prints its errors instead of raising them, and raises the first one."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = function(*args)
+    print(output.getvalue(), end="")
+    errors = [line for line in output.getvalue().splitlines() if line.startswith("Error")]
+    if errors:
+        raise ValueError(errors[0].split(":", 1)[1].strip() if ":" in errors[0] else errors[0])
+    return result
+
+def _transform_xml(params, transform):
+    backend = params.get("backend", "bs4")
+    if "xml" in params:
+        return transform(params["xml"], backend)
+
+    output_file = _param(params, "output_file")
+    with open(_param(params, "input_file"), "r", encoding="utf-8") as f:
+        xml_content = f.read()
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(transform(xml_content, backend))
+    return {"output_file": output_file}
+
+def update_unitdate_text(params):
+    return _transform_xml(params, _module("dacs_date_fixer").update_unitdate_text)
+
+def fix_folder_ranges(params):
+    return _transform_xml(params, _module("folder_format_fixer").fix_folder_ranges)
+
+def extract_ead_data_to_csv(params):
+    export_components = _module("export-components")
+    xml_file, csv_file = _param(params, "xml_file"), _param(params, "csv_file")
+    if params.get("stream"):
+        _call_reporting_errors(export_components.stream_ead_data_to_csv, xml_file, csv_file)
+    else:
+        _call_reporting_errors(export_components.extract_ead_data_to_csv, xml_file, csv_file,
+                               params.get("backend", "bs4"))
+    return {"csv_file": csv_file}
+
+def flatten_json(params):
+    er_json_to_csv = _module("er_json_to_csv")
+    if "json" in params:
+        return er_json_to_csv.flatten_json(params["json"], params.get("parent_title", ""))
+
+    input_file = _param(params, "input_file")
+    if "output_file" in params:
+        rows = er_json_to_csv.convert_file(input_file, params["output_file"])
+        return {"output_file": params["output_file"], "rows": rows}
+    with open(input_file, "r", encoding="utf-8") as f:
+        return er_json_to_csv.flatten_json(json.load(f), params.get("parent_title", ""))
+
+def end_date(params):
+    return _checked(_module("project_calculator").calculate_end_date(
+        _param(params, "start_date"), int(_param(params, "duration"))))
+
+def hybrid_end_date(params):
+    return _checked(_module("hybrid_project_calculator").calculate_end_date(
+        _param(params, "start_date"), int(_param(params, "duration")), int(_param(params, "days_per_week")),
+        params.get("working_days")))
+
+def working_days(params):
+    calculator = _module("project_days_calculator")
+    start_date_str, end_date_str = _param(params, "start_date"), _param(params, "end_date")
+    years = [date.year for date in (calculator.parse_date(start_date_str), calculator.parse_date(end_date_str)) if date]
+    years = years or [datetime.date.today().year]
+    us_holidays = calculator.get_us_holidays(min(years), max(years))
+
+    start, end, error = calculator.validate_dates(start_date_str, end_date_str, us_holidays)
+    _checked(error)
+    return calculator.calculate_custom_working_days(start, end, params.get("working_days", [0, 1, 2, 3, 4]),
+                                                    us_holidays)
+
+def completion_date(params):
+    start = datetime.date.fromisoformat(_param(params, "start_date"))
+    end = _module("ap_project_planner").get_completion_date(
+        start, float(_param(params, "working_days")), params.get("work_days", [0, 1, 2, 3, 4]))
+    return end.isoformat()
+
+def ping(params):
+    return "pong"
+
+def methods(params):
+    return sorted(METHODS)
+
+METHODS = {function.__name__: function for function in [
+    update_unitdate_text, fix_folder_ranges, extract_ead_data_to_csv, flatten_json,
+    end_date, hybrid_end_date, working_days, completion_date, ping, methods,
+]}
+
+def handle(request):
+    """Runs one request and returns its response (dict); never raises."""
+    response = {"id": request.get("id")}
+    output = io.StringIO()
+    try:
+        method = METHODS.get(request.get("method"))
+        if method is None:
+            raise ValueError(f"Unknown method '{request.get('method')}'")
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            raise ValueError("params must be an object")
+        with contextlib.redirect_stdout(output):
+            response["result"] = method(params)
+    except Exception as e:
+        response["error"] = {"type": type(e).__name__, "message": str(e)}
+    if output.getvalue():
+        response["output"] = output.getvalue()
+    return response
+
+class Worker:
+    """Reads request lines, runs them in the pool and writes each response line when it's done."""
+
+    def __init__(self, executor):
+        self.executor = executor
+
+    def serve(self, lines, write):
+        """Answers every request in lines (an iterable of str) through write(str)."""
+        lock = threading.Lock()
+        finished = threading.Condition()
+        submitted = replied = 0
+
+        def reply(response):
+            text = json.dumps(response, ensure_ascii=False) + "\n"
+            with lock:
+                write(text)
+
+        def reply_when_done(future, request):
+            # counted once the response is written, not when the future is done:
+            # serve must not return (and the socket be closed) before every reply is out
+            nonlocal replied
+            try:
+                if future.exception() is None:
+                    reply(future.result())
+                else:
+                    reply({"id": request.get("id"), "error": {"type": type(future.exception()).__name__,
+                                                              "message": str(future.exception())}})
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client went away
+            finally:
+                with finished:
+                    replied += 1
+                    finished.notify_all()
+
+        try:
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("a request must be a JSON object")
+                except ValueError as e:
+                    reply({"id": None, "error": {"type": "ValueError", "message": f"Invalid request: {e}"}})
+                    continue
+                future = self.executor.submit(handle, request)
+                submitted += 1
+                future.add_done_callback(lambda done, request=request: reply_when_done(done, request))
+        finally:
+            with finished:
+                finished.wait_for(lambda: replied == submitted)
+
+def serve_stdin(worker):
+    # with --workers 0 a request runs in a thread of this process, and handle
+    # points sys.stdout at the request's "output" while it runs; responses go
+    # to the real stdout, saved here
+    stdout = sys.stdout
+
+    def write(text):
+        stdout.write(text)
+        stdout.flush()
+    worker.serve(sys.stdin, write)
+
+def serve_socket(worker, path):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            lines = (line.decode("utf-8") for line in self.rfile)
+
+            def write(text):
+                self.wfile.write(text.encode("utf-8"))
+                self.wfile.flush()
+
+            try:
+                worker.serve(lines, write)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client went away
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        # a connection left open doesn't keep the worker from stopping
+        daemon_threads = True
+
+    if os.path.exists(path):
+        os.remove(path)
+    with Server(path, Handler) as server:
+        print(f"Listening on {path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(path)
+
+def _stop(signum, frame):
+    raise SystemExit(0)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep the archives scripts loaded and answer JSON requests.")
+    parser.add_argument("--socket", metavar="PATH", help="Listen on a Unix socket instead of stdin/stdout")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (Default: number of CPUs); 0 handles requests in this process")
+    args = parser.parse_args(argv)
+
+    if args.workers > 0:
+        executor = ProcessPoolExecutor(max_workers=args.workers, initializer=warm_process)
+    else:
+        executor = ThreadPoolExecutor(max_workers=1, initializer=warm)
+
+    # stop on SIGTERM as on Ctrl-C, so leaving `with executor` shuts the pool down
+    # instead of orphaning its processes
+    signal.signal(signal.SIGTERM, _stop)
+    with executor:
+        # start the workers now, so the first request doesn't wait for the imports
+        executor.submit(ping, {}).result()
+        worker = Worker(executor)
+        if args.socket:
+            serve_socket(worker, args.socket)
+        else:
+            serve_stdin(worker)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+benchmark for the batch end-date API (workday_calendar.add_working_days_batch,
+count_working_days_batch and project_batch, the --batch CSV mode of
+project_calculator.py and hybrid_project_calculator.py)
+
+builds a portfolio of projects with random start dates, durations of up to
+five years and weekday sets, checks that the batch answers are the ones
+hybrid_project_calculator.calculate_end_date gives one project at a time
+(and that the counts back match the durations), then times
+    calculate_end_date per project      the single-project API in a loop
+    day-by-day loop                     the loop it replaced, on a sample, scaled up
+    answer_rows                         the CSV mode without the file reading and writing
+    add_working_days_batch              date arrays in, date array out
+
+run in the command line: python3 benchmarks/bench_batch_dates.py
+    optional: --projects 100000 --seed 1
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "project_management"))
+from bench_workdays import reference_end_date
+
+import numpy as np
+
+import holiday_calendars
+import hybrid_project_calculator
+import project_batch
+import workday_calendar
+
+LOOP_SAMPLE = 1000
+
+def portfolio(count, seed):
+    """(start date, duration, weekdays) of count projects that each start on one of their working days."""
+    rng = random.Random(seed)
+    us_holidays = holiday_calendars.us_holidays(2020, 2035)
+    projects = []
+    while len(projects) < count:
+        start = datetime.date(2020, 1, 1) + datetime.timedelta(days=rng.randint(0, 3650))
+        weekdays = tuple(sorted(rng.sample(range(5), rng.randint(1, 5))))
+        if start.weekday() in weekdays and start not in us_holidays:
+            projects.append((start, rng.randint(1, 1250), weekdays))
+    return projects
+
+def timed(label, function, count):
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    print(f"{label:<34} {seconds:>8.2f}s {count / seconds:>12,.0f} projects/s")
+    return result, seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the batch end-date API against one call per project.")
+    parser.add_argument("--projects", type=int, default=100000, help="Projects in the portfolio (Default: 100000)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (Default: 1)")
+    args = parser.parse_args()
+
+    projects = portfolio(args.projects, args.seed)
+    us_holidays = holiday_calendars.us_holidays()
+    rows = [{"start_date": start.strftime("%m/%d/%y"), "duration": str(duration),
+             "working_days": ",".join(map(str, weekdays))} for start, duration, weekdays in projects]
+    starts = np.array([start for start, _, _ in projects], dtype="datetime64[D]")
+    durations = np.array([duration for _, duration, _ in projects])
+    weekdays = [weekdays for _, _, weekdays in projects]
+    print(f"{args.projects:,} projects, 1 to 1,250 working days, random weekday sets\n")
+
+    expected, single_seconds = timed("calculate_end_date per project", lambda: [
+        hybrid_project_calculator.calculate_end_date(row["start_date"], duration, len(days), list(days))
+        for row, (_, duration, days) in zip(rows, projects)], args.projects)
+
+    sample = projects[:LOOP_SAMPLE]
+    start_time = time.perf_counter()
+    for start, duration, days in sample:
+        reference_end_date(start, duration, days, us_holidays)
+    loop_seconds = (time.perf_counter() - start_time) * args.projects / len(sample)
+    print(f"{'day-by-day loop (scaled)':<34} {loop_seconds:>8.2f}s {args.projects / loop_seconds:>12,.0f} projects/s")
+
+    _, rows_seconds = timed("answer_rows (CSV mode)", lambda: project_batch.answer_rows(rows, hybrid=True), args.projects)
+    ends, batch_seconds = timed("add_working_days_batch", lambda: workday_calendar.add_working_days_batch(
+        starts, durations, weekdays, us_holidays), args.projects)
+
+    if [row["end_date"] for row in rows] != expected:
+        raise AssertionError("answer_rows differs from calculate_end_date")
+    if [day.strftime("%m/%d/%y") for day in ends.astype(object)] != expected:
+        raise AssertionError("add_working_days_batch differs from calculate_end_date")
+    counts = workday_calendar.count_working_days_batch(starts, ends, weekdays, us_holidays)
+    if not (counts == durations).all():
+        raise AssertionError("count_working_days_batch doesn't give the durations back")
+    print("\nbatch end dates match calculate_end_date, and the counts back match the durations")
+    print(f"speedup: {single_seconds / batch_seconds:.0f}x over calculate_end_date, "
+          f"{loop_seconds / batch_seconds:.0f}x over the day-by-day loop")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+microbenchmark for dacs_dates.py on a realistic corpus: 100k <unitdate>
+values drawn (with heavy repetition, as in real finding aids) from a few
+thousand distinct 'normal' attributes and free-text dates
+
+compares the original per-call implementation (re.sub per month, tables
+rebuilt on every call) with the precompiled module, cold and warm cache,
+and checks that every result is identical
+
+run in the command line: python3 benchmarks/bench_dacs_dates.py
+    optional: --count 100000 --distinct 3000
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import dacs_dates
+
+# --- original implementation from dacs_date_fixer.py, kept as the reference ---
+
+def reference_format_dacs_date(normal_date):
+    months = {
+        "01": "January", "02": "February", "03": "March", "04": "April",
+        "05": "May", "06": "June", "07": "July", "08": "August",
+        "09": "September", "10": "October", "11": "November", "12": "December"
+    }
+
+    def parse_date(date_str):
+        parts = date_str.split('-')
+        year = parts[0]
+        month = months.get(f"{int(parts[1]):02d}") if len(parts) > 1 else ""
+        day = str(int(parts[2])) if len(parts) > 2 else ""
+        return year, month, day
+
+    try:
+        if '/' in normal_date:
+            start_date, end_date = normal_date.split('/')
+            start_year, start_month, start_day = parse_date(start_date)
+            end_year, end_month, end_day = parse_date(end_date)
+            if start_year == end_year:
+                if start_month == end_month:
+                    if start_day and end_day:
+                        return f"{start_year} {start_month} {start_day}–{end_day}"
+                    else:
+                        return f"{start_year} {start_month}"
+                else:
+                    start_parts = " ".join(filter(None, [start_month, start_day]))
+                    end_parts = " ".join(filter(None, [end_month, end_day]))
+                    return f"{start_year} {start_parts}–{end_parts}".strip()
+            else:
+                start_parts = " ".join(filter(None, [start_year, start_month, start_day]))
+                end_parts = " ".join(filter(None, [end_year, end_month, end_day]))
+                return f"{start_parts}–{end_parts}".strip()
+        else:
+            year, month, day = parse_date(normal_date)
+            return " ".join(filter(None, [year, month, day]))
+    except Exception as e:
+        print(f"Error: Could not process date '{normal_date}': {e}")
+        return normal_date
+
+def reference_format_text_date_if_needed(text):
+    abbreviations = {
+        r"\bJan\.?\b": "January", r"\bFeb\.?\b": "February", r"\bMar\.?\b": "March",
+        r"\bApr\.?\b": "April", r"\bJun\.?\b": "June", r"\bJul\.?\b": "July",
+        r"\bAug\.?\b": "August", r"\bSep\.?\b": "September", r"\bOct\.?\b": "October",
+        r"\bNov\.?\b": "November", r"\bDec\.?\b": "December"
+    }
+    cleaned = text.strip()
+    cleaned = re.sub(r'\s*[-–]\s*', '–', cleaned)
+    cleaned = re.sub(r'\.(\d)', r'. \1', cleaned)
+    for pattern, full in abbreviations.items():
+        cleaned = re.sub(pattern, full, cleaned)
+    for month in dacs_dates.MONTH_NAMES:
+        cleaned = re.sub(fr"\b{month}\.", month, cleaned)
+    return cleaned
+
+def reference_normalize(pair):
+    normal, text = pair
+    if normal:
+        return reference_format_dacs_date(normal)
+    return reference_format_text_date_if_needed(text)
+
+# --- corpus ---
+
+def random_date(rng):
+    year = rng.randint(1850, 2000)
+    kind = rng.random()
+    if kind < 0.4:
+        return f"{year}"
+    if kind < 0.7:
+        return f"{year}-{rng.randint(1, 12):02d}"
+    return f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+def random_pair(rng):
+    if rng.random() < 0.7:
+        normal = random_date(rng)
+        if rng.random() < 0.5:
+            normal += "/" + random_date(rng)
+        return normal, ""
+    month = rng.choice(list(dacs_dates.ABBREVIATIONS) + list(dacs_dates.MONTH_NAMES))
+    dot = rng.choice(["", ".", "."])
+    text = rng.choice([
+        f"{month}{dot} {rng.randint(1, 28)}, {rng.randint(1850, 2000)}",
+        f"{rng.randint(1850, 2000)} {month}{dot}{rng.randint(1, 28)} - {month}{dot}",
+        f"circa {rng.randint(1850, 2000)}-{rng.randint(1850, 2000)}",
+        f"  undated ",
+    ])
+    return None, text
+
+def build_corpus(count, distinct, seed=0):
+    rng = random.Random(seed)
+    vocabulary = [random_pair(rng) for _ in range(distinct)]
+    # Zipf-like repetition: a few dates are very common
+    weights = [1.0 / (rank + 1) for rank in range(distinct)]
+    return rng.choices(vocabulary, weights=weights, k=count)
+
+def timed(label, function, corpus):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function(corpus)
+    seconds = time.perf_counter() - start
+    print(f"{label:<28} {seconds:>8.3f}s {len(corpus) / seconds:>12,.0f} dates/s")
+    return result, seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DACS date normalization.")
+    parser.add_argument("--count", type=int, default=100000, help="Number of dates in the corpus")
+    parser.add_argument("--distinct", type=int, default=3000, help="Number of distinct date strings")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.count, args.distinct)
+    print(f"{args.count:,} dates, {len(set(corpus)):,} distinct\n")
+
+    expected, reference_seconds = timed("original (re.sub per month)", lambda c: [reference_normalize(p) for p in c], corpus)
+
+    dacs_dates.format_dacs_date.cache_clear()
+    dacs_dates.format_text_date_if_needed.cache_clear()
+    uncached, _ = timed("precompiled, no cache", lambda c: [
+        dacs_dates.format_dacs_date.__wrapped__(n) if n else dacs_dates.format_text_date_if_needed.__wrapped__(t)
+        for n, t in c], corpus)
+    cold, _ = timed("normalize_unitdates (cold)", dacs_dates.normalize_unitdates, corpus)
+    warm, warm_seconds = timed("normalize_unitdates (warm)", dacs_dates.normalize_unitdates, corpus)
+
+    assert expected == uncached == cold == warm, "results differ from the original implementation"
+    print(f"\nidentical results, warm speedup: {reference_seconds / warm_seconds:.1f}x")
+
+if __name__ == "__main__":
+    main()
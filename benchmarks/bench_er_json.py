@@ -0,0 +1,173 @@
+"""
+benchmark for er_json_to_csv.py on a synthetic 1M-node FTK export
+
+compares the original flatten_json (recursive, date regex rebuilt and run
+twice per node) with the precompiled single-pass extraction, in full
+Hierarchy mode and in --compact-hierarchy mode (Node ID / Parent ID plus a
+path table), in memory and end to end from a JSON file; a deep chain shows
+the cost of repeating the full path on every row
+
+checks that the rows are identical to the original, that the path table
+rebuilds the same Hierarchy column, and that split_er_name agrees with the
+original search-then-sub on random names
+
+run in the command line: python3 benchmarks/bench_er_json.py
+    optional: --nodes 1000000 --depth 10 --chain 3000
+"""
+import argparse
+import contextlib
+import csv
+import gc
+import io
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic_ftk import MONTHS, generate_ftk
+
+import er_json_to_csv
+
+# --- original implementation from er_json_to_csv.py, kept as the reference ---
+
+def reference_date_regex():
+    return r',\s*(' + \
+         r'\d{4}-\d{4}' + r'|' + \
+         r'circa\s+\d{4}' + r'|' + \
+         r'\d{4}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2}' + r'|' + \
+         r'\d{4}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)' + r'|' + \
+         r'\d{4}' + \
+         r')'
+
+def reference_split(er_name):
+    date_regex = reference_date_regex()
+    match = re.search(date_regex, er_name)
+    if match:
+        return re.sub(date_regex, '', er_name).strip(), match.group(1).strip()
+    return er_name, None
+
+def reference_flatten_json(json_obj, parent_title="", flattened_list=None):
+    if flattened_list is None:
+        flattened_list = []
+    for child in json_obj.get('children', []):
+        title = child.get('title', '')
+        combined_title = f"{parent_title} > {title}" if parent_title else title
+        er_name, date_found = reference_split(child.get('er_name', ''))
+
+        if 'er_number' in child:
+            er_number = child['er_number']
+            top_container_number = None
+            if er_number and er_number.startswith('ER'):
+                top_container_number = er_number[2:].strip()
+                er_number_prefix = 'er'
+            else:
+                er_number_prefix = er_number
+            row = {
+                'ER Number': er_number_prefix,
+                'Top Container Number': top_container_number,
+                'ER Name': er_name,
+                'Extent': er_json_to_csv.format_extent(child.get('file_size'), child.get('file_count')),
+            }
+            if date_found:
+                row['Date'] = date_found
+            row['Hierarchy'] = combined_title
+            flattened_list.append(row)
+
+        reference_flatten_json(child, combined_title, flattened_list)
+    return flattened_list
+
+# --- checks ---
+
+def random_er_name(rng):
+    pieces = ["Letters", ",", " ", "circa", "1990", "-", "1995", rng.choice(MONTHS), "3", ", ", "12345", "x"]
+    return "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+
+def check_split(count=200000, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        name = random_er_name(rng)
+        if er_json_to_csv.split_er_name(name) != reference_split(name):
+            raise AssertionError(f"split_er_name differs on {name!r}")
+
+def check_compact(tree):
+    """The path table must rebuild exactly the Hierarchy column."""
+    paths = io.StringIO()
+    rows = list(er_json_to_csv.compact_rows(er_json_to_csv.iter_nodes(tree), csv.writer(paths)))
+    titles = {}
+    for node_id, parent_id, title in csv.reader(io.StringIO(paths.getvalue())):
+        parent = titles.get(parent_id, "")
+        titles[node_id] = f"{parent} > {title}" if parent else title
+    rebuilt = [titles[str(row['Node ID'])] for row in rows]
+    expected = [row['Hierarchy'] for row in er_json_to_csv.flatten_json(tree)]
+    if rebuilt != expected:
+        raise AssertionError("path table does not rebuild the Hierarchy column")
+
+# --- timing ---
+
+def timed(label, function, count):
+    # keep the rows of earlier runs out of the garbage collector's way
+    gc.collect()
+    gc.freeze()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function()
+    seconds = time.perf_counter() - start
+    print(f"{label:<34} {seconds:>8.2f}s {count / seconds:>12,.0f} nodes/s")
+    return result, seconds
+
+def chain_tree(depth):
+    root = node = {"title": "root", "children": []}
+    for number in range(depth):
+        child = {"title": f"Folder {number}", "er_name": f"Disk {number}, 1990", "er_number": f"ER {number}",
+                 "file_size": 1000, "file_count": 1, "children": []}
+        node["children"].append(child)
+        node = child
+    return root
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark er_json_to_csv.py on a large synthetic export.")
+    parser.add_argument("--nodes", type=int, default=1000000, help="Nodes in the synthetic tree (Default: 1000000)")
+    parser.add_argument("--depth", type=int, default=10, help="Maximum nesting depth (Default: 10)")
+    parser.add_argument("--chain", type=int, default=3000, help="Depth of the single-path tree (Default: 3000)")
+    args = parser.parse_args()
+
+    check_split()
+    check_compact(generate_ftk(5000, args.depth, seed=1))
+    print("split_er_name and the path table agree with the original\n")
+
+    tree = generate_ftk(args.nodes, args.depth)
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), args.chain + 1000))
+    devnull = csv.writer(open(os.devnull, "w", newline=""))
+
+    print(f"{args.nodes:,} nodes, depth {args.depth}")
+    expected, reference_seconds = timed("original flatten_json", lambda: reference_flatten_json(tree), args.nodes)
+    rows, seconds = timed("flatten_json (precompiled)", lambda: er_json_to_csv.flatten_json(tree), args.nodes)
+    assert rows == expected, "rows differ from the original implementation"
+    timed("compact_rows", lambda: list(er_json_to_csv.compact_rows(er_json_to_csv.iter_nodes(tree), devnull)),
+          args.nodes)
+    print(f"identical rows, speedup: {reference_seconds / seconds:.1f}x")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = os.path.join(tmp, "ftk.json")
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump(tree, f)
+        del tree, rows, expected
+        csv_file = os.path.join(tmp, "out.csv")
+        timed("convert_file (file to CSV)", lambda: er_json_to_csv.convert_file(json_file, csv_file), args.nodes)
+        timed("convert_file --compact-hierarchy",
+              lambda: er_json_to_csv.convert_file(json_file, csv_file, paths_file=os.path.join(tmp, "paths.csv")),
+              args.nodes)
+
+    chain = chain_tree(args.chain)
+    print(f"\nsingle path {args.chain:,} levels deep")
+    timed("original flatten_json", lambda: reference_flatten_json(chain), args.chain)
+    timed("flatten_json (full Hierarchy)", lambda: er_json_to_csv.flatten_json(chain), args.chain)
+    timed("compact_rows", lambda: list(er_json_to_csv.compact_rows(er_json_to_csv.iter_nodes(chain), devnull)),
+          args.chain)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+times export-components.py on synthetic EADs of 1k, 10k and 100k components
+and prints the cost per component, which should stay roughly flat
+(near-linear scaling) for both the in-memory and the --stream extractor
+
+run in the command line: python3 benchmarks/bench_export_components.py
+    optional: --sizes 1000,10000 --depth 8
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic_ead import write_ead
+
+export_components = importlib.import_module("export-components")
+
+def time_extractor(extractor, xml_file, csv_file):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor(xml_file, csv_file)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark export-components.py scaling.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated component counts")
+    parser.add_argument("--depth", type=int, default=6, help="Maximum nesting depth")
+    args = parser.parse_args()
+
+    sizes = [int(x) for x in args.sizes.split(",")]
+    extractors = {
+        "in-memory": export_components.extract_ead_data_to_csv,
+        "stream": export_components.stream_ead_data_to_csv,
+    }
+
+    print(f"{'components':>10} {'mode':>10} {'seconds':>9} {'us/component':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            xml_file = write_ead(os.path.join(tmp, f"ead_{size}.xml"), size, args.depth)
+            for mode, extractor in extractors.items():
+                seconds = time_extractor(extractor, xml_file, os.path.join(tmp, f"{mode}_{size}.csv"))
+                print(f"{size:>10} {mode:>10} {seconds:>9.3f} {seconds / size * 1e6:>13.1f}")
+
+if __name__ == "__main__":
+    main()
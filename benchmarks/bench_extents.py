@@ -0,0 +1,102 @@
+"""
+benchmark for er_json_to_csv.format_extents, the batched Extent formatter,
+against the scalar format_extent it replaces in the row generators
+
+checks first that both give identical strings on random sizes and on the
+awkward ones: exact .x5 ties, values just below a magnitude, 0, negatives,
+huge and non-finite sizes, numeric strings, float counts and missing values
+
+run in the command line: python3 benchmarks/bench_extents.py
+    optional: --rows 1000000 --batch 10000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import er_json_to_csv
+
+EDGE_SIZES = [
+    0, 1, 999, 1000, 1049, 1050, 1150, 1250, 999949, 999950, 999999, 10 ** 6, 10 ** 9 - 1, 10 ** 12,
+    0.05, 0.15, 0.25, 0.35, 2.5, 1.05, 999.95, 5e17, 10 ** 20, 2 ** 64 + 1, -1, -0.0, -1500,
+    float("nan"), float("inf"), float("-inf"), "1024", "2.5e9", True,
+]
+
+def random_sizes(count, rng):
+    sizes = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.6:
+            sizes.append(int(10 ** rng.uniform(0, 13)))
+        elif kind < 0.8:
+            sizes.append(10 ** rng.uniform(-1, 13))
+        elif kind < 0.9:
+            # exact ties of the first decimal at every magnitude
+            sizes.append((rng.randrange(10000) + 0.5) / 10 * rng.choice(er_json_to_csv.EXTENT_MAGNITUDES))
+        else:
+            sizes.append(rng.choice(EDGE_SIZES))
+    return sizes
+
+def check(count=200000, seed=0):
+    rng = random.Random(seed)
+    sizes = random_sizes(count, rng) + EDGE_SIZES
+    counts = [rng.choice([rng.randint(0, 10 ** 6), 3.0, "7", None, 2 ** 70]) if rng.random() < 0.05
+              else rng.randint(0, 5000) for _ in sizes]
+    sizes = [None if rng.random() < 0.02 else size for size in sizes]
+    expected = [er_json_to_csv.format_extent(size, file_count) for size, file_count in zip(sizes, counts)]
+    batched = er_json_to_csv.format_extents(sizes, counts)
+    for size, file_count, want, got in zip(sizes, counts, expected, batched):
+        if want != got:
+            raise AssertionError(f"format_extents({size!r}, {file_count!r}) gave {got!r}, expected {want!r}")
+    # integer counts take the array path
+    int_counts = [rng.randint(0, 5000) for _ in sizes]
+    if er_json_to_csv.format_extents(sizes, int_counts) != [er_json_to_csv.format_extent(size, file_count)
+                                                            for size, file_count in zip(sizes, int_counts)]:
+        raise AssertionError("format_extents differs with integer counts")
+
+def timed(label, function, rows):
+    gc.collect()
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    print(f"{label:<34} {seconds:>8.2f}s {rows / seconds:>12,.0f} rows/s")
+    return result, seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the batched extent formatter.")
+    parser.add_argument("--rows", type=int, default=1000000, help="Rows to format (Default: 1000000)")
+    parser.add_argument("--batch", type=int, default=er_json_to_csv.EXTENT_BATCH_SIZE,
+                        help=f"Batch size used by the row generators (Default: {er_json_to_csv.EXTENT_BATCH_SIZE})")
+    args = parser.parse_args()
+
+    if er_json_to_csv._numpy() is None:
+        print("numpy is not installed: format_extents uses format_extent row by row")
+    check()
+    print("format_extents agrees with format_extent\n")
+
+    rng = random.Random(1)
+    sizes = [int(10 ** rng.uniform(2, 12)) for _ in range(args.rows)]
+    counts = [rng.randint(1, 5000) for _ in range(args.rows)]
+
+    print(f"{args.rows:,} rows")
+    expected, scalar_seconds = timed("format_extent, row by row",
+                                     lambda: [er_json_to_csv.format_extent(s, c) for s, c in zip(sizes, counts)],
+                                     args.rows)
+    result, seconds = timed("format_extents, one call", lambda: er_json_to_csv.format_extents(sizes, counts),
+                            args.rows)
+    assert result == expected, "format_extents differs from format_extent"
+    batches = range(0, args.rows, args.batch)
+    result, batch_seconds = timed(f"format_extents, batches of {args.batch:,}",
+                                  lambda: [extent for start in batches for extent in
+                                           er_json_to_csv.format_extents(sizes[start:start + args.batch],
+                                                                         counts[start:start + args.batch])],
+                                  args.rows)
+    assert result == expected, "format_extents differs from format_extent"
+    print(f"identical output, speedup: {scalar_seconds / seconds:.1f}x (one call), "
+          f"{scalar_seconds / batch_seconds:.1f}x (batches)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+benchmark for project_management/holiday_calendars.py: building holidays.US
+for a range of years against reading the same years back from the cache
+
+checks that the cached calendar has the same dates and names as holidays.US
+for every year from 1900 to 2100 (and for one state), then times
+    holidays.US(years=...)           what the calculators built on every call
+    compile + save                   first use of a range, cache file empty
+    load from the cache file         a new process (new HolidayCalendar), cache warm
+    lookup                           date in calendar
+
+run in the command line: python3 benchmarks/bench_holidays.py
+    optional: --years 5 --repeat 200
+"""
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "project_management"))
+
+import holidays
+
+import holiday_calendars
+
+def best_of(repeat, function):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare holidays.US with the cached holiday calendar.")
+    parser.add_argument("--years", type=int, default=5, help="Years in the range (Default: 5)")
+    parser.add_argument("--repeat", type=int, default=200, help="Runs per measurement, the fastest is kept (Default: 200)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "holidays.json")
+
+        calendar = holiday_calendars.HolidayCalendar(path=path)
+        expected = sorted(holidays.US(years=range(1900, 2101)).items())
+        if calendar.between(datetime.date(1900, 1, 1), datetime.date(2100, 12, 31)) != expected:
+            raise AssertionError("cached US calendar differs from holidays.US")
+        state = holiday_calendars.HolidayCalendar("US", "CA", path=path)
+        if state.between(datetime.date(2000, 1, 1), datetime.date(2030, 12, 31)) != \
+                sorted(holidays.US(subdiv="CA", years=range(2000, 2031)).items()):
+            raise AssertionError("cached US-CA calendar differs from holidays.US(subdiv='CA')")
+        print("cached calendars match holidays.US, 1900-2100\n")
+
+        first_year = datetime.date.today().year
+        last_year = first_year + args.years - 1
+        print(f"{first_year}-{last_year}, fastest of {args.repeat}")
+        results = [
+            ("holidays.US(years=...)", best_of(args.repeat, lambda: holidays.US(years=range(first_year, last_year + 1)))),
+            ("compile + save", best_of(min(args.repeat, 20), lambda: (os.remove(path) if os.path.exists(path) else None,
+                                                                     holiday_calendars.HolidayCalendar(path=path)
+                                                                     .cover(first_year, last_year)))),
+            ("load from the cache file", best_of(args.repeat, lambda: holiday_calendars.HolidayCalendar(path=path)
+                                                 .cover(first_year, last_year))),
+        ]
+        calendar = holiday_calendars.HolidayCalendar(path=path).cover(first_year, last_year)
+        day = datetime.date(first_year, 7, 4)
+        results.append(("lookup", best_of(args.repeat, lambda: day in calendar)))
+        for label, seconds in results:
+            print(f"{label:<28} {seconds * 1e6:>10,.1f} us")
+
+if __name__ == "__main__":
+    main()
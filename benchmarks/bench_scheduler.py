@@ -0,0 +1,106 @@
+"""
+benchmark for project_management/portfolio_scheduler.py: a random portfolio
+of projects over a pool of staff with their own FTE and weekdays, sized to
+keep everyone busy for about five years
+
+checks every schedule: nobody works on two projects at once, no project
+starts before it is released, every project gets its full effort from the
+people on it and ends on the first day it could; then times the simulation
+
+run in the command line: python3 benchmarks/bench_scheduler.py
+    optional: --projects 500 --staff 200 --years 5 --seed 1
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "project_management"))
+
+import holiday_calendars
+import portfolio_scheduler
+
+START = datetime.date(2025, 7, 1)
+WEEKDAY_SETS = [(0, 1, 2, 3, 4)] * 6 + [(0, 1, 2, 3), (1, 2, 3, 4), (0, 2, 4), (1, 3)]
+
+def portfolio(project_count, staff_count, years, seed):
+    rng = random.Random(seed)
+    holidays = holiday_calendars.us_holidays(START.year, START.year + years + 5)
+    people = [portfolio_scheduler.Person(index, f"Archivist {index + 1}", rng.choice([1.0, 1.0, 0.8, 0.5]),
+                                         rng.choice(WEEKDAY_SETS),
+                                         START + datetime.timedelta(days=rng.choice([0, 0, 0, rng.randint(1, 700)])),
+                                         holidays)
+              for index in range(staff_count)]
+    # about `years` of work for everyone, shared out at random; a project is
+    # never more than its team could do in a year and a half
+    capacity = sum(person.fte * len(person.weekdays) * 50 for person in people) * years
+    max_staff = [rng.choice([1, 1, 1, 2, 3]) for _ in range(project_count)]
+    weights = [rng.uniform(0.2, 1.0) * staff for staff in max_staff]
+    projects = [portfolio_scheduler.Project(index, f"Project {index + 1}",
+                                            min(capacity * weight / sum(weights), 375 * staff),
+                                            rng.randint(1, 5),
+                                            START + datetime.timedelta(days=rng.randint(90, 365 * years)),
+                                            START + datetime.timedelta(days=rng.choice([0, 0, rng.randint(1, 365 * years)])),
+                                            staff)
+                for index, (weight, staff) in enumerate(zip(weights, max_staff))]
+    return projects, people
+
+def check(scheduler):
+    by_person = {}
+    for person, project, first, last in scheduler.assignments:
+        by_person.setdefault(person.index, []).append((first, last))
+    for person_index, spans in by_person.items():
+        spans.sort()
+        for (_, last), (first, _) in zip(spans, spans[1:]):
+            if first <= last:
+                raise AssertionError(f"person {person_index} is on two projects on {first}")
+
+    work = {}
+    for person, project, first, last in scheduler.assignments:
+        work.setdefault(project.index, []).append((person, first))
+    for project in scheduler.projects:
+        if project.end is None:
+            raise AssertionError(f"{project.name} was never finished")
+        if project.start < (project.release or START):
+            raise AssertionError(f"{project.name} starts before it is released")
+        if project.effort <= portfolio_scheduler.EPSILON:
+            continue
+
+        def done(last):
+            return sum(person.fte * person.calendar.count(first, last) for person, first in work[project.index])
+        if done(project.end) < project.effort - 1e-6:
+            raise AssertionError(f"{project.name} ends before its effort is done")
+        if done(project.end - datetime.timedelta(days=1)) >= project.effort - 1e-6:
+            raise AssertionError(f"{project.name} could have ended a day earlier")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the portfolio scheduler on a random portfolio.")
+    parser.add_argument("--projects", type=int, default=500, help="Projects (Default: 500)")
+    parser.add_argument("--staff", type=int, default=200, help="Staff (Default: 200)")
+    parser.add_argument("--years", type=int, default=5, help="Years of work in the portfolio (Default: 5)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (Default: 1)")
+    args = parser.parse_args()
+
+    for seed in range(args.seed, args.seed + 5):
+        projects, people = portfolio(60, 15, 2, seed)
+        check(portfolio_scheduler.schedule(projects, people, START))
+    print("small portfolios: no double bookings, full effort, earliest end dates")
+
+    projects, people = portfolio(args.projects, args.staff, args.years, args.seed)
+    start = time.perf_counter()
+    scheduler = portfolio_scheduler.schedule(projects, people, START)
+    seconds = time.perf_counter() - start
+    check(scheduler)
+
+    utilization = [busy / available for _, busy, available in scheduler.utilization() if available]
+    late = sum(1 for project in projects if project.end > project.deadline)
+    print(f"\n{args.projects} projects, {args.staff} staff, {len(scheduler.assignments)} assignments: "
+          f"done by {scheduler.end_date()}, {late} late")
+    print(f"mean utilization {sum(utilization) / len(utilization):.0%}")
+    print(f"schedule: {seconds * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+benchmark for ead_shards.py: one large synthetic EAD through the default
+steps, once with ead_pipeline.run_pipeline (lxml, one process) and once
+sharded for each worker count, with the speedup over the sequential run
+
+checks that every sharded output is the sequential output, byte for byte.
+the speedup can't go past the number of CPU cores (printed first): with a
+single core the sharded runs only show the cost of splitting and stitching
+
+run in the command line: python3 benchmarks/bench_shards.py
+    optional: --components 100000 --depth 6 --workers 1,2,4,8 --steps dacs,folders,title-date
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic_ead import generate_ead
+
+import ead_pipeline
+import ead_shards
+import run_stats
+
+def timed(function):
+    gc.collect()
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the sharded pipeline with the sequential one.")
+    parser.add_argument("--components", type=int, default=100000, help="Components in the document (Default: 100000)")
+    parser.add_argument("--depth", type=int, default=6, help="Maximum nesting depth, up to 12 (Default: 6)")
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts (Default: 1,2,4,8)")
+    parser.add_argument("--steps", default=ead_shards.DEFAULT_STEPS,
+                        help=f"Comma-separated steps (Default: {ead_shards.DEFAULT_STEPS})")
+    args = parser.parse_args()
+
+    xml = generate_ead(args.components, args.depth)
+    print(f"{args.components:,} components, depth {args.depth}, {len(xml) / 1e6:.1f} MB, "
+          f"steps {args.steps}, {os.cpu_count()} CPU core(s)\n")
+
+    expected, sequential_seconds = timed(lambda: ead_pipeline.run_pipeline(xml, args.steps, "lxml"))
+    print(f"{'sequential (ead_pipeline, lxml)':<34} {sequential_seconds:>8.2f}s")
+
+    for workers in [int(count) for count in args.workers.split(",")]:
+        stats = run_stats.RunStats("bench_shards")
+        result, seconds = timed(lambda: ead_shards.run_sharded(xml, args.steps, workers, stats))
+        if result != expected:
+            raise AssertionError(f"sharded output with {workers} worker(s) differs from the sequential run")
+        # split and stitch are the work the sequential run doesn't have, and they stay in one process
+        overhead = sum(stats.phases[name]["wall_seconds"] for name in ("split", "stitch"))
+        print(f"{f'sharded, {workers} worker(s)':<34} {seconds:>8.2f}s  speedup {sequential_seconds / seconds:>5.2f}x  "
+              f"(shards {stats.phases['shards']['wall_seconds']:.2f}s, split + stitch {overhead:.2f}s)")
+
+    print("\nevery sharded output matches the sequential run")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+benchmark for the Monte Carlo forecast of ap_project_planner.py (--simulate)
+
+checks that with no variance every trial lands on the planner's own
+completion date, and that with varying rates each trial's date is the one
+get_completion_date gives for that trial's effort, then times
+simulate_completion for growing numbers of trials against calling
+get_completion_date once per trial (timed on a sample, scaled up)
+
+run in the command line: python3 benchmarks/bench_simulation.py
+    optional: --trials 100000,1000000 --seed 1
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "project_management"))
+
+import numpy as np
+
+import ap_project_planner
+
+START = datetime.date(2025, 6, 2)
+WORK_DAYS = [0, 1, 2, 3]
+QUANTITIES = [200, 40, 15, 50]  # linear feet, AMI recordings, carriers, GB
+RATES = [1.0, 30.0, 1.0, 0.2]
+TRIANGLES = [(0.5, 1.0, 1.5), (20.0, 30.0, 35.0), (0.5, 1.0, 2.0), (0.1, 0.2, 0.3)]
+STAFF = 1.5
+LOOP_SAMPLE = 2000
+
+def check(seed):
+    fixed = [(rate, rate, rate) for rate in RATES]
+    total, dates = ap_project_planner.simulate_completion(QUANTITIES, fixed, STAFF, (1, 1, 1), START, WORK_DAYS,
+                                                          1000, seed)
+    effort = sum(quantity / rate for quantity, rate in zip(QUANTITIES, RATES))
+    expected = ap_project_planner.get_completion_date(START, effort / STAFF, WORK_DAYS)
+    if not np.allclose(total, effort) or set(dates.astype(object)) != {expected}:
+        raise AssertionError("trials without variance don't match the planner")
+
+    total, dates = ap_project_planner.simulate_completion(QUANTITIES, TRIANGLES, STAFF, (1, 1, 1), START, WORK_DAYS,
+                                                          LOOP_SAMPLE, seed)
+    for days, date in zip(total, dates.astype(object)):
+        if ap_project_planner.get_completion_date(START, days / STAFF, WORK_DAYS) != date:
+            raise AssertionError(f"trial with {days:.2f} days of effort ends on {date}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the Monte Carlo forecast of ap_project_planner.py.")
+    parser.add_argument("--trials", default="100000,1000000", help="Comma-separated trial counts (Default: 100000,1000000)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (Default: 1)")
+    args = parser.parse_args()
+
+    check(args.seed)
+    print("trials match get_completion_date, with and without variance\n")
+
+    rng = np.random.default_rng(args.seed)
+    sample = sum(quantity / rng.triangular(*triangle, LOOP_SAMPLE) for quantity, triangle in zip(QUANTITIES, TRIANGLES))
+    start = time.perf_counter()
+    for days in sample:
+        ap_project_planner.get_completion_date(START, days / STAFF, WORK_DAYS)
+    per_trial = (time.perf_counter() - start) / LOOP_SAMPLE
+
+    print(f"{'trials':>10} {'simulate_completion':>20} {'one call per trial':>20}")
+    for trials in [int(count) for count in args.trials.split(",")]:
+        start = time.perf_counter()
+        ap_project_planner.simulate_completion(QUANTITIES, TRIANGLES, STAFF, (0.6, 0.85, 1.0), START, WORK_DAYS,
+                                               trials, args.seed)
+        seconds = time.perf_counter() - start
+        print(f"{trials:>10,} {seconds:>19.2f}s {per_trial * trials:>18.2f}s (scaled)")
+
+if __name__ == "__main__":
+    main()
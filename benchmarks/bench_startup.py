@@ -0,0 +1,101 @@
+"""
+startup benchmark for archives.py: runs '<command> --help' for every
+command under python -X importtime and reports the import time and the
+heaviest modules it loaded, so a new top-level import of a slow library
+shows up before it reaches the batch jobs
+
+    command      wall time of the whole process (fastest of --repeat runs)
+    import ms    time spent importing modules (sum of -X importtime self times)
+    heaviest     packages with the largest cumulative import time
+
+run in the command line: python3 benchmarks/bench_startup.py
+    optional: --commands dacs-fix,er-to-csv --repeat 5 --output startup.json
+              --budget-ms 300  (exit 1 if any command imports for longer)
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+import archives
+
+HEAVIEST_SHOWN = 3
+
+def parse_importtime(stderr):
+    """
+    Returns (total import seconds, {package: cumulative seconds}) from
+    python -X importtime output; a package's time is that of its slowest
+    module, which includes everything that module imported.
+    """
+    total = 0.0
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        total += int(self_us) / 1e6
+        package = name.strip().split(".")[0]
+        packages[package] = max(packages.get(package, 0.0), int(cumulative_us) / 1e6)
+    return total, packages
+
+def measure(arguments, repeat):
+    """Fastest of `repeat` runs of archives.py with arguments under -X importtime."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-X", "importtime", "archives.py", *arguments],
+                                   capture_output=True, text=True, cwd=REPO_DIR)
+        wall = time.perf_counter() - start
+        if completed.returncode != 0:
+            return {"error": completed.stderr.strip().splitlines()[-1]}
+        import_seconds, packages = parse_importtime(completed.stderr)
+        if best is None or wall < best["wall_seconds"]:
+            best = {"wall_seconds": wall, "import_seconds": import_seconds, "packages": packages}
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the startup and import time of every archives.py command.")
+    parser.add_argument("--commands", default=",".join(archives.COMMANDS),
+                        help="Comma-separated commands (Default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per command, the fastest is kept (Default: 3)")
+    parser.add_argument("--budget-ms", type=float, help="Fail if a command spends longer than this importing")
+    parser.add_argument("--output", help="Path for the JSON results (Default: print only)")
+    args = parser.parse_args()
+
+    commands = args.commands.split(",")
+    unknown = [command for command in commands if command not in archives.COMMANDS]
+    if unknown:
+        print(f"Error: Unknown command(s) {', '.join(unknown)}.")
+        sys.exit(1)
+
+    results = {}
+    print(f"{'command':<18} {'wall ms':>8} {'import ms':>10}  heaviest packages")
+    for label, arguments in [("(command list)", ["--help"])] + [(command, [command, "--help"]) for command in commands]:
+        result = measure(arguments, args.repeat)
+        results[label] = result
+        if "error" in result:
+            print(f"{label:<18} FAILED: {result['error']}")
+            continue
+        heaviest = sorted(result["packages"].items(), key=lambda item: item[1], reverse=True)[:HEAVIEST_SHOWN]
+        print(f"{label:<18} {result['wall_seconds'] * 1000:>8.0f} {result['import_seconds'] * 1000:>10.0f}  "
+              + ", ".join(f"{name} {seconds * 1000:.0f}" for name, seconds in heaviest))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"\nResults saved to '{args.output}'")
+
+    failed = [label for label, result in results.items() if "error" in result]
+    if args.budget_ms is not None:
+        failed += [label for label, result in results.items()
+                   if "error" not in result and result["import_seconds"] * 1000 > args.budget_ms]
+    if failed:
+        print(f"\nOver budget or failed: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+benchmark for title-date_combine.py on a synthetic 50k-component EAD
+
+compares the original process_xml (every component searched all of its
+descendants for a <unittitle> and <unitdate>, a regex compiled and
+datetime.strptime called per match, c01-c07 only) with the single pass
+over each component's own <did>, for both backends
+
+checks that on a document nested no deeper than c07 the output is the
+original's, that at depth 12 every dated component (c08-c12 included) is
+rewritten, that a series without its own date no longer takes one from a
+child, and that titles like "Box 12" are left alone instead of failing
+
+run in the command line: python3 benchmarks/bench_title_date.py
+    optional: --components 50000 --depth 12
+"""
+import argparse
+import gc
+import importlib
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic_ead import generate_ead
+
+import ead_lxml
+
+title_date = importlib.import_module("title-date_combine")
+
+# --- original implementation from title-date_combine.py, kept as the reference ---
+
+def reference_normalize_date(year, month, day):
+    month_num = datetime.strptime(month, "%B").month
+    return f"{year}-{month_num:02d}-{int(day):02d}"
+
+def reference_process_soup(soup):
+    for component in soup.find_all(["c", "c01", "c02", "c03", "c04", "c05", "c06", "c07"]):
+        unittitle = component.find("unittitle")
+        unitdate = component.find("unitdate")
+
+        if unittitle and unitdate:
+            title_text = unittitle.get_text(strip=True)
+            year_text = unitdate.get_text(strip=True)
+
+            match = re.match(r"([A-Za-z]+)\s+(\d{1,2})", title_text)
+            if match and year_text.isdigit():
+                month, day = match.groups()
+                year = year_text
+
+                new_text = f"{year} {month} {int(day)}"
+                normal_attr = reference_normalize_date(year, month, day)
+
+                unitdate.string = new_text
+                unitdate["type"] = "inclusive"
+                unitdate["normal"] = normal_attr
+
+                new_unittitle = re.sub(rf"{month}\s+{day}", "", title_text).strip()
+                if new_unittitle:
+                    unittitle.string = new_unittitle
+                else:
+                    unittitle.decompose()
+    return soup
+
+# --- checks ---
+
+NESTED_SERIES = """<?xml version="1.0" encoding="UTF-8"?>
+<ead xmlns="urn:isbn:1-931666-22-9"><archdesc level="collection"><dsc>
+<c01 level="series"><did><unittitle>June 3 Hearings</unittitle></did>
+<c02 level="file"><did><unittitle>Testimony</unittitle><unitdate>1950</unitdate></did></c02>
+<c02 level="file"><did><unittitle>Box 12</unittitle><unitdate>1951</unitdate></did></c02>
+</c01></dsc></archdesc></ead>
+"""
+
+def summary(xml):
+    """(title, date text, type, normal) of every <did>, to compare the two backends' results."""
+    root = ead_lxml.parse(xml)
+    rows = []
+    for did in root.iter("{*}did"):
+        unittitle = next(did.iter("{*}unittitle"), None)
+        unitdate = next(did.iter("{*}unitdate"), None)
+        rows.append((ead_lxml.element_text(unittitle) if unittitle is not None else None,
+                     *((ead_lxml.element_text(unitdate), unitdate.get("type"), unitdate.get("normal"))
+                       if unitdate is not None else (None, None, None))))
+    return rows
+
+def check(depth):
+    shallow = generate_ead(3000, 7, seed=2)
+    expected = str(reference_process_soup(BeautifulSoup(shallow, "xml")))
+    if title_date.process_xml(shallow, "bs4") != expected:
+        raise AssertionError("bs4 output differs from the original on a c01-c07 document")
+    if summary(title_date.process_xml(shallow, "lxml")) != summary(expected):
+        raise AssertionError("lxml output differs from the original on a c01-c07 document")
+
+    deep = generate_ead(3000, depth, seed=3)
+    result = title_date.process_xml(deep, "lxml")
+    for unitdate in ead_lxml.parse(result).iter("{*}unitdate"):
+        component = unitdate.getparent().getparent()
+        if ead_lxml.local_name(component.tag) in title_date.COMPONENT_TAGS and unitdate.get("type") != "inclusive":
+            raise AssertionError(f"a <{ead_lxml.local_name(component.tag)}> date was not rewritten")
+    if summary(title_date.process_xml(deep, "bs4")) != summary(result):
+        raise AssertionError("bs4 and lxml rewrite different dates")
+
+    for backend in ("bs4", "lxml"):
+        result = title_date.process_xml(NESTED_SERIES, backend)
+        if "June 3 Hearings" not in result or "<unitdate>1950</unitdate>" not in result:
+            raise AssertionError(f"{backend}: the series took its date from a child")
+        if "Box 12" not in result:
+            raise AssertionError(f"{backend}: 'Box 12' was treated as a date")
+
+# --- timing ---
+
+def timed(label, function, components):
+    gc.collect()
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    print(f"{label:<38} {seconds:>8.2f}s {components / seconds:>12,.0f} components/s")
+    return result, seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark title-date_combine.py on a large synthetic EAD.")
+    parser.add_argument("--components", type=int, default=50000, help="Components in the document (Default: 50000)")
+    parser.add_argument("--depth", type=int, default=12, help="Maximum nesting depth, up to 12 (Default: 12)")
+    args = parser.parse_args()
+
+    check(args.depth)
+    print("output matches the original up to c07, c08-c12 are rewritten, series keep their own dates\n")
+
+    xml = generate_ead(args.components, args.depth)
+    print(f"{args.components:,} components, depth {args.depth} (transform only, parsed beforehand)")
+    # each transform works in place, so each gets its own parsed copy
+    soups = [BeautifulSoup(xml, "xml") for _ in range(2)]
+    _, reference_seconds = timed("original, bs4 (c01-c07 only)",
+                                 lambda: reference_process_soup(soups[0]), args.components)
+    _, seconds = timed("process_soup, own <did>", lambda: title_date.process_soup(soups[1]), args.components)
+    root = ead_lxml.parse(xml)
+    _, lxml_seconds = timed("process_tree (lxml), own <did>", lambda: title_date.process_tree(root), args.components)
+    print(f"speedup: {reference_seconds / seconds:.1f}x (bs4), {reference_seconds / lxml_seconds:.1f}x (lxml)\n")
+
+    print("end to end: parse, transform, serialize")
+    timed("process_xml, bs4", lambda: title_date.process_xml(xml, "bs4"), args.components)
+    timed("process_xml, lxml", lambda: title_date.process_xml(xml, "lxml"), args.components)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+property test and benchmark for project_management/workday_calendar.py
+
+compares add_working_days and count_working_days with the day-by-day loops
+the calculators used before (kept below as the reference) on random start
+dates from 1950 to 2070, durations of up to ten years, random weekday sets
+and both US holidays and random holiday sets, then checks the calculators
+themselves against the loops and times both on multi-year projects
+
+run in the command line: python3 benchmarks/bench_workdays.py
+    optional: --cases 5000 --seed 1
+"""
+import argparse
+import datetime
+import math
+import os
+import random
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "project_management"))
+
+import holidays
+
+import ap_calculator
+import ap_project_planner
+import holiday_calendars
+import hybrid_project_calculator
+import project_calculator
+import project_days_calculator
+import workday_calendar
+
+# --- the loops from the calculators, kept as the reference ---
+
+def reference_end_date(start_date, duration_days, allowed_weekdays, holiday_calendar):
+    """project_calculator / hybrid_project_calculator / trello_project_calculator"""
+    current_date = start_date
+    working_days_counted = 0
+    while working_days_counted < duration_days:
+        if current_date.weekday() in allowed_weekdays and current_date not in holiday_calendar:
+            working_days_counted += 1
+        if working_days_counted == duration_days:
+            break
+        current_date += datetime.timedelta(days=1)
+    return current_date
+
+def reference_completion_date(start_date, working_days, work_days_indices, us_holidays):
+    """ap_project_planner / ap_project_planner_ui"""
+    current_date = start_date
+    days_added = 0
+    target_days = math.ceil(working_days)
+    if start_date.weekday() in work_days_indices and start_date not in us_holidays:
+        days_added = 1
+    while days_added < target_days:
+        current_date += datetime.timedelta(days=1)
+        if current_date.weekday() in work_days_indices and current_date not in us_holidays:
+            days_added += 1
+    return current_date
+
+def reference_ap_calculator(start_date, working_days, days_per_week, us_holidays):
+    """ap_calculator"""
+    current_date = start_date
+    days_added = 0
+    target_days = math.ceil(working_days)
+    while days_added < target_days:
+        current_date += datetime.timedelta(days=1)
+        if current_date.weekday() >= 5 or current_date in us_holidays or current_date.weekday() >= days_per_week:
+            continue
+        days_added += 1
+    return current_date
+
+def reference_count(start_date, end_date, allowed_weekdays, holiday_calendar):
+    """project_days_calculator"""
+    current_date = start_date
+    working_days_count = 0
+    while current_date <= end_date:
+        if current_date.weekday() in allowed_weekdays and current_date not in holiday_calendar:
+            working_days_count += 1
+        current_date += datetime.timedelta(days=1)
+    return working_days_count
+
+# --- checks ---
+
+def random_date(rng, first_year=1950, last_year=2070):
+    first = datetime.date(first_year, 1, 1).toordinal()
+    return datetime.date.fromordinal(rng.randint(first, datetime.date(last_year, 12, 31).toordinal()))
+
+def random_holidays(rng):
+    # clusters of neighbouring days too, so holidays run into each other and into weekends
+    days = set()
+    for _ in range(rng.randint(0, 400)):
+        day = random_date(rng)
+        days.update(day + datetime.timedelta(days=offset) for offset in range(rng.randint(1, 4)))
+    return days
+
+def check(cases, seed):
+    rng = random.Random(seed)
+    calendars = [holidays.US(), holidays.US(years=range(2000, 2005)), set()] + \
+                [random_holidays(rng) for _ in range(5)]
+    for case in range(cases):
+        calendar = rng.choice(calendars)
+        weekdays = rng.sample(range(7), rng.randint(1, 7))
+        start = random_date(rng)
+        duration = rng.choice([0, 1, 2, 3, 5, rng.randint(1, 60), rng.randint(1, 2600)])
+        got = workday_calendar.add_working_days(start, duration, weekdays, calendar)
+        expected = reference_end_date(start, duration, weekdays, calendar)
+        if got != expected:
+            raise AssertionError(f"add_working_days({start}, {duration}, {weekdays}) = {got}, loop: {expected}")
+
+        working_days = duration - rng.random() if duration else 0
+        got = workday_calendar.add_working_days(start, math.ceil(working_days), weekdays, calendar)
+        if got != reference_completion_date(start, working_days, weekdays, calendar):
+            raise AssertionError(f"completion date differs for {start}, {working_days}, {weekdays}")
+
+        end = start + datetime.timedelta(days=rng.choice([-3, 0, 1, 6, 7, 8, rng.randint(0, 4000)]))
+        got = workday_calendar.count_working_days(start, end, weekdays, calendar)
+        expected = reference_count(start, end, weekdays, calendar)
+        if got != expected:
+            raise AssertionError(f"count_working_days({start}, {end}, {weekdays}) = {got}, loop: {expected}")
+
+    # the calculators themselves
+    us_holidays = holidays.US()
+    for case in range(cases // 10):
+        start = random_date(rng, 2000, 2040)
+        duration = rng.randint(1, 1500)
+        weekdays = sorted(rng.sample(range(5), rng.randint(1, 5)))
+        if start.weekday() < 5 and start not in us_holidays:
+            text = start.strftime('%m/%d/%y')
+            window = holiday_calendars.us_holidays(start.year, start.year + 4)
+            expected = reference_end_date(start, duration, range(5), window).strftime('%m/%d/%y')
+            if project_calculator.calculate_end_date(text, duration) != expected:
+                raise AssertionError(f"project_calculator differs for {text}, {duration}")
+            if start.weekday() in weekdays:
+                expected = reference_end_date(start, duration, weekdays, window).strftime('%m/%d/%y')
+                got = hybrid_project_calculator.calculate_end_date(text, duration, len(weekdays), weekdays)
+                if got != expected:
+                    raise AssertionError(f"hybrid_project_calculator differs for {text}, {duration}, {weekdays}")
+        end = start + datetime.timedelta(days=rng.randint(0, 3000))
+        if project_days_calculator.calculate_custom_working_days(start, end, weekdays, us_holidays) != \
+                reference_count(start, end, weekdays, us_holidays):
+            raise AssertionError(f"project_days_calculator differs for {start}, {end}, {weekdays}")
+        working_days = rng.uniform(0, 1500)
+        if ap_project_planner.get_completion_date(start, working_days, weekdays) != \
+                reference_completion_date(start, working_days, weekdays, holiday_calendars.us_holidays()):
+            raise AssertionError(f"ap_project_planner differs for {start}, {working_days}, {weekdays}")
+        days_per_week = rng.randint(1, 5)
+        if ap_calculator.get_completion_date(start, working_days, days_per_week) != \
+                reference_ap_calculator(start, working_days, days_per_week, us_holidays):
+            raise AssertionError(f"ap_calculator differs for {start}, {working_days}, {days_per_week}")
+
+def timed(label, function, count):
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    print(f"{label:<34} {seconds:>8.3f}s {count / seconds:>12,.0f} answers/s")
+    return seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and time the working-day calendar against the day-by-day loops.")
+    parser.add_argument("--cases", type=int, default=5000, help="Random cases to check (Default: 5000)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (Default: 1)")
+    args = parser.parse_args()
+
+    check(args.cases, args.seed)
+    print(f"{args.cases:,} random cases: add_working_days, count_working_days and the calculators match the loops\n")
+
+    rng = random.Random(args.seed)
+    us_holidays = holiday_calendars.us_holidays(2000, 2060)
+    jobs = [(random_date(rng, 2000, 2040), rng.randint(250, 1250)) for _ in range(2000)]
+    print(f"{len(jobs):,} end dates, 1 to 5 year projects, Mon-Fri, US holidays")
+    loop_seconds = timed("day-by-day loop", lambda: [reference_end_date(start, duration, range(5), us_holidays)
+                                                     for start, duration in jobs], len(jobs))
+    seconds = timed("workday_calendar.add_working_days",
+                    lambda: [workday_calendar.add_working_days(start, duration, workday_calendar.WEEKDAYS, us_holidays)
+                             for start, duration in jobs], len(jobs))
+    print(f"speedup: {loop_seconds / seconds:.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+benchmark for archives_worker.py: many small EAD files through dacs-fix,
+once as a new process per file (archives.py dacs-fix in.xml out.xml) and
+once as requests to a running worker over its Unix socket
+
+checks that the worker writes the same files as the command line, that
+the project calculators answer the same as calling them directly, and that
+stopping the worker (SIGTERM) leaves none of its pool processes behind
+
+run in the command line: python3 benchmarks/bench_worker.py
+    optional: --files 50 --components 20 --workers 2
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "project_management"))
+from synthetic_ead import write_ead
+
+import project_calculator
+
+def connect(path, timeout=30):
+    """Connects to the worker's socket once it is listening."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(path)
+            return client
+        except (FileNotFoundError, ConnectionRefusedError):
+            client.close()
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+def child_pids(pid):
+    """Processes whose parent is pid (read from /proc; empty where there is no /proc)."""
+    children = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as f:
+                # the command name in parentheses can hold spaces, the parent pid comes after it
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+def alive(pid):
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
+
+def call_all(client, requests):
+    """Sends every request on one connection and returns the responses by id."""
+    client.sendall("".join(json.dumps(request) + "\n" for request in requests).encode("utf-8"))
+    responses = {}
+    with client.makefile("r", encoding="utf-8") as reader:
+        while len(responses) < len(requests):
+            response = json.loads(reader.readline())
+            responses[response["id"]] = response
+    return responses
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare one process per file with the resident worker.")
+    parser.add_argument("--files", type=int, default=50, help="Number of small EAD files (Default: 50)")
+    parser.add_argument("--components", type=int, default=20, help="Components per file (Default: 20)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (Default: number of CPUs)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = [write_ead(os.path.join(tmp, f"in_{number}.xml"), args.components, seed=number)
+                  for number in range(args.files)]
+
+        start = time.perf_counter()
+        for number, input_file in enumerate(inputs):
+            subprocess.run([sys.executable, "archives.py", "dacs-fix", input_file,
+                            os.path.join(tmp, f"cli_{number}.xml")], cwd=REPO_DIR, check=True,
+                           capture_output=True)
+        cli_seconds = time.perf_counter() - start
+
+        socket_path = os.path.join(tmp, "worker.sock")
+        worker = subprocess.Popen([sys.executable, "archives_worker.py", "--socket", socket_path,
+                                   "--workers", str(args.workers)], cwd=REPO_DIR, stderr=subprocess.DEVNULL)
+        try:
+            client = connect(socket_path)
+            call_all(client, [{"id": 0, "method": "ping"}])  # wait until the pool is warm
+
+            requests = [{"id": number, "method": "update_unitdate_text",
+                         "params": {"input_file": input_file, "output_file": os.path.join(tmp, f"worker_{number}.xml")}}
+                        for number, input_file in enumerate(inputs)]
+            start = time.perf_counter()
+            responses = call_all(client, requests)
+            worker_seconds = time.perf_counter() - start
+
+            dates = [f"{month:02d}/{day:02d}/25" for month in range(1, 13) for day in (3, 9, 16, 22)]
+            answers = call_all(client, [{"id": index, "method": "end_date", "params": {"start_date": date, "duration": 40}}
+                                        for index, date in enumerate(dates)])
+            client.close()
+        finally:
+            pool = child_pids(worker.pid)
+            worker.terminate()
+            worker.wait(timeout=30)
+
+        deadline = time.monotonic() + 5
+        while any(alive(pid) for pid in pool) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        left = [pid for pid in pool if alive(pid)]
+        if left:
+            raise AssertionError(f"worker processes left running after SIGTERM: {left}")
+
+        failed = [response for response in responses.values() if "error" in response]
+        if failed:
+            raise AssertionError(f"worker errors: {failed[0]['error']}")
+        for number in range(args.files):
+            with open(os.path.join(tmp, f"cli_{number}.xml"), encoding="utf-8") as f:
+                expected = f.read()
+            with open(os.path.join(tmp, f"worker_{number}.xml"), encoding="utf-8") as f:
+                if f.read() != expected:
+                    raise AssertionError(f"worker output differs for file {number}")
+        for index, date in enumerate(dates):
+            expected = project_calculator.calculate_end_date(date, 40)
+            answer = answers[index].get("result", f"Error: {answers[index].get('error', {}).get('message')}")
+            if expected.startswith("Error:") != answer.startswith("Error:") or \
+                    (not expected.startswith("Error:") and answer != expected):
+                raise AssertionError(f"end_date differs for {date}: {answer} != {expected}")
+
+    print(f"worker output matches the command line; its {len(pool)} pool processes stopped with it\n")
+    print(f"{'dacs-fix, one process per file':<34} {cli_seconds:>8.2f}s {args.files / cli_seconds:>8.1f} files/s")
+    print(f"{'dacs-fix, resident worker':<34} {worker_seconds:>8.2f}s {args.files / worker_seconds:>8.1f} files/s")
+    print(f"speedup: {cli_seconds / worker_seconds:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+checks that the lxml backend (--backend lxml) gives the same result as the
+BeautifulSoup backend for every XML transform, and times both
+
+the corpus is a handwritten sample with the awkward cases (namespace
+prefixes, dates nested in titles, mixed content, comments, entities, CDATA)
+plus synthetic finding aids; outputs are compared after canonicalization
+(C14N), CSV exports byte for byte
+
+BeautifulSoup collapses whitespace-only text containing a newline (indentation)
+to a single newline while lxml keeps the original indentation, so before
+comparing every run of whitespace containing a newline becomes one newline
+
+run in the command line: python3 benchmarks/compare_backends.py
+    optional: --sizes 1000,20000
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+
+from lxml import etree
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic_ead import generate_ead
+
+import dacs_date_fixer
+import folder_format_fixer
+import tag_deleter
+
+title_date_combine = importlib.import_module("title-date_combine")
+export_components = importlib.import_module("export-components")
+
+SAMPLE = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE ead>
+<ead:ead xmlns:ead="urn:isbn:1-931666-22-9" xmlns:xlink="http://www.w3.org/1999/xlink">
+  <ead:eadheader><ead:eadid>sample &amp; co</ead:eadid></ead:eadheader>
+  <ead:archdesc level="collection">
+    <ead:did><ead:unittitle>Papers, <ead:unitdate normal="1901/1950">1901 - 1950</ead:unitdate></ead:unittitle></ead:did>
+    <ead:scopecontent><ead:p>Scope <![CDATA[with <cdata>]]> text</ead:p><!-- note --></ead:scopecontent>
+    <ead:dsc>
+      <ead:c01 level="series"><ead:did>
+        <ead:unittitle>March 3</ead:unittitle><ead:unitdate>1950</ead:unitdate>
+        <ead:container type="box">1</ead:container><ead:container type="folder"> 4 -  7 </ead:container>
+        </ead:did>
+        <ead:controlaccess><ead:subject>x</ead:subject></ead:controlaccess> tail text
+        <ead:c02 level="file"><ead:did>
+          <ead:unittitle>June  12 meeting</ead:unittitle><ead:unitdate>1951</ead:unitdate>
+          <ead:unitdate>Jan. 5 - Feb.3, 1952</ead:unitdate>
+          <ead:container type="folder"><ead:emph>8 - 9</ead:emph></ead:container>
+          <ead:container type="folder">1 - 2<!-- c --></ead:container>
+          <ead:note type="did"><ead:p>did note</ead:p></ead:note>
+        </ead:did></ead:c02>
+      </ead:c01>
+      <ead:c01 level="series"><ead:did><ead:unittitle>Photographs</ead:unittitle>
+        <ead:unitdate normal="1960-02-01/1960-02-09">x</ead:unitdate></ead:did></ead:c01>
+    </ead:dsc>
+  </ead:archdesc>
+</ead:ead>
+"""
+
+TRANSFORMS = {
+    "dacs": lambda xml, backend: dacs_date_fixer.update_unitdate_text(xml, backend),
+    "folders": lambda xml, backend: folder_format_fixer.fix_folder_ranges(xml, backend),
+    "title-date": lambda xml, backend: title_date_combine.process_xml(xml, backend),
+}
+
+INDENTATION_RE = re.compile(r"\s*\n\s*")
+
+def _collapse_indentation(text):
+    return INDENTATION_RE.sub("\n", text) if text else text
+
+def canonical(xml_text):
+    root = etree.fromstring(xml_text.encode("utf-8"))
+    for element in root.iter():
+        element.text = _collapse_indentation(element.text) if isinstance(element.tag, str) else element.text
+        element.tail = _collapse_indentation(element.tail)
+    return etree.tostring(root, method="c14n")
+
+def timed(function, *args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function(*args)
+    return result, time.perf_counter() - start
+
+def compare_document(label, xml_text, tmp):
+    failures = 0
+    xml_file = os.path.join(tmp, "input.xml")
+    with open(xml_file, "w", encoding="utf-8") as f:
+        f.write(xml_text)
+
+    results = []
+    for name, transform in TRANSFORMS.items():
+        bs4_out, bs4_seconds = timed(transform, xml_text, "bs4")
+        lxml_out, lxml_seconds = timed(transform, xml_text, "lxml")
+        results.append((name, canonical(bs4_out) == canonical(lxml_out), bs4_seconds, lxml_seconds))
+
+    outputs = {}
+    seconds = {}
+    for backend in ("bs4", "lxml"):
+        out_file = os.path.join(tmp, f"delete_{backend}.xml")
+        _, seconds[backend] = timed(tag_deleter.remove_tags, xml_file, out_file, "controlaccess", backend)
+        with open(out_file, encoding="utf-8") as f:
+            outputs[backend] = canonical(f.read())
+    results.append(("delete", outputs["bs4"] == outputs["lxml"], seconds["bs4"], seconds["lxml"]))
+
+    for backend in ("bs4", "lxml"):
+        out_file = os.path.join(tmp, f"export_{backend}.csv")
+        _, seconds[backend] = timed(export_components.extract_ead_data_to_csv, xml_file, out_file, backend)
+        with open(out_file, "rb") as f:
+            outputs[backend] = f.read()
+    results.append(("export", outputs["bs4"] == outputs["lxml"], seconds["bs4"], seconds["lxml"]))
+
+    for name, same, bs4_seconds, lxml_seconds in results:
+        failures += not same
+        print(f"{label:>14} {name:>10} {'same' if same else 'DIFFERENT':>9} "
+              f"{bs4_seconds:>9.3f} {lxml_seconds:>9.3f} {bs4_seconds / max(lxml_seconds, 1e-9):>8.1f}x")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the bs4 and lxml backends.")
+    parser.add_argument("--sizes", default="1000,20000", help="Comma-separated synthetic component counts")
+    args = parser.parse_args()
+
+    print(f"{'document':>14} {'transform':>10} {'result':>9} {'bs4 s':>9} {'lxml s':>9} {'speedup':>9}")
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        failures += compare_document("sample", SAMPLE, tmp)
+        for size in (int(x) for x in args.sizes.split(",")):
+            failures += compare_document(f"{size} comps", generate_ead(size), tmp)
+
+    if failures:
+        print(f"\n{failures} comparison(s) differ")
+        sys.exit(1)
+    print("\nall backends agree")
+
+if __name__ == "__main__":
+    main()
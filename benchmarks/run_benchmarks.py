@@ -0,0 +1,199 @@
+"""
+benchmark suite for the EAD and FTK scripts: times each script's main
+function on synthetic inputs of several sizes and writes the results as
+JSON, so runs from two commits can be compared
+
+    dacs        dacs_date_fixer.update_unitdate_text
+    folders     folder_format_fixer.fix_folder_ranges
+    title-date  title-date_combine.process_xml
+    export      export-components.extract_ead_data_to_csv
+    flatten     er_json_to_csv.flatten_json
+
+every case runs in its own Python process, so the peak RSS reported is the
+case's own and not left over from a bigger one; with --repeat the fastest
+run is kept. rows are EAD components (FTK nodes for flatten), rows/s is
+rows divided by wall time
+
+run in the command line: python3 benchmarks/run_benchmarks.py --output results.json
+    optional: --sizes 1000,10000,100000 --cases dacs,export --backend lxml --repeat 3
+              --depth 12 --date-density 0.5 --container-density 0.8
+    compare two runs: python3 benchmarks/run_benchmarks.py --compare old.json new.json
+"""
+import argparse
+import contextlib
+import datetime
+import importlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+from synthetic_ead import write_ead
+from synthetic_ftk import write_ftk
+
+CASES = ["dacs", "folders", "title-date", "export", "flatten"]
+
+def _peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+def run_case(case, input_file, backend):
+    """Runs one case in this process and returns its measurements (dict)."""
+    if case == "flatten":
+        er_json_to_csv = importlib.import_module("er_json_to_csv")
+        with open(input_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        function = lambda: er_json_to_csv.flatten_json(data, "", [])
+    elif case == "export":
+        export_components = importlib.import_module("export-components")
+        csv_file = input_file + ".csv"
+        function = lambda: export_components.extract_ead_data_to_csv(input_file, csv_file, backend)
+    else:
+        transform = {
+            "dacs": lambda: importlib.import_module("dacs_date_fixer").update_unitdate_text,
+            "folders": lambda: importlib.import_module("folder_format_fixer").fix_folder_ranges,
+            "title-date": lambda: importlib.import_module("title-date_combine").process_xml,
+        }[case]()
+        with open(input_file, "r", encoding="utf-8") as f:
+            xml_content = f.read()
+        function = lambda: transform(xml_content, backend)
+
+    baseline_rss = _peak_rss_mb()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+    return {
+        "wall_seconds": time.perf_counter() - wall_start,
+        "cpu_seconds": time.process_time() - cpu_start,
+        "peak_rss_mb": _peak_rss_mb(),
+        "baseline_rss_mb": baseline_rss,
+    }
+
+def measure(case, size, input_file, backend, repeat):
+    """Runs a case `repeat` times in fresh processes; keeps the fastest run and the highest RSS."""
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run-case", case, input_file, "--backend", backend],
+            capture_output=True, text=True, cwd=REPO_DIR,
+        )
+        if completed.returncode != 0:
+            return {"case": case, "size": size, "error": completed.stderr.strip().splitlines()[-1]}
+        runs.append(json.loads(completed.stdout))
+
+    best = min(runs, key=lambda run: run["wall_seconds"])
+    best["peak_rss_mb"] = max(run["peak_rss_mb"] for run in runs)
+    best.update({
+        "case": case,
+        "size": size,
+        "backend": "bs4" if case == "flatten" else backend,
+        "input_mb": os.path.getsize(input_file) / 1_000_000,
+        "rows_per_second": size / best["wall_seconds"],
+    })
+    return best
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=REPO_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(cases, sizes, backend="bs4", repeat=1, depth=6, date_density=1.0, container_density=1.0):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            ead_file = None
+            for case in cases:
+                if case == "flatten":
+                    input_file = write_ftk(os.path.join(tmp, f"ftk_{size}.json"), size, depth)
+                else:
+                    ead_file = ead_file or write_ead(os.path.join(tmp, f"ead_{size}.xml"), size, depth,
+                                                     date_density=date_density,
+                                                     container_density=container_density)
+                    input_file = ead_file
+                result = measure(case, size, input_file, backend, repeat)
+                results.append(result)
+                if "error" in result:
+                    print(f"{case:>10} {size:>9} FAILED: {result['error']}")
+                else:
+                    print(f"{case:>10} {size:>9} {result['wall_seconds']:>9.3f} {result['peak_rss_mb']:>9.1f} "
+                          f"{result['rows_per_second']:>12,.0f}")
+    return results
+
+def compare(old_path, new_path):
+    """Prints the wall time and peak RSS ratio (new / old) for every case in both files."""
+    with open(old_path, encoding="utf-8") as f:
+        old = {(r["case"], r["size"], r.get("backend")): r for r in json.load(f)["results"] if "error" not in r}
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)["results"]
+
+    print(f"{'case':>10} {'size':>9} {'old s':>9} {'new s':>9} {'time':>7} {'rss':>7}")
+    for result in new:
+        before = old.get((result["case"], result["size"], result.get("backend")))
+        if before is None or "error" in result:
+            continue
+        print(f"{result['case']:>10} {result['size']:>9} {before['wall_seconds']:>9.3f} "
+              f"{result['wall_seconds']:>9.3f} {result['wall_seconds'] / before['wall_seconds']:>6.2f}x "
+              f"{result['peak_rss_mb'] / before['peak_rss_mb']:>6.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the archives scripts on synthetic data.")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated component/node counts")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Comma-separated cases (Default: {','.join(CASES)})")
+    parser.add_argument("--backend", choices=["bs4", "lxml"], default="bs4", help="XML library for the EAD cases (Default: bs4)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case, the fastest is kept (Default: 1)")
+    parser.add_argument("--depth", type=int, default=6, help="Maximum nesting depth, up to 12 (Default: 6)")
+    parser.add_argument("--date-density", type=float, default=1.0, help="Share of components with a <unitdate>")
+    parser.add_argument("--container-density", type=float, default=1.0, help="Share of components with <container>s")
+    parser.add_argument("--output", help="Path for the JSON results (Default: print only)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two results files and exit")
+    parser.add_argument("--run-case", nargs=2, metavar=("CASE", "INPUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(*args.run_case, args.backend)))
+        return
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    cases = args.cases.split(",")
+    unknown = [case for case in cases if case not in CASES]
+    if unknown:
+        print(f"Error: Unknown case(s) {', '.join(unknown)}. Choose from {', '.join(CASES)}.")
+        sys.exit(1)
+
+    print(f"{'case':>10} {'rows':>9} {'seconds':>9} {'peak MB':>9} {'rows/s':>12}")
+    results = run_suite(cases, [int(x) for x in args.sizes.split(",")], args.backend, args.repeat,
+                        args.depth, args.date_density, args.container_density)
+
+    report = {
+        "commit": _git_commit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "backend": args.backend, "repeat": args.repeat, "depth": args.depth,
+            "date_density": args.date_density, "container_density": args.container_density,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to '{args.output}'")
+
+    if any("error" in result for result in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
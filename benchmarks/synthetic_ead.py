@@ -0,0 +1,95 @@
+"""
+builds synthetic EAD finding aids for benchmarking the scripts
+components are nested series > subseries > file > item down to max_depth,
+only some components carry a <scopecontent>, so a naive descendant search
+from a series has to walk far into its children
+
+nesting goes down to c12 at most; date_density and container_density are
+the share of components that get a <unitdate> and <container>s (Default: all)
+
+run in the command line: python3 synthetic_ead.py 10000 output.xml
+    optional: --depth 12 --date-density 0.5 --container-density 0.8
+"""
+import argparse
+import random
+
+EAD_NAMESPACE = "urn:isbn:1-931666-22-9"
+MAX_DEPTH = 12
+LEVELS = ["series", "subseries", "file", "item"]
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+
+def _chance(rng, density):
+    # no random draw at full density, so the default documents never change
+    return density >= 1 or rng.random() < density
+
+def _component_xml(number, depth, rng, date_density=1.0, container_density=1.0):
+    tag = f"c{depth:02d}"
+    level = LEVELS[min(depth - 1, len(LEVELS) - 1)]
+    dated = _chance(rng, date_density)
+    if dated:
+        year = rng.randint(1850, 1999)
+        month = rng.randint(1, 12)
+    parts = [f'<{tag} level="{level}"><did>', f'<unitid type="local_mss">{number}</unitid>']
+    if _chance(rng, container_density):
+        parts.append(f'<container type="box">{rng.randint(1, 400)}</container>')
+        parts.append(f'<container type="folder">{rng.randint(1, 20)} - {rng.randint(21, 40)}</container>')
+    if dated:
+        parts.append(f'<unittitle>{MONTHS[month - 1]} {rng.randint(1, 28)}</unittitle>')
+        parts.append(f'<unitdate normal="{year}-{month:02d}">{year}</unitdate>')
+    else:
+        parts.append('<unittitle>Correspondence</unittitle>')
+    parts.append('<physdesc><extent>1 folder</extent></physdesc>')
+    parts.append('</did>')
+    if rng.random() < 0.25:
+        parts.append(f'<scopecontent><p>Scope and content of component {number}.</p></scopecontent>')
+    return tag, "".join(parts)
+
+def generate_ead(component_count, max_depth=6, seed=0, date_density=1.0, container_density=1.0):
+    """Returns an EAD document (str) with exactly component_count components."""
+    if not 1 <= max_depth <= MAX_DEPTH:
+        raise ValueError(f"max_depth must be between 1 and {MAX_DEPTH}")
+    rng = random.Random(seed)
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        f'<ead xmlns="{EAD_NAMESPACE}"><eadheader><eadid>synthetic</eadid>',
+        '<filedesc><titlestmt><titleproper>Synthetic Papers</titleproper></titlestmt></filedesc></eadheader>\n',
+        '<archdesc level="collection"><did><unittitle>Synthetic Papers</unittitle>',
+        '<unitdate normal="1850/1999">1850-1999</unitdate></did>',
+        '<scopecontent><p>Synthetic collection.</p></scopecontent><dsc>\n',
+    ]
+
+    open_tags = []
+    for number in range(1, component_count + 1):
+        # go deeper while we can, otherwise climb back up a random amount
+        if open_tags and (len(open_tags) >= max_depth or rng.random() < 0.35):
+            for _ in range(rng.randint(1, len(open_tags))):
+                out.append(f"</{open_tags.pop()}>\n")
+        tag, xml = _component_xml(number, len(open_tags) + 1, rng, date_density, container_density)
+        out.append(xml)
+        open_tags.append(tag)
+
+    while open_tags:
+        out.append(f"</{open_tags.pop()}>\n")
+    out.append("</dsc></archdesc></ead>\n")
+    return "".join(out)
+
+def write_ead(path, component_count, max_depth=6, seed=0, date_density=1.0, container_density=1.0):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(generate_ead(component_count, max_depth, seed, date_density, container_density))
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic EAD finding aid.")
+    parser.add_argument("components", type=int, help="Number of <c0n> components")
+    parser.add_argument("output", help="Path for the output XML file")
+    parser.add_argument("--depth", type=int, default=6, help=f"Maximum nesting depth, up to {MAX_DEPTH} (Default: 6)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (Default: 0)")
+    parser.add_argument("--date-density", type=float, default=1.0,
+                        help="Share of components with a <unitdate> (Default: 1.0)")
+    parser.add_argument("--container-density", type=float, default=1.0,
+                        help="Share of components with <container>s (Default: 1.0)")
+    args = parser.parse_args()
+    write_ead(args.output, args.components, args.depth, args.seed, args.date_density, args.container_density)
@@ -0,0 +1,79 @@
+"""
+builds synthetic FTK JSON exports (the nested 'children' trees read by
+er_json_to_csv.py) for benchmarking
+
+every node has a title and an er_name; about er_density of them are
+electronic records with an er_number, file_size and file_count, and their
+er_name ends in one of the date forms er_json_to_csv.py looks for
+(", 1990-1995", ", circa 1980", ", 1975 March 3", ", 1975 March", ", 1975")
+
+run in the command line: python3 synthetic_ftk.py 100000 output.json
+    optional: --depth 8 --er-density 0.5
+"""
+import argparse
+import json
+import random
+
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+SUBJECTS = ["Correspondence", "Photographs", "Minutes", "Drafts", "Email", "Reports", "Websites"]
+
+def _date_suffix(rng):
+    year = rng.randint(1950, 2020)
+    kind = rng.randrange(6)
+    if kind == 0:
+        return f", {year}-{year + rng.randint(1, 10)}"
+    if kind == 1:
+        return f", circa {year}"
+    if kind == 2:
+        return f", {year} {rng.choice(MONTHS)} {rng.randint(1, 28)}"
+    if kind == 3:
+        return f", {year} {rng.choice(MONTHS)}"
+    if kind == 4:
+        return f", {year}"
+    return ""
+
+def _node(number, rng, er_density):
+    subject = rng.choice(SUBJECTS)
+    node = {"title": f"{subject} {number}", "er_name": f"{subject} {number}"}
+    if rng.random() < er_density:
+        node["er_name"] += _date_suffix(rng)
+        node["er_number"] = f"ER {number}"
+        node["file_size"] = int(10 ** rng.uniform(2, 12))
+        node["file_count"] = rng.randint(1, 5000)
+    node["children"] = []
+    return node
+
+def generate_ftk(node_count, max_depth=6, seed=0, er_density=0.5):
+    """Returns an FTK export (dict) with exactly node_count nodes below the root."""
+    rng = random.Random(seed)
+    root = {"title": "Synthetic Papers", "children": []}
+
+    open_nodes = [root]
+    for number in range(1, node_count + 1):
+        # go deeper while we can, otherwise climb back up a random amount
+        depth = len(open_nodes) - 1
+        if depth and (depth >= max_depth or rng.random() < 0.35):
+            del open_nodes[-rng.randint(1, depth):]
+        node = _node(number, rng, er_density)
+        open_nodes[-1]["children"].append(node)
+        open_nodes.append(node)
+    return root
+
+def write_ftk(path, node_count, max_depth=6, seed=0, er_density=0.5):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(generate_ftk(node_count, max_depth, seed, er_density), f)
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic FTK JSON export.")
+    parser.add_argument("nodes", type=int, help="Number of nodes in the tree")
+    parser.add_argument("output", help="Path for the output JSON file")
+    parser.add_argument("--depth", type=int, default=6, help="Maximum nesting depth (Default: 6)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (Default: 0)")
+    parser.add_argument("--er-density", type=float, default=0.5,
+                        help="Share of nodes that are electronic records (Default: 0.5)")
+    args = parser.parse_args()
+    write_ftk(args.output, args.nodes, args.depth, args.seed, args.er_density)
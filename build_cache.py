@@ -0,0 +1,125 @@
+"""
+content-hash cache so re-runs skip EAD files that have not changed
+
+a JSON manifest in the cache directory maps
+    sha256(input file) + transform name + transform version + options
+to the output that transform produced. A copy of every output is kept in
+the cache directory as well, so a deleted or overwritten output file is
+restored by copying instead of re-running the transform.
+
+used by dacs_date_fixer.py, export-components.py and ead_batch.py:
+    python3 dacs_date_fixer.py in.xml out.xml --cache .archives_cache
+    python3 dacs_date_fixer.py in.xml out.xml --cache .archives_cache --force   (full rebuild)
+
+bump a script's TRANSFORM_VERSION whenever a change alters its output
+"""
+import hashlib
+import json
+import os
+import shutil
+
+DEFAULT_CACHE_DIR = ".archives_cache"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_key(input_hash, transform, version, options=None):
+    options_json = json.dumps(options or {}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{input_hash}\0{transform}\0{version}\0{options_json}".encode("utf-8")).hexdigest()
+
+class BuildCache:
+    """
+    Persistent manifest of transform outputs.
+
+    is_current() answers "can this run be skipped?" (restoring the output
+    from the cache if needed); record() stores the output of a run that did
+    happen. Call save() once at the end to write the manifest.
+    With force=True nothing is skipped, but new results are still recorded.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, force=False):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, "outputs")
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        self.force = force
+        self._input_hashes = {}
+        self.entries = {}   # cache key -> {"blob": sha256 of output}
+        self.outputs = {}   # output path -> {"key", "size", "mtime_ns"}
+
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+                if manifest.get("version") == MANIFEST_VERSION:
+                    self.entries = manifest.get("entries", {})
+                    self.outputs = manifest.get("outputs", {})
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Warning: ignoring unreadable cache manifest '{self.manifest_path}': {e}")
+
+    def input_hash(self, input_file):
+        path = os.path.abspath(input_file)
+        if path not in self._input_hashes:
+            self._input_hashes[path] = file_sha256(path)
+        return self._input_hashes[path]
+
+    def key_for(self, input_file, transform, version, options=None):
+        return cache_key(self.input_hash(input_file), transform, version, options)
+
+    def is_current(self, input_file, output_file, transform, version, options=None):
+        """True if output_file already holds (or was just restored to) this run's result."""
+        if self.force:
+            return False
+
+        key = self.key_for(input_file, transform, version, options)
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+
+        output_path = os.path.abspath(output_file)
+        recorded = self.outputs.get(output_path)
+        if recorded and recorded["key"] == key and os.path.exists(output_path):
+            stat = os.stat(output_path)
+            if stat.st_size == recorded["size"] and stat.st_mtime_ns == recorded["mtime_ns"]:
+                return True
+
+        blob_path = os.path.join(self.blob_dir, entry["blob"])
+        if not os.path.exists(blob_path):
+            return False
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        shutil.copyfile(blob_path, output_path)
+        self._remember_output(output_path, key)
+        return True
+
+    def record(self, input_file, output_file, transform, version, options=None):
+        """Stores the output of a finished run."""
+        key = self.key_for(input_file, transform, version, options)
+        output_path = os.path.abspath(output_file)
+        blob = file_sha256(output_path)
+
+        os.makedirs(self.blob_dir, exist_ok=True)
+        blob_path = os.path.join(self.blob_dir, blob)
+        if not os.path.exists(blob_path):
+            shutil.copyfile(output_path, blob_path)
+
+        self.entries[key] = {"blob": blob}
+        self._remember_output(output_path, key)
+
+    def _remember_output(self, output_path, key):
+        stat = os.stat(output_path)
+        self.outputs[output_path] = {"key": key, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries, "outputs": self.outputs}, f)
+        os.replace(temp_path, self.manifest_path)
@@ -3,126 +3,111 @@ script parses XML EAD file, reads <unitdate> tags,
 and corrects dates that are not DACS compliant 
 run from the command line 
 
+add --backend lxml to work on an lxml tree instead of BeautifulSoup (much faster on large files)
+add --stats to print parse/transform/serialize timings as JSON, --profile out.prof to profile the run
+
 """
 import argparse
 from bs4 import BeautifulSoup
-import re
-
-def format_dacs_date(normal_date):
-    months = {
-        "01": "January", "02": "February", "03": "March", "04": "April",
-        "05": "May", "06": "June", "07": "July", "08": "August",
-        "09": "September", "10": "October", "11": "November", "12": "December"
-    }
-
-    def parse_date(date_str):
-        parts = date_str.split('-')
-        year = parts[0]
-        month = months.get(f"{int(parts[1]):02d}") if len(parts) > 1 else ""
-        day = str(int(parts[2])) if len(parts) > 2 else ""
-        return year, month, day
-
-    try:
-        if '/' in normal_date:
-            start_date, end_date = normal_date.split('/')
-            start_year, start_month, start_day = parse_date(start_date)
-            end_year, end_month, end_day = parse_date(end_date)
-
-            if start_year == end_year:
-                if start_month == end_month:
-                    if start_day and end_day:
-                        
-                        return f"{start_year} {start_month} {start_day}–{end_day}"
-                    else:
-                       
-                        return f"{start_year} {start_month}"
-                else:
-                
-                    start_parts = " ".join(filter(None, [start_month, start_day]))
-                    end_parts = " ".join(filter(None, [end_month, end_day]))
-                    return f"{start_year} {start_parts}–{end_parts}".strip()
-            else:
-                
-                start_parts = " ".join(filter(None, [start_year, start_month, start_day]))
-                end_parts = " ".join(filter(None, [end_year, end_month, end_day]))
-                return f"{start_parts}–{end_parts}".strip()
-        else:
-           
-            year, month, day = parse_date(normal_date)
-            return " ".join(filter(None, [year, month, day]))
-
-    except Exception as e:
-        print(f"Error: Could not process date '{normal_date}': {e}")
-        return normal_date
-    
-def format_text_date_if_needed(text):
-   
-    abbreviations = {
-        r"\bJan\.?\b": "January",
-        r"\bFeb\.?\b": "February",
-        r"\bMar\.?\b": "March",
-        r"\bApr\.?\b": "April",
-        r"\bJun\.?\b": "June",
-        r"\bJul\.?\b": "July",
-        r"\bAug\.?\b": "August",
-        r"\bSep\.?\b": "September",
-        r"\bOct\.?\b": "October",
-        r"\bNov\.?\b": "November",
-        r"\bDec\.?\b": "December"
-    }
+import build_cache
+import ead_lxml
+import run_stats
+# date formatting lives in dacs_dates.py so other scripts can share it
+from dacs_dates import format_dacs_date, format_text_date_if_needed, normalize_unitdates
 
-    full_months = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
+# bump when a change alters the output, so cached results are rebuilt
+TRANSFORM_VERSION = "1"
 
-    cleaned = text.strip()
+UNITDATES = ead_lxml.elements_named("unitdate")
 
-    cleaned = re.sub(r'\s*[-–]\s*', '–', cleaned)
+def update_unitdate_soup(soup):
+    """updates every <unitdate> in an already parsed document, in place"""
+    unitdates = soup.find_all("unitdate")
 
-    cleaned = re.sub(r'\.(\d)', r'. \1', cleaned)
+    # 'normal' attribute wins, otherwise the tag's own text gets cleaned up
+    pairs = []
+    for unitdate in unitdates:
+        normal = unitdate.get("normal")
+        pairs.append((normal, "") if normal else (None, unitdate.get_text()))
 
-    for pattern, full in abbreviations.items():
-        cleaned = re.sub(pattern, full, cleaned)
+    for unitdate, formatted_date in zip(unitdates, normalize_unitdates(pairs)):
+        unitdate.string = formatted_date
 
-    for month in full_months:
-        cleaned = re.sub(fr"\b{month}\.", month, cleaned)
+    return soup
 
-    return cleaned
+def update_unitdate_tree(root):
+    """lxml version of update_unitdate_soup, for an ead_lxml.parse() root"""
+    unitdates = UNITDATES(root)
 
-def update_unitdate_text(xml_content):
-   
-    soup = BeautifulSoup(xml_content, "xml")
-    
-    for unitdate in soup.find_all("unitdate"):
+    pairs = []
+    for unitdate in unitdates:
         normal = unitdate.get("normal")
-        if normal:
-            formatted_date = format_dacs_date(normal)
-            unitdate.string = formatted_date
-        else:
-            original_text = unitdate.get_text()
-            cleaned_text = format_text_date_if_needed(original_text)
-            unitdate.string = cleaned_text
+        pairs.append((normal, "") if normal else (None, ead_lxml.element_text(unitdate, strip=False)))
 
-    return str(soup)
+    for unitdate, formatted_date in zip(unitdates, normalize_unitdates(pairs)):
+        ead_lxml.set_text(unitdate, formatted_date)
 
-def main():
+    return root
+
+def update_unitdate_text(xml_content, backend="bs4", stats=None):
+   
+    if backend == "lxml":
+        with run_stats.phase(stats, "parse"):
+            root = ead_lxml.parse(xml_content)
+        if stats:
+            stats.count("elements", ead_lxml.element_count(root))
+        with run_stats.phase(stats, "transform"):
+            update_unitdate_tree(root)
+        with run_stats.phase(stats, "serialize"):
+            return ead_lxml.serialize(root)
+
+    with run_stats.phase(stats, "parse"):
+        soup = BeautifulSoup(xml_content, "xml")
+    if stats:
+        stats.count("elements", len(soup.find_all(True)))
+    with run_stats.phase(stats, "transform"):
+        update_unitdate_soup(soup)
+    with run_stats.phase(stats, "serialize"):
+        return str(soup)
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Update <unitdate> tags in an XML file to DACS-compliant dates.")
     parser.add_argument("input_file", help="Path to the input XML file")
     parser.add_argument("output_file", help="Path to save the updated XML file")
+    parser.add_argument("--cache", metavar="CACHE_DIR",
+                        help="Skip the run if this input was already converted (see build_cache.py)")
+    parser.add_argument("--force", action="store_true", help="Ignore the cache and rebuild")
+    parser.add_argument("--backend", choices=["bs4", "lxml"], default="bs4",
+                        help="XML library to use (Default: bs4)")
+    run_stats.add_arguments(parser)
     
-    args = parser.parse_args()
-
-    with open(args.input_file, "r", encoding="utf-8") as file:
-        xml_content = file.read()
-
-    updated_xml = update_unitdate_text(xml_content)
+    args = parser.parse_args(argv)
+    with run_stats.session(args, "dacs_date_fixer") as stats:
+        options = {"backend": args.backend}
+
+        cache = build_cache.BuildCache(args.cache, force=args.force) if args.cache else None
+        if cache and cache.is_current(args.input_file, args.output_file, "dacs_date_fixer", TRANSFORM_VERSION, options):
+            cache.save()
+            print(f"{args.input_file} unchanged, {args.output_file} is up to date")
+            return
+
+        with run_stats.phase(stats, "read"):
+            with open(args.input_file, "r", encoding="utf-8") as file:
+                xml_content = file.read()
+        run_stats.count(stats, "input_bytes", len(xml_content))
+
+        updated_xml = update_unitdate_text(xml_content, args.backend, stats)
     
 
-    with open(args.output_file, "w", encoding="utf-8") as file:
-        file.write(updated_xml)
+        with run_stats.phase(stats, "write"):
+            with open(args.output_file, "w", encoding="utf-8") as file:
+                file.write(updated_xml)
+
+        if cache:
+            cache.record(args.input_file, args.output_file, "dacs_date_fixer", TRANSFORM_VERSION, options)
+            cache.save()
     
-    print(f"Updated XML file saved to {args.output_file}")
+        print(f"Updated XML file saved to {args.output_file}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+"""
+DACS date normalization shared by the EAD scripts
+
+month tables and regular expressions are built once at import time, and
+both formatters are memoized with a bounded LRU cache keyed on the raw
+'normal' attribute or <unitdate> text, since finding aids repeat the same
+few thousand date strings over and over
+
+    format_dacs_date("1942-03/1942-05")        -> "1942 March–May"
+    format_text_date_if_needed("Jan. 5 - Feb.3") -> "January 5–February 3"
+    normalize_unitdates([(normal, text), ...])   -> list of DACS strings
+"""
+import re
+from functools import lru_cache
+
+DATE_CACHE_SIZE = 65536
+
+MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+# 1 -> "January" ... 12 -> "December"
+MONTHS_BY_NUMBER = {number: name for number, name in enumerate(MONTH_NAMES, 1)}
+# "january" -> 1 ... "december" -> 12
+MONTH_NUMBERS = {name.lower(): number for number, name in enumerate(MONTH_NAMES, 1)}
+# alternation of the full month names, for building other patterns
+MONTH_PATTERN = "|".join(MONTH_NAMES)
+
+ABBREVIATIONS = {
+    "Jan": "January", "Feb": "February", "Mar": "March", "Apr": "April",
+    "Jun": "June", "Jul": "July", "Aug": "August", "Sep": "September",
+    "Oct": "October", "Nov": "November", "Dec": "December"
+}
+
+_DASH_RE = re.compile(r'\s*[-–]\s*')
+_PERIOD_DIGIT_RE = re.compile(r'\.(\d)')
+_ABBREVIATION_RE = re.compile(r"\b(" + "|".join(ABBREVIATIONS) + r")\.?\b")
+_MONTH_PERIOD_RE = re.compile(r"\b(" + MONTH_PATTERN + r")\.")
+
+def _parse_normal_date(date_str):
+    parts = date_str.split('-')
+    year = parts[0]
+    month = MONTHS_BY_NUMBER.get(int(parts[1])) if len(parts) > 1 else ""
+    day = str(int(parts[2])) if len(parts) > 2 else ""
+    return year, month, day
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def format_dacs_date(normal_date):
+    """Turns an ISO 'normal' attribute (1942-03-05 or a start/end range) into DACS text."""
+    try:
+        if '/' in normal_date:
+            start_date, end_date = normal_date.split('/')
+            start_year, start_month, start_day = _parse_normal_date(start_date)
+            end_year, end_month, end_day = _parse_normal_date(end_date)
+
+            if start_year == end_year:
+                if start_month == end_month:
+                    if start_day and end_day:
+                        return f"{start_year} {start_month} {start_day}–{end_day}"
+                    else:
+                        return f"{start_year} {start_month}"
+                else:
+                    start_parts = " ".join(filter(None, [start_month, start_day]))
+                    end_parts = " ".join(filter(None, [end_month, end_day]))
+                    return f"{start_year} {start_parts}–{end_parts}".strip()
+            else:
+                start_parts = " ".join(filter(None, [start_year, start_month, start_day]))
+                end_parts = " ".join(filter(None, [end_year, end_month, end_day]))
+                return f"{start_parts}–{end_parts}".strip()
+        else:
+            year, month, day = _parse_normal_date(normal_date)
+            return " ".join(filter(None, [year, month, day]))
+
+    except Exception as e:
+        print(f"Error: Could not process date '{normal_date}': {e}")
+        return normal_date
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def format_text_date_if_needed(text):
+    """Cleans free-text dates: en dash ranges, spelled-out months, no stray periods."""
+    cleaned = text.strip()
+    cleaned = _DASH_RE.sub('–', cleaned)
+    cleaned = _PERIOD_DIGIT_RE.sub(r'. \1', cleaned)
+    cleaned = _ABBREVIATION_RE.sub(lambda match: ABBREVIATIONS[match.group(1)], cleaned)
+    cleaned = _MONTH_PERIOD_RE.sub(r'\1', cleaned)
+    return cleaned
+
+def normalize_unitdate(normal, text):
+    """DACS text for one <unitdate>: from its 'normal' attribute if set, else from its text."""
+    if normal:
+        return format_dacs_date(normal)
+    return format_text_date_if_needed(text)
+
+def normalize_unitdates(unitdates):
+    """
+    Batch version of normalize_unitdate: takes (normal, text) pairs and
+    returns the DACS strings in the same order, formatting each distinct
+    pair only once.
+    """
+    results = {}
+    formatted = []
+    for pair in unitdates:
+        if pair not in results:
+            results[pair] = normalize_unitdate(*pair)
+        formatted.append(results[pair])
+    return formatted
@@ -0,0 +1,158 @@
+"""
+runs the EAD fixers over a whole directory (or glob) of finding aids,
+spreading the files over a pool of worker processes (one per CPU core by
+default) so bs4/lxml are imported once per worker instead of once per file
+
+uses the same steps as ead_pipeline.py, default: dacs,folders
+    dacs     - dacs_date_fixer.update_unitdate_text
+    folders  - folder_format_fixer.fix_folder_ranges
+
+prints OK/FAILED for every file and the total throughput at the end
+with --cache, files whose output is already current are skipped (see build_cache.py)
+
+run in the command line:
+python3 ead_batch.py input_dir output_dir
+python3 ead_batch.py "eads/*.xml" output_dir --steps dacs,folders,title-date --workers 4
+python3 ead_batch.py input_dir output_dir --cache .archives_cache [--force]
+python3 ead_batch.py input_dir output_dir --backend lxml
+python3 ead_batch.py input_dir output_dir --stats batch_stats.json
+
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import build_cache
+import ead_pipeline
+import run_stats
+
+DEFAULT_STEPS = "dacs,folders"
+
+def find_input_files(input_path):
+    """A directory means every .xml file in it; anything else is used as a glob."""
+    if os.path.isdir(input_path):
+        pattern = os.path.join(input_path, "*.xml")
+    else:
+        pattern = input_path
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+def process_file(job):
+    """Worker: runs the pipeline on one file. Returns (input, output, error, seconds, bytes)."""
+    input_file, output_file, steps, backend = job
+    start = time.perf_counter()
+    try:
+        with open(input_file, "r", encoding="utf-8") as file:
+            xml_content = file.read()
+
+        updated_xml = ead_pipeline.run_pipeline(xml_content, steps, backend)
+
+        with open(output_file, "w", encoding="utf-8") as file:
+            file.write(updated_xml)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        xml_content = ""
+
+    return input_file, output_file, error, time.perf_counter() - start, len(xml_content)
+
+def run_batch(input_files, output_dir, steps=DEFAULT_STEPS, workers=None, cache=None, backend="bs4"):
+    """
+    Processes input_files into output_dir (same file names) in a process pool.
+    Returns a list of (input, output, error, seconds, bytes), in input order,
+    for the files that were actually processed. With a build_cache.BuildCache,
+    files whose output is already current are skipped.
+    """
+    version = ead_pipeline.steps_version(steps, backend)  # also fails fast on a bad step name
+    options = {"backend": backend}
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = []
+    for path in input_files:
+        output_file = os.path.join(output_dir, os.path.basename(path))
+        if cache and cache.is_current(path, output_file, "ead_pipeline", version, options):
+            print(f"CACHED {path} -> {output_file}")
+            continue
+        jobs.append((path, output_file, steps, backend))
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 8))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(process_file, jobs, chunksize=chunksize):
+            input_file, output_file, error, seconds, size = result
+            if error:
+                print(f"FAILED {input_file}: {error}")
+            else:
+                print(f"OK     {input_file} -> {output_file} ({seconds:.2f}s)")
+                if cache:
+                    cache.record(input_file, output_file, "ead_pipeline", version, options)
+            results.append(result)
+
+    if cache:
+        cache.save()
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the EAD fixers over many files in parallel.")
+    parser.add_argument("input", help="Input directory of .xml files, or a glob such as 'eads/*.xml'")
+    parser.add_argument("output_dir", help="Directory to save the updated XML files")
+    parser.add_argument("--steps", default=DEFAULT_STEPS,
+                        help=f"Comma-separated steps, as in ead_pipeline.py (Default: {DEFAULT_STEPS})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (Default: number of CPU cores)")
+    parser.add_argument("--cache", metavar="CACHE_DIR",
+                        help="Skip files whose output is already current (see build_cache.py)")
+    parser.add_argument("--force", action="store_true", help="Ignore the cache and rebuild every file")
+    parser.add_argument("--backend", choices=ead_pipeline.BACKENDS, default="bs4",
+                        help="XML library to use (Default: bs4)")
+    run_stats.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    input_files = find_input_files(args.input)
+    if not input_files:
+        print(f"Error: No XML files found for '{args.input}'")
+        sys.exit(1)
+
+    names = [os.path.basename(path) for path in input_files]
+    if len(set(names)) != len(names):
+        print("Error: Input files share file names and would overwrite each other in the output directory.")
+        sys.exit(1)
+
+    try:
+        ead_pipeline.parse_steps(args.steps, args.backend)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    cache = build_cache.BuildCache(args.cache, force=args.force) if args.cache else None
+
+    with run_stats.session(args, "ead_batch") as stats:
+        start = time.perf_counter()
+        with run_stats.phase(stats, "batch"):
+            results = run_batch(input_files, args.output_dir, args.steps, args.workers, cache, args.backend)
+        elapsed = time.perf_counter() - start
+
+        failed = [result for result in results if result[2]]
+        total_mb = sum(result[4] for result in results) / 1_000_000
+        if stats:
+            stats.count("files", len(results))
+            stats.count("failed", len(failed))
+            stats.count("skipped", len(input_files) - len(results))
+            stats.count("input_bytes", sum(result[4] for result in results))
+        print("\n" + "=" * 55)
+        print(f"Files:       {len(results)} ({len(results) - len(failed)} OK, {len(failed)} failed)")
+        if cache:
+            print(f"Up to date:  {len(input_files) - len(results)} (skipped)")
+        print(f"Wall time:   {elapsed:.2f}s")
+        print(f"Throughput:  {len(results) / elapsed:.1f} files/s, {total_mb / elapsed:.2f} MB/s")
+        print("=" * 55)
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
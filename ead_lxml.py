@@ -0,0 +1,87 @@
+"""
+helpers for the lxml backend of the EAD scripts (--backend lxml)
+
+works directly on lxml etree elements instead of a BeautifulSoup tree,
+with the same text and element semantics the bs4 code relies on:
+
+    element_text(el, " ", strip=True)  ~ tag.get_text(" ", strip=True)
+    set_text(el, "x")                  ~ tag.string = "x"
+    remove_element(el)                 ~ tag.decompose()
+    string_holder(el)                  ~ tag.string (where the single string lives)
+
+tags are matched on their local name, so namespaced (urn:isbn:1-931666-22-9)
+and prefixed (ead:unitdate) finding aids work the same as plain ones
+"""
+from lxml import etree
+
+XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>\n'
+
+# same leniency as BeautifulSoup's "xml" parser, CDATA kept as text
+_PARSER = etree.XMLParser(recover=True, encoding="utf-8")
+
+def parse(xml_content):
+    """Parses a str or bytes document and returns its root element."""
+    if isinstance(xml_content, str):
+        xml_content = xml_content.encode("utf-8")
+    return etree.fromstring(xml_content, _PARSER)
+
+def parse_file(path):
+    return etree.parse(path, etree.XMLParser(recover=True)).getroot()
+
+def serialize(root):
+    """Document as a str, starting with the same XML declaration bs4 writes."""
+    return XML_DECLARATION + etree.tostring(root.getroottree(), encoding="unicode")
+
+def elements_named(name):
+    """Compiled XPath returning every element with this local name, in document order."""
+    return etree.XPath(f"//*[local-name()='{name}']")
+
+def element_count(root):
+    """Number of elements in root's document (comments and PIs not included)."""
+    return int(root.xpath("count(//*)"))
+
+def local_name(tag):
+    # lxml reports namespaced tags as '{uri}name'
+    return tag.rpartition('}')[2]
+
+def element_text(element, separator='', strip=True):
+    # same result as BeautifulSoup's get_text(separator, strip=strip)
+    if not strip:
+        return separator.join(element.itertext())
+    return separator.join(t.strip() for t in element.itertext() if t.strip())
+
+def set_text(element, text):
+    """Replaces everything inside element with a single string, keeping attributes and tail."""
+    for child in list(element):
+        element.remove(child)
+    element.text = text
+
+def remove_element(element):
+    """Deletes element and its content; the text that followed it stays in place."""
+    parent = element.getparent()
+    if parent is None:
+        return
+    if element.tail:
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or '') + element.tail
+        else:
+            parent.text = (parent.text or '') + element.tail
+    parent.remove(element)
+
+def string_holder(element):
+    """
+    Element whose .text is the tag's only string (BeautifulSoup's .string),
+    following single-child chains like <container><emph>3</emph></container>.
+    Returns None when the tag holds zero or several strings.
+    """
+    while True:
+        has_text = bool(element.text)
+        if has_text and len(element) == 0:
+            return element
+        if has_text or len(element) != 1:
+            return None
+        child = element[0]
+        if child.tail or not isinstance(child.tag, str):
+            return None
+        element = child
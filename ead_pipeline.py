@@ -0,0 +1,150 @@
+"""
+runs several EAD clean-up steps on one XML file with a single parse and a
+single write, instead of running each fixer script one after another
+(each of which re-reads, re-parses and re-writes the whole file)
+
+steps run in the order given, available steps:
+
+    dacs            dacs_date_fixer.py       - DACS-compliant <unitdate> text
+    folders         folder_format_fixer.py   - "1 - 2" folder ranges become "1-2"
+    title-date      title-date_combine.py    - moves dates from <unittitle> to <unitdate>
+    proper-title    title_fix_ead.py         - capitalizes each word of <unittitle>
+    delete:TAG      tag_deleter.py           - deletes TAG and its content (e.g. delete:controlaccess)
+
+run in the command line:
+python3 ead_pipeline.py input.xml output.xml --steps title-date,dacs,folders,delete:controlaccess
+
+add --backend lxml to run the steps on an lxml tree instead of BeautifulSoup
+(much faster; proper-title is only available with bs4)
+
+add --stats to get the time spent parsing, in each step and serializing as JSON
+(--profile out.prof writes a cProfile file and out.prof.folded for flame graphs)
+
+"""
+import argparse
+import importlib
+import sys
+from functools import partial
+from bs4 import BeautifulSoup
+
+import dacs_date_fixer
+import ead_lxml
+import folder_format_fixer
+import run_stats
+import tag_deleter
+import title_fix_ead
+
+title_date_combine = importlib.import_module("title-date_combine")
+
+DEFAULT_STEPS = "dacs,folders,title-date"
+
+# step name -> function that modifies a parsed BeautifulSoup document in place
+STAGES = {
+    "dacs": dacs_date_fixer.update_unitdate_soup,
+    "folders": folder_format_fixer.fix_folder_ranges_soup,
+    "title-date": title_date_combine.process_soup,
+    "proper-title": title_fix_ead.proper_title_soup,
+}
+
+# the same steps for an lxml tree (--backend lxml)
+LXML_STAGES = {
+    "dacs": dacs_date_fixer.update_unitdate_tree,
+    "folders": folder_format_fixer.fix_folder_ranges_tree,
+    "title-date": title_date_combine.process_tree,
+}
+
+BACKENDS = ("bs4", "lxml")
+
+def parse_steps(steps, backend="bs4"):
+    """
+    Turns 'dacs,folders,delete:odd' (or a list of names) into a list of
+    (name, function) pairs, in order. Raises ValueError on an unknown step.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+    stage_table = LXML_STAGES if backend == "lxml" else STAGES
+    remove_tags = tag_deleter.remove_tags_tree if backend == "lxml" else tag_deleter.remove_tags_soup
+
+    if isinstance(steps, str):
+        steps = [step.strip() for step in steps.split(",") if step.strip()]
+
+    stages = []
+    for step in steps:
+        if step.startswith("delete:"):
+            tag_name = step.split(":", 1)[1].strip()
+            if not tag_name:
+                raise ValueError("delete step needs a tag name, e.g. delete:controlaccess")
+            stages.append((step, partial(remove_tags, tag_names=tag_name)))
+        elif step in stage_table:
+            stages.append((step, stage_table[step]))
+        else:
+            raise ValueError(f"Unknown step '{step}' for the {backend} backend. "
+                             f"Choose from: {', '.join(stage_table)}, delete:TAG")
+    return stages
+
+def steps_version(steps, backend="bs4"):
+    """'dacs=1,folders=1' - the TRANSFORM_VERSION behind each step, for build_cache keys"""
+    versions = []
+    for name, stage in parse_steps(steps, backend):
+        module = tag_deleter if name.startswith("delete:") else sys.modules[stage.__module__]
+        versions.append(f"{name}={module.TRANSFORM_VERSION}")
+    return ",".join(versions)
+
+def run_pipeline(xml_content, steps=DEFAULT_STEPS, backend="bs4", stats=None):
+    """Parses xml_content once, applies every step in order, serializes once."""
+    stages = parse_steps(steps, backend)
+
+    if backend == "lxml":
+        with run_stats.phase(stats, "parse"):
+            root = ead_lxml.parse(xml_content)
+        if stats:
+            stats.count("elements", ead_lxml.element_count(root))
+        for name, stage in stages:
+            with run_stats.phase(stats, f"step:{name}"):
+                stage(root)
+        with run_stats.phase(stats, "serialize"):
+            return ead_lxml.serialize(root)
+
+    with run_stats.phase(stats, "parse"):
+        soup = BeautifulSoup(xml_content, "xml")
+    if stats:
+        stats.count("elements", len(soup.find_all(True)))
+
+    for name, stage in stages:
+        with run_stats.phase(stats, f"step:{name}"):
+            stage(soup)
+
+    with run_stats.phase(stats, "serialize"):
+        return str(soup)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply several EAD clean-up steps with a single parse.")
+    parser.add_argument("input_file", help="Path to the input XML file")
+    parser.add_argument("output_file", help="Path to save the updated XML file")
+    parser.add_argument("--steps", default=DEFAULT_STEPS,
+                        help=f"Comma-separated steps, run in order (Default: {DEFAULT_STEPS})")
+    parser.add_argument("--backend", choices=BACKENDS, default="bs4", help="XML library to use (Default: bs4)")
+    run_stats.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        parse_steps(args.steps, args.backend)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    with run_stats.session(args, "ead_pipeline") as stats:
+        with run_stats.phase(stats, "read"):
+            with open(args.input_file, "r", encoding="utf-8") as file:
+                xml_content = file.read()
+
+        updated_xml = run_pipeline(xml_content, args.steps, args.backend, stats)
+
+        with run_stats.phase(stats, "write"):
+            with open(args.output_file, "w", encoding="utf-8") as file:
+                file.write(updated_xml)
+
+        print(f"Updated XML file saved to {args.output_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+runs the ead_pipeline.py steps on one very large finding aid in parallel:
+the document is split at the children of <dsc> (the <c01>s, or <c>s), runs
+of those children are transformed in a pool of worker processes, and the
+results are put back in their original order
+
+    parse          the whole document, once (lxml)
+    split          every <dsc> child is moved into one of the shards
+    header         the steps run on what's left (eadheader, archdesc/did...)
+    shards         the steps run on each shard in a worker process
+    stitch         the transformed children go back into their <dsc>
+    serialize      the whole document, once
+
+every step only looks at an element and what's inside it, so the output is
+the same as ead_pipeline.py --backend lxml, byte for byte. a delete:TAG step
+that would delete a <dsc> (or something around it) can't be split that way,
+the document then runs in this process as one piece
+
+run in the command line:
+python3 ead_shards.py input.xml output.xml --steps dacs,folders,title-date --workers 4
+
+benchmarks/bench_shards.py compares it with the sequential pipeline
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import ead_lxml
+import ead_pipeline
+import run_stats
+
+DEFAULT_STEPS = ead_pipeline.DEFAULT_STEPS
+
+# shards per worker, so one slow shard doesn't leave the other workers idle
+SHARDS_PER_WORKER = 4
+
+def top_level_dscs(root):
+    """Every <dsc> that isn't inside another <dsc>, in document order."""
+    return [dsc for dsc in root.iter("{*}dsc") if next(dsc.iterancestors("{*}dsc"), None) is None]
+
+def can_shard(dscs, steps):
+    """False when a delete step names a <dsc> or one of the elements around it."""
+    enclosing = {ead_lxml.local_name(dsc.tag) for dsc in dscs}
+    for dsc in dscs:
+        enclosing.update(ead_lxml.local_name(ancestor.tag) for ancestor in dsc.iterancestors())
+    for name, _ in ead_pipeline.parse_steps(steps, "lxml"):
+        if name.startswith("delete:") and name.split(":", 1)[1].strip() in enclosing:
+            return False
+    return True
+
+def split_children(children, shard_count):
+    """
+    Splits children into at most shard_count runs of neighbours with about
+    the same number of elements each. Returns a list of lists.
+    """
+    sizes = [sum(1 for _ in child.iter()) for child in children]
+    target = sum(sizes) / max(1, shard_count)
+    shards, current, current_size = [], [], 0
+    for child, size in zip(children, sizes):
+        current.append(child)
+        current_size += size
+        if current_size >= target and len(shards) < shard_count - 1:
+            shards.append(current)
+            current, current_size = [], 0
+    if current:
+        shards.append(current)
+    return shards
+
+def pack_shard(dsc, children):
+    """
+    Moves children (with their tails) out of dsc into an empty copy of it
+    and returns that as bytes; the copy declares every namespace in scope,
+    so the shard parses on its own.
+    """
+    shell = ead_lxml.etree.Element(dsc.tag, nsmap=dsc.nsmap)
+    shell.extend(children)
+    return ead_lxml.etree.tostring(shell, encoding="utf-8")
+
+def transform_shard(job):
+    """Worker: runs the steps on one packed shard and returns it packed again."""
+    shard, steps = job
+    shell = ead_lxml.parse(shard)
+    for _, stage in ead_pipeline.parse_steps(steps, "lxml"):
+        stage(shell)
+    return ead_lxml.etree.tostring(shell, encoding="utf-8")
+
+def unpack_shard(dsc, shard):
+    """
+    Appends a transformed shard's children to dsc. Text left at the start of
+    the shard (the tail of a deleted first child) joins the text before it,
+    where the sequential run would have put it.
+    """
+    shell = ead_lxml.parse(shard)
+    if shell.text:
+        if len(dsc):
+            dsc[-1].tail = (dsc[-1].tail or "") + shell.text
+        else:
+            dsc.text = (dsc.text or "") + shell.text
+    dsc.extend(list(shell))
+
+def run_sharded(xml_content, steps=DEFAULT_STEPS, workers=None, stats=None):
+    """
+    Same result as ead_pipeline.run_pipeline(xml_content, steps, "lxml"),
+    with the <dsc> children transformed in `workers` processes
+    (Default: one per CPU core; 1 transforms the shards in this process).
+    """
+    stages = ead_pipeline.parse_steps(steps, "lxml")
+    workers = workers or os.cpu_count() or 1
+
+    with run_stats.phase(stats, "parse"):
+        root = ead_lxml.parse(xml_content)
+    if stats:
+        stats.count("elements", ead_lxml.element_count(root))
+
+    dscs = top_level_dscs(root)
+    if not can_shard(dscs, steps):
+        print("Warning: a delete step removes a <dsc> or what's around it; running without shards.")
+        dscs = []
+
+    with run_stats.phase(stats, "split"):
+        jobs, owners = [], []
+        shard_count = workers * SHARDS_PER_WORKER
+        for dsc in dscs:
+            for children in split_children(list(dsc), shard_count):
+                jobs.append((pack_shard(dsc, children), steps))
+                owners.append(dsc)
+    if stats:
+        stats.count("shards", len(jobs))
+
+    with run_stats.phase(stats, "header"):
+        for _, stage in stages:
+            stage(root)
+
+    with run_stats.phase(stats, "shards"):
+        if workers == 1 or len(jobs) < 2:
+            results = [transform_shard(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+                results = list(executor.map(transform_shard, jobs))
+
+    with run_stats.phase(stats, "stitch"):
+        for dsc, shard in zip(owners, results):
+            unpack_shard(dsc, shard)
+
+    with run_stats.phase(stats, "serialize"):
+        return ead_lxml.serialize(root)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply the EAD clean-up steps to one large file, "
+                                                 "spreading its top-level components over several processes.")
+    parser.add_argument("input_file", help="Path to the input XML file")
+    parser.add_argument("output_file", help="Path to save the updated XML file")
+    parser.add_argument("--steps", default=DEFAULT_STEPS,
+                        help=f"Comma-separated steps, as in ead_pipeline.py (Default: {DEFAULT_STEPS})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (Default: number of CPU cores)")
+    run_stats.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        ead_pipeline.parse_steps(args.steps, "lxml")
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    with run_stats.session(args, "ead_shards") as stats:
+        with run_stats.phase(stats, "read"):
+            with open(args.input_file, "r", encoding="utf-8") as file:
+                xml_content = file.read()
+
+        updated_xml = run_sharded(xml_content, args.steps, args.workers, stats)
+
+        with run_stats.phase(stats, "write"):
+            with open(args.output_file, "w", encoding="utf-8") as file:
+                file.write(updated_xml)
+
+        print(f"Updated XML file saved to {args.output_file}")
+
+if __name__ == "__main__":
+    main()
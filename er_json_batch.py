@@ -0,0 +1,159 @@
+"""
+converts many FTK JSON exports (e.g. a whole accession batch) into one CSV
+for import into ArchivesSpace, spreading the files over a pool of worker
+processes (one per CPU core by default)
+
+each worker writes its file's rows to a temporary part file; the parts are
+merged into the output in input order as they finish. an er_number already
+seen in an earlier row (of any file) is reported as a duplicate and left
+out of the merged CSV (keep them with --keep-duplicates)
+
+prints OK/FAILED with the timing of every file and the total nodes/s at the end
+
+run in the command line:
+python3 er_json_batch.py exports_dir merged.csv
+python3 er_json_batch.py "batch_12/*.json" merged.csv --workers 4
+"""
+import argparse
+import csv
+import glob
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import er_json_to_csv
+import run_stats
+
+# duplicates listed per file, the rest are only counted
+DUPLICATES_SHOWN = 10
+
+def find_input_files(input_paths):
+    """Directories mean every .json file in them; anything else is used as a glob."""
+    files = []
+    for input_path in input_paths:
+        pattern = os.path.join(input_path, "*.json") if os.path.isdir(input_path) else input_path
+        files += sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+    return files
+
+def convert_part(job):
+    """Worker: converts one export to a part CSV. Returns (input, part, error, seconds, rows, nodes)."""
+    input_file, part_file = job
+    stats = run_stats.RunStats("er_json_batch")
+    start = time.perf_counter()
+    try:
+        rows = er_json_to_csv.convert_file(input_file, part_file, stats=stats)
+        error = None
+    except Exception as e:
+        rows, error = 0, f"{type(e).__name__}: {e}"
+    return input_file, part_file, error, time.perf_counter() - start, rows, stats.counts["nodes"]
+
+def merge_part(part_file, source, writer, seen, keep_duplicates=False):
+    """
+    Appends a part CSV (without its header) to writer. seen is the hash index
+    mapping each (ER Number, Top Container Number) to the input file it was
+    first seen in. Returns (rows written, list of (er_number, first file)).
+    """
+    written = 0
+    duplicates = []
+    with open(part_file, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            key = (row[0], row[1])
+            if any(key):
+                if key in seen:
+                    duplicates.append((f"ER {row[1]}" if row[0] == "er" else row[0], seen[key]))
+                    if not keep_duplicates:
+                        continue
+                else:
+                    seen[key] = source
+            writer.writerow(row)
+            written += 1
+    return written, duplicates
+
+def run_batch(input_files, output_file, workers=None, keep_duplicates=False):
+    """
+    Converts input_files in a process pool and merges them into output_file.
+    Returns (results, rows written, duplicates) where results holds
+    (input, part, error, seconds, rows, nodes) for every file, in input order.
+    """
+    output_dir = os.path.dirname(os.path.abspath(output_file))
+    workers = workers or os.cpu_count() or 1
+
+    results = []
+    duplicate_count = rows_written = 0
+    with tempfile.TemporaryDirectory(dir=output_dir) as parts_dir, \
+            open(output_file, "w", newline="", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = csv.writer(out)
+        writer.writerow(er_json_to_csv.FIELDNAMES)
+        jobs = [(path, os.path.join(parts_dir, f"{number}.csv")) for number, path in enumerate(input_files)]
+        seen = {}
+
+        for result in executor.map(convert_part, jobs):
+            input_file, part_file, error, seconds, rows, nodes = result
+            results.append(result)
+            if error:
+                print(f"FAILED {input_file}: {error}")
+                continue
+
+            written, duplicates = merge_part(part_file, input_file, writer, seen, keep_duplicates)
+            os.remove(part_file)
+            rows_written += written
+            duplicate_count += len(duplicates)
+            print(f"OK     {input_file}: {rows} rows, {nodes} nodes in {seconds:.2f}s "
+                  f"({nodes / max(seconds, 1e-9):,.0f} nodes/s)")
+            for er_number, first in duplicates[:DUPLICATES_SHOWN]:
+                print(f"       duplicate {er_number} (first seen in {first})")
+            if len(duplicates) > DUPLICATES_SHOWN:
+                print(f"       ... and {len(duplicates) - DUPLICATES_SHOWN} more duplicates")
+
+    return results, rows_written, duplicate_count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert many FTK JSON exports into one CSV, in parallel.")
+    parser.add_argument("inputs", nargs="+", help="JSON files, directories of .json files, or globs such as 'batch/*.json'")
+    parser.add_argument("output_file", help="Path to the merged output CSV file")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (Default: number of CPU cores)")
+    parser.add_argument("--keep-duplicates", action="store_true",
+                        help="Keep rows whose er_number was already seen (they are still reported)")
+    run_stats.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    input_files = find_input_files(args.inputs)
+    if not input_files:
+        print(f"Error: No JSON files found for {', '.join(args.inputs)}")
+        sys.exit(1)
+
+    with run_stats.session(args, "er_json_batch") as stats:
+        start = time.perf_counter()
+        with run_stats.phase(stats, "batch"):
+            results, rows_written, duplicates = run_batch(input_files, args.output_file, args.workers,
+                                                          args.keep_duplicates)
+        elapsed = time.perf_counter() - start
+
+        failed = [result for result in results if result[2]]
+        nodes = sum(result[5] for result in results)
+        if stats:
+            stats.count("files", len(results))
+            stats.count("failed", len(failed))
+            stats.count("nodes", nodes)
+            stats.count("rows", rows_written)
+            stats.count("duplicates", duplicates)
+        print("\n" + "=" * 55)
+        print(f"Files:       {len(results)} ({len(results) - len(failed)} OK, {len(failed)} failed)")
+        print(f"Rows:        {rows_written} written, {duplicates} duplicate er_number(s)"
+              f"{' kept' if args.keep_duplicates else ' skipped'}")
+        print(f"Wall time:   {elapsed:.2f}s")
+        print(f"Throughput:  {nodes / elapsed:,.0f} nodes/s")
+        print("=" * 55)
+        print(f"Merged CSV saved to '{args.output_file}'")
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
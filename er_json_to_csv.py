@@ -1,11 +1,37 @@
 """script to transform a JSON export from FTK to csv for import into ArchivesSpace"""
 """run program in the command line"""
 """python3 er_json_to_csv.py input.json output.csv, replace with actual file names"""
+"""the export is read incrementally (with ijson, if installed) and rows are written as they are
+   found, so memory depends on the depth of the tree, not on the size of the file; an export
+   ijson can't read (NaN or Infinity values, which json.load accepts) is loaded whole instead"""
+"""for very deep trees add --compact-hierarchy paths.csv: rows get Node ID and Parent ID columns
+   instead of the full Hierarchy path, and each node's title is written once to paths.csv"""
+"""add --also out.parquet (or .jsonl) to write the same rows as Parquet or JSON lines in the same pass"""
+"""add --stats for timings and the row count as JSON, --profile out.prof to profile the run"""
 
 import json
+import contextlib
 import csv
+import functools
+import os
 import re
 import argparse
+import output_sinks
+import run_stats
+from dacs_dates import MONTH_PATTERN
+
+try:
+    import ijson
+    JSON_ERRORS = ijson.JSONError
+except ImportError:  # fall back to json.load
+    ijson = None
+    JSON_ERRORS = json.JSONDecodeError
+
+# format_extent's orders, smallest first, for format_extents
+EXTENT_MAGNITUDES = [1.0, 1000.0, 1000000.0, 1000000000.0, 1000000000000.0]
+EXTENT_UNITS = ['bytes', 'kilobytes', 'megabytes', 'gigabytes', 'terabytes']
+# rows collected before their extents are formatted together
+EXTENT_BATCH_SIZE = 10000
 
 def format_extent(file_size_bytes, file_count):
     if file_size_bytes is None or file_count is None:
@@ -33,82 +59,393 @@ def format_extent(file_size_bytes, file_count):
 
     return f"{number} {extent_type} ({container_summary})"
 
-def flatten_json(json_obj, parent_title="", flattened_list=[]):
-    for child in json_obj.get('children', []):
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """numpy, imported the first time extents are formatted (None if it isn't installed)."""
+    try:
+        import numpy
+    except ImportError:  # format_extents falls back to format_extent
+        return None
+    return numpy
+
+@functools.lru_cache(maxsize=None)
+def _extent_heads():
+    """'0.0 bytes' ... '1000.0 terabytes': every extent up to the file count, indexed by order * 10001 + tenths."""
+    np = _numpy()
+    return np.array([f"{tenths // 10}.{tenths % 10} {unit}" for unit in EXTENT_UNITS for tenths in range(10001)],
+                    dtype=object)
+
+def format_extents(file_sizes, file_counts):
+    """
+    format_extent for whole columns: returns a list with one extent string
+    (or None) per (file size, file count) pair. Magnitudes, scaled sizes and
+    their rounding are computed with numpy array operations and the
+    '123.4 megabytes' part is looked up in a table; sizes the array path
+    can't round exactly (negative, non-finite, 1000 terabytes and up, or
+    within a hair of a .x5 tie) go through format_extent, so the output is
+    the same.
+    """
+    np = _numpy()
+    if np is None:
+        return [format_extent(size, count) for size, count in zip(file_sizes, file_counts)]
+
+    valid = None
+    sizes, counts = file_sizes, file_counts
+    if None in file_sizes or None in file_counts:
+        valid = [index for index, (size, count) in enumerate(zip(file_sizes, file_counts))
+                 if size is not None and count is not None]
+        sizes = [file_sizes[index] for index in valid]
+        counts = [file_counts[index] for index in valid]
+
+    size_array = np.fromiter(map(float, sizes), dtype=np.float64, count=len(sizes))
+    orders = np.searchsorted(EXTENT_MAGNITUDES, size_array, side='right') - 1
+    np.clip(orders, 0, None, out=orders)
+    scaled = size_array / np.asarray(EXTENT_MAGNITUDES)[orders]
+
+    # '%.1f' rounds the exact value, so rint(scaled * 10) only matches it
+    # when scaled * 10 is clearly away from a tie
+    with np.errstate(invalid='ignore'):
+        tenths = scaled * 10
+        rounded = np.rint(tenths)
+        exact = (np.isfinite(scaled) & ~np.signbit(scaled) & (rounded <= 10000)
+                 & (np.abs(tenths - np.floor(tenths) - 0.5) > 1e-6))
+    heads = _extent_heads()[np.where(exact, orders * 10001 + rounded, 0).astype(np.intp)]
+
+    extents = [f"{head} ({count} computer files)" for head, count in zip(heads.tolist(), counts)]
+    for index in np.flatnonzero(~exact).tolist():
+        extents[index] = format_extent(sizes[index], counts[index])
+
+    if valid is None:
+        return extents
+    formatted = [None] * len(file_sizes)
+    for index, extent in zip(valid, extents):
+        formatted[index] = extent
+    return formatted
+
+def with_extents(rows, batch_size=EXTENT_BATCH_SIZE):
+    """
+    Formats the Extent of rows from er_row(node, raw_extent=True) batch_size
+    rows at a time with format_extents, and yields the rows in order.
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield from _format_batch(batch)
+            batch = []
+    yield from _format_batch(batch)
+
+def _format_batch(rows):
+    extents = format_extents([row['Extent'][0] for row in rows], [row['Extent'][1] for row in rows])
+    for row, extent in zip(rows, extents):
+        row['Extent'] = extent
+    return rows
+
+def _batched_extents(row_generator):
+    """Decorator: the rows a generator builds with raw extents come out formatted."""
+    @functools.wraps(row_generator)
+    def wrapper(*args, **kwargs):
+        return with_extents(row_generator(*args, **kwargs))
+    return wrapper
+
+class FieldOrderError(ValueError):
+    """A node's own fields come after its 'children' list, so it can't be streamed."""
+
+# node keys the CSV rows are built from; streaming needs them before 'children'
+ROW_KEYS = {'title', 'er_name', 'er_number', 'file_size', 'file_count'}
+FIELDNAMES = ['ER Number', 'Top Container Number', 'ER Name', 'Date', 'Extent', 'Hierarchy']
+# --compact-hierarchy: rows point at their node in a separate path table instead
+COMPACT_FIELDNAMES = ['ER Number', 'Top Container Number', 'ER Name', 'Date', 'Extent', 'Node ID', 'Parent ID']
+PATH_FIELDNAMES = ['Node ID', 'Parent ID', 'Title']
+# column types for Parquet output (everything else is text)
+COMPACT_TYPES = {'Node ID': 'int64', 'Parent ID': 'int64'}
+
+# a comma followed by a date: 1990-1995, circa 1990, 1990 March 3, 1990 March or 1990
+DATE_RE = re.compile(
+    r',\s*(' +
+    r'\d{4}-\d{4}' + r'|' +
+    r'circa\s+\d{4}' + r'|' +
+    rf'\d{{4}}\s+(?:{MONTH_PATTERN})\s+\d{{1,2}}' + r'|' +
+    rf'\d{{4}}\s+(?:{MONTH_PATTERN})' + r'|' +
+    r'\d{4}' +
+    r')'
+)
+
+_END = object()
+
+def split_er_name(er_name):
+    """
+    Returns (er_name without its dates, first date found or None). Every
+    ', date' is removed from the name; names are scanned once.
+    """
+    if ',' not in er_name:
+        return er_name, None
+
+    match = DATE_RE.search(er_name)
+    if not match:
+        return er_name, None
+
+    rest = er_name[match.end():]
+    if ',' in rest:
+        rest = DATE_RE.sub('', rest)
+    return (er_name[:match.start()] + rest).strip(), match.group(1).strip()
+
+def er_row(node, raw_extent=False):
+    """
+    CSV row (without the hierarchy columns) for an electronic record node,
+    None for other nodes. With raw_extent, Extent is left as the
+    (file_size, file_count) pair for with_extents to format in bulk.
+    """
+    if 'er_number' not in node:
+        return None
+
+    er_name, date_found = split_er_name(node.get('er_name', ''))
+
+    er_number = node['er_number']
+    top_container_number = None
+    if er_number and er_number.startswith('ER'):
+        top_container_number = er_number[2:].strip()
+        er_number_prefix = 'er'
+    else:
+        er_number_prefix = er_number  # Keep the original if it doesn't start with 'ER'
+
+    row = {
+        'ER Number': er_number_prefix,
+        'Top Container Number': top_container_number,
+        'ER Name': er_name,
+        'Extent': (node.get('file_size'), node.get('file_count')),
+    }
+    if not raw_extent:
+        row['Extent'] = format_extent(*row['Extent'])
+    if date_found:
+        row['Date'] = date_found
+    return row
+
+def iter_nodes(json_obj):
+    """
+    Yields (node id, parent id, node) for every node below json_obj, parents
+    before their children. Ids count from 1 in document order; top-level
+    nodes have parent id None. Walks the tree with an explicit stack, so deep
+    trees can't hit Python's recursion limit.
+    """
+    next_id = 1
+    stack = [(iter(json_obj.get('children', [])), None)]
+    while stack:
+        child = next(stack[-1][0], _END)
+        if child is _END:
+            stack.pop()
+            continue
+
+        yield next_id, stack[-1][1], child
+        stack.append((iter(child.get('children', [])), next_id))
+        next_id += 1
+
+@_batched_extents
+def hierarchy_rows(nodes, parent_title=""):
+    """CSV rows with the full ' > '-joined Hierarchy column, from iter_nodes output."""
+    path = []  # (node id, hierarchy title) of the open ancestors
+    for node_id, parent_id, node in nodes:
+        while path and path[-1][0] != parent_id:
+            path.pop()
+        parent = path[-1][1] if path else parent_title
+        title = node.get('title', '')
+        combined_title = f"{parent} > {title}" if parent else title
+        path.append((node_id, combined_title))
+
+        row = er_row(node, raw_extent=True)
+        if row:
+            row['Hierarchy'] = combined_title
+            yield row
+
+@_batched_extents
+def compact_rows(nodes, path_writer):
+    """
+    CSV rows with Node ID / Parent ID columns; every node (records and the
+    folders above them) goes to path_writer as [node id, parent id, title]
+    so the hierarchy can be rebuilt without repeating it on every row.
+    """
+    for node_id, parent_id, node in nodes:
+        path_writer.writerow([node_id, parent_id, node.get('title', '')])
+        row = er_row(node, raw_extent=True)
+        if row:
+            row['Node ID'] = node_id
+            row['Parent ID'] = parent_id
+            yield row
+
+@_batched_extents
+def iter_rows(json_obj, parent_title=""):
+    """
+    Yields the CSV rows for every node below json_obj, parents before their
+    children (hierarchy_rows(iter_nodes(json_obj)), walking the loaded tree
+    directly).
+    """
+    stack = [(iter(json_obj.get('children', [])), parent_title)]
+    while stack:
+        children, parent = stack[-1]
+        child = next(children, _END)
+        if child is _END:
+            stack.pop()
+            continue
+
         title = child.get('title', '')
-        combined_title = f"{parent_title} > {title}" if parent_title else title
-
-        er_name = child.get('er_name', '')
-        date_found = None
-
-        # Regular expression to find a comma followed by the specified date formats
-        date_regex = r',\s*(' + \
-             r'\d{4}-\d{4}' + r'|' + \
-             r'circa\s+\d{4}' + r'|' + \
-             r'\d{4}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2}' + r'|' + \
-             r'\d{4}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)' + r'|' + \
-             r'\d{4}' + \
-             r')'
-
-        match = re.search(date_regex, er_name)
-        if match:
-            date_found = match.group(1).strip()
-            # Remove the comma and the matched date from the ER Name
-            er_name = re.sub(date_regex, '', er_name).strip()
-
-        if 'er_number' in child:
-            er_number = child['er_number']
-            top_container_number = None
-            if er_number and er_number.startswith('ER'):
-                top_container_number = er_number[2:].strip()
-                er_number_prefix = 'er'
-            else:
-                er_number_prefix = er_number  # Keep the original if it doesn't start with 'ER'
-
-            file_size = child.get('file_size')
-            file_count = child.get('file_count')
-            extent = format_extent(file_size, file_count)
-
-            row = {
-                'ER Number': er_number_prefix,
-                'Top Container Number': top_container_number,
-                'ER Name': er_name,
-                'Extent': extent,
-            }
-            if date_found:
-                row['Date'] = date_found
-            row.update({  # Add the rest of the fields
-                'Hierarchy': combined_title
-            })
-            flattened_list.append(row)
-
-        flatten_json(child, combined_title, flattened_list)
+        combined_title = f"{parent} > {title}" if parent else title
+        row = er_row(child, raw_extent=True)
+        if row:
+            row['Hierarchy'] = combined_title
+            yield row
+        stack.append((iter(child.get('children', [])), combined_title))
 
+def flatten_json(json_obj, parent_title="", flattened_list=None):
+    """All rows of iter_rows as a list (appended to flattened_list if given)."""
+    if flattened_list is None:
+        flattened_list = []
+    flattened_list.extend(iter_rows(json_obj, parent_title))
     return flattened_list
 
-if __name__ == "__main__":
+def _stream_nodes(events):
+    """
+    iter_nodes for a stream of ijson basic_parse events: a node is yielded as
+    soon as its 'children' list starts (or the node ends), so only the open
+    nodes along the current path are kept in memory.
+    """
+    # frames: ['node', fields, node id, parent id, yielded yet]
+    #         ['children', id of the node they belong to], ['root'] or ['skip']
+    stack = []
+    key = None
+    next_id = 1
+    for event, value in events:
+        if event == 'map_key':
+            key = value
+            continue
+
+        top = stack[-1] if stack else None
+        if event in ('start_map', 'start_array'):
+            if top is None:
+                # the root node's own fields are never exported
+                stack.append(['root'] if event == 'start_map' else ['skip'])
+            elif top[0] == 'root' and key == 'children' and event == 'start_array':
+                stack.append(['children', None])
+            elif top[0] == 'children' and event == 'start_map':
+                stack.append(['node', {}, next_id, top[1], False])
+                next_id += 1
+            elif top[0] == 'node' and key == 'children' and event == 'start_array':
+                if not top[4]:
+                    top[4] = True
+                    yield top[2], top[3], top[1]
+                stack.append(['children', top[2]])
+            else:
+                stack.append(['skip'])
+
+        elif event in ('end_map', 'end_array'):
+            frame = stack.pop()
+            if frame[0] == 'node' and not frame[4]:
+                # a node without children
+                yield frame[2], frame[3], frame[1]
+
+        elif top is not None and top[0] == 'node':
+            if top[4] and key in ROW_KEYS:
+                raise FieldOrderError(f"'{key}' comes after 'children' in a node titled '{top[1].get('title', '')}'")
+            top[1][key] = value
+
+def read_nodes(input_file):
+    """
+    iter_nodes for an FTK JSON export on disk, read incrementally with ijson
+    when it is installed, otherwise loaded whole with json.load.
+    """
+    if ijson is None:
+        yield from iter_nodes(_load_json(input_file))
+        return
+
+    with open(input_file, 'rb') as f:
+        yield from _stream_nodes(ijson.basic_parse(f, use_float=True))
+
+def _counted(nodes, stats):
+    for node in nodes:
+        stats.count("nodes")
+        yield node
+
+def convert_file(input_file, output_file, stream=True, paths_file=None, stats=None, also=()):
+    """
+    Writes the CSV for input_file row by row and returns the number of rows;
+    the same rows also go to every path in also (.csv, .jsonl or .parquet,
+    see output_sinks.py). With paths_file, rows get Node ID / Parent ID
+    columns and the hierarchy is written once to paths_file. Falls back to
+    loading the whole file if a node lists its fields after its children, or
+    if ijson rejects the file (json.load also takes NaN and Infinity).
+    Raises ValueError on invalid JSON.
+    """
+    outputs = [output_file, *also]
+    row_count = 0
+    try:
+        nodes = read_nodes(input_file) if stream else iter_nodes(_load_json(input_file))
+        if stats:
+            nodes = _counted(nodes, stats)
+        with contextlib.ExitStack() as files:
+            if paths_file:
+                paths = files.enter_context(open(paths_file, 'w', newline='', encoding='utf-8'))
+                path_writer = csv.writer(paths)
+                path_writer.writerow(PATH_FIELDNAMES)
+                rows = compact_rows(nodes, path_writer)
+                sink = files.enter_context(output_sinks.open_sinks(outputs, COMPACT_FIELDNAMES, types=COMPACT_TYPES))
+            else:
+                rows = hierarchy_rows(nodes)
+                sink = files.enter_context(output_sinks.open_sinks(outputs, FIELDNAMES))
+
+            for row in rows:
+                sink.write_dict(row)
+                row_count += 1
+    except FieldOrderError as e:
+        print(f"Note: {e}; loading the whole file instead of streaming it")
+        if stats:
+            stats.counts["nodes"] = 0
+        return convert_file(input_file, output_file, stream=False, paths_file=paths_file, stats=stats, also=also)
+    except (json.JSONDecodeError, JSON_ERRORS) as e:
+        if stream and ijson is not None and isinstance(e, ijson.JSONError):
+            print(f"Note: ijson can't read '{input_file}' ({str(e).splitlines()[0]}); loading the whole file instead")
+            if stats:
+                stats.counts["nodes"] = 0
+            return convert_file(input_file, output_file, stream=False, paths_file=paths_file, stats=stats, also=also)
+        if paths_file and os.path.exists(paths_file):
+            os.remove(paths_file)
+        raise ValueError(f"Error decoding JSON from '{input_file}': {e}") from e
+
+    return row_count
+
+def _load_json(input_file):
+    with open(input_file, 'r') as f:
+        return json.load(f)
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Convert a JSON file to a CSV file.")
     parser.add_argument("input_file", help="Path to the input JSON file.")
     parser.add_argument("output_file", help="Path to the output CSV file.")
-    args = parser.parse_args()
+    parser.add_argument("--also", action="append", default=[], metavar="PATH",
+                        help="Also write the rows to PATH (.csv, .jsonl or .parquet) in the same pass; repeatable.")
+    parser.add_argument("--compact-hierarchy", metavar="PATHS_CSV",
+                        help="Give rows Node ID/Parent ID columns and write the hierarchy once to PATHS_CSV")
+    run_stats.add_arguments(parser)
+    args = parser.parse_args(argv)
 
     input_file = args.input_file
     output_file = args.output_file
 
-    with open(input_file, 'r') as f:
+    try:
+        output_sinks.check_paths([output_file, *args.also])
+    except ValueError as e:
+        print(f"Error: {e}")
+        exit(1)
+
+    with run_stats.session(args, "er_json_to_csv") as stats:
         try:
-            data = json.load(f)
-        except json.JSONDecodeError as e:
-            print(f"Error decoding JSON from '{input_file}': {e}")
+            with run_stats.phase(stats, "convert"):
+                row_count = convert_file(input_file, output_file, paths_file=args.compact_hierarchy, stats=stats,
+                                         also=args.also)
+        except ValueError as e:
+            print(e)
             exit(1)
+        run_stats.count(stats, "rows", row_count)
 
-    flattened_data = flatten_json(data)
+        print(f"Data has been successfully converted and saved to '{output_file}'")
 
-    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['ER Number', 'Top Container Number', 'ER Name', 'Date', 'Extent', 'Hierarchy']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-        writer.writeheader()
-        writer.writerows(flattened_data)
-
-    print(f"Data has been successfully converted and saved to '{output_file}'")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
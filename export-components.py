@@ -25,132 +25,350 @@ attributes can be revised for specific project, hardcoded for:
     
 run in command line: python3 input_file.xml output_file.csv
 
+for very large finding aids add --stream to parse <did> elements as they
+complete and write each row right away (memory stays flat):
+
+    python3 export-components.py input_file.xml output_file.csv --stream
+
+add --backend lxml to read the whole file into an lxml tree instead of
+BeautifulSoup (much faster, same CSV)
+
+rows can also go to newline-delimited JSON or Parquet (typed, compressed,
+needs pyarrow), several formats from the same pass:
+
+    python3 export-components.py input_file.xml output.csv --also output.parquet --also output.jsonl
+
+add --stats to get parse/extract/write timings and the row count as JSON,
+--profile out.prof to write a cProfile file (and out.prof.folded for flame graphs)
+
 """
 
-import csv
 import os
 import argparse
+from collections import deque
 from bs4 import BeautifulSoup
+from lxml import etree
+import build_cache
+import ead_lxml
+import output_sinks
+import run_stats
+from ead_lxml import local_name as _local_name, element_text as _element_text
+
+# bump when a change alters the CSV, so cached results are rebuilt
+TRANSFORM_VERSION = "1"
+
+CSV_HEADER = [
+    'tag_name', 'level', 'local_mss', 'local_mss_av', 'local_call',
+    'box_type', 'box_indicator', 'folder_type', 'folder_indicator',
+    'title', 'date', 'scopecontent', 'physdesc', 'did_note'
+]
+
+# <did> children we read, keyed by tag name (and 'type' where it matters)
+DID_FIELDS = {
+    'unittitle': 'title',
+    'unitdate': 'date',
+    'physdesc': 'physdesc',
+}
+UNITID_TYPES = ('local_mss', 'local_mss_av', 'local_call')
+CONTAINER_TYPES = ('box', 'folder')
+
+COMPONENT_TAGS = {'c'} | {f'c{level:02d}' for level in range(1, 13)}
+
+# wrapped as ="12" in CSV output so Excel keeps them as text
+FORMULA_COLUMNS = ('box_indicator', 'folder_indicator')
+
+DIDS = ead_lxml.elements_named('did')
+
+def _field_key(name, type_attr):
+    if name == 'unitid':
+        return type_attr if type_attr in UNITID_TYPES else None
+    if name == 'container':
+        return type_attr if type_attr in CONTAINER_TYPES else None
+    if name == 'note':
+        return 'did_note' if type_attr == 'did' else None
+    return DID_FIELDS.get(name)
+
+def _soup_text(tag, separator='', strip=True):
+    return tag.get_text(separator, strip=strip)
+
+def _build_row(tag_name, level, fields, scope_content, get_text):
+    """
+    Turns the elements collected from one <did> into the 14 CSV columns.
+    get_text mirrors BeautifulSoup's get_text(separator, strip=...) for
+    whichever parser produced the elements.
+    """
+    def text_of(key, separator=''):
+        element = fields.get(key)
+        return get_text(element, separator) if element is not None else ''
+
+    # Containers (raw values; the CSV sink applies the Excel-safe formula wrapping)
+    containers = []
+    for container_type in CONTAINER_TYPES:
+        container_tag = fields.get(container_type)
+        if container_tag is not None:
+            raw_value = (get_text(container_tag, strip=False) or '').strip()
+            containers += [container_type, raw_value]
+        else:
+            containers += ['', '']
+
+    return [
+        tag_name,
+        level,
+        text_of('local_mss'),
+        text_of('local_mss_av'),
+        text_of('local_call'),
+        *containers,
+        text_of('title', " "),
+        text_of('date', " "),
+        scope_content,
+        text_of('physdesc', " "),
+        text_of('did_note', " "),
+    ]
+
+def _soup_did_fields(did):
+    """Collects the wanted <did> children in a single pass over them."""
+    fields = {}
+    for child in did.children:
+        if child.name is None:
+            continue
+        key = _field_key(child.name, child.get('type'))
+        if key and key not in fields:
+            fields[key] = child
+
+    # dates are often nested inside the title: <unittitle>Letters, <unitdate>
+    if 'date' not in fields and 'title' in fields:
+        nested_date = fields['title'].find('unitdate')
+        if nested_date:
+            fields['date'] = nested_date
+    return fields
+
+def _parse_soup(xml_file):
+    with open(xml_file, 'r', encoding='utf-8') as f:
+        xml_content = f.read()
+
+    return BeautifulSoup(xml_content, 'lxml-xml')
+
+def _soup_rows(soup):
+    all_dids = soup.find_all('did')
+
+    for did in all_dids:
+        parent_element = did.parent
+
+        # 1. Tag Name (e.g., c01, c02, c03, etc) and 'level' attribute
+        tag_name = parent_element.name if parent_element else ''
+        level = parent_element.get('level', '') if parent_element else ''
+
+        # 2. Scopecontent belongs to the component itself, never to a
+        #    nested child component
+        scope_content = ''
+        if parent_element:
+            for sibling in parent_element.children:
+                if sibling.name == 'scopecontent':
+                    scope_content = sibling.get_text(" ", strip=True)
+                    break
+
+        # 3. Build Row from the <did> children
+        yield _build_row(tag_name, level, _soup_did_fields(did), scope_content, _soup_text)
+
+def _lxml_rows(root):
+    for did in DIDS(root):
+        parent_element = did.getparent()
+        tag_name = _local_name(parent_element.tag) if parent_element is not None else ''
+        level = parent_element.get('level', '') if parent_element is not None else ''
+
+        scope_content = ''
+        if parent_element is not None:
+            for sibling in parent_element.iterchildren('{*}scopecontent'):
+                scope_content = _element_text(sibling, " ")
+                break
+
+        yield _build_row(tag_name, level, _lxml_did_fields(did), scope_content, _element_text)
 
-def extract_ead_data_to_csv(xml_file, csv_file):
+def extract_ead_data_to_csv(xml_file, csv_file, backend='bs4', stats=None, also=()):
+    """
+    Writes one row per component to csv_file, and to every path in also
+    (.csv, .jsonl or .parquet, see output_sinks.py). Returns the row count.
+    """
     if not os.path.exists(xml_file):
         print(f"Error: Input XML file not found at '{xml_file}'")
         return
 
-    data_to_export = []
-
     try:
-        with open(xml_file, 'r', encoding='utf-8') as f:
-            xml_content = f.read()
-
-        soup = BeautifulSoup(xml_content, 'lxml-xml')
-        all_dids = soup.find_all('did')
-
-        for did in all_dids:
-            parent_element = did.parent
-            
-            # 1. Capture the XML Tag Name (e.g., c01, c02, c03, etc)
-            tag_name = parent_element.name if parent_element else ''
-            
-            # 2. Capture the 'level' attribute (e.g., series, file)
-            level = parent_element.get('level', '') if parent_element else ''
-
-            # 3. UnitID Logic (local_mss, local_mss_av, and local_call)
-            mss_tag = did.find('unitid', type='local_mss')
-            mss_id = mss_tag.get_text(strip=True) if mss_tag else ''
-
-            av_tag = did.find('unitid', type='local_mss_av')
-            av_id = av_tag.get_text(strip=True) if av_tag else ''
-            
-            call_tag = did.find('unitid', type='local_call')
-            call_id = call_tag.get_text(strip=True) if call_tag else ''
-
-            # 4. Basic Metadata
-            title_tag = did.find('unittitle')
-            title_content = title_tag.get_text(" ", strip=True) if title_tag else ''
-
-            date_tag = did.find('unitdate')
-            date_content = date_tag.get_text(" ", strip=True) if date_tag else ''
-            
-            physdesc_tag = did.find('physdesc')
-            physdesc_content = physdesc_tag.get_text(" ", strip=True) if physdesc_tag else ''
-
-            # 5. Containers (Excel-Safe Formula Method)
-            box_tag = did.find('container', type='box')
-            if box_tag:
-                box_type = box_tag.get('type', 'box')
-                raw_box = (box_tag.get_text() or '').strip()
-                box_indicator = f'="{raw_box}"' if raw_box else ''
-            else:
-                box_type = ''
-                box_indicator = ''
-
-            folder_tag = did.find('container', type='folder')
-            if folder_tag:
-                folder_type = folder_tag.get('type', 'folder')
-                raw_folder = (folder_tag.get_text() or '').strip()
-                folder_indicator = f'="{raw_folder}"' if raw_folder else ''
-            else:
-                folder_type = ''
-                folder_indicator = ''
-
-            # 6. Scopecontent & Notes
-            note_tag = did.find('note', type='did')
-            note_content = note_tag.get_text(" ", strip=True) if note_tag else ''
-
-            scope_content = ''
-            if parent_element:
-                scope_tag = parent_element.find('scopecontent')
-                if scope_tag:
-                    scope_content = scope_tag.get_text(" ", strip=True)
-
-            # Build Row
-            data_to_export.append([
-                tag_name, 
-                level, 
-                mss_id, 
-                av_id, 
-                call_id, 
-                box_type, 
-                box_indicator, 
-                folder_type, 
-                folder_indicator, 
-                title_content, 
-                date_content, 
-                scope_content, 
-                physdesc_content, 
-                note_content
-            ])
+        with run_stats.phase(stats, 'parse'):
+            document = ead_lxml.parse_file(xml_file) if backend == 'lxml' else _parse_soup(xml_file)
+    except Exception as e:
+        print(f"An unexpected error occurred during XML processing: {e}")
+        return
 
+    outputs = [csv_file, *also]
+    row_count = 0
+    try:
+        # each row goes to the sinks as soon as it is built, the table is never held in memory
+        with run_stats.phase(stats, 'extract'), _open_outputs(outputs) as sink:
+            for row in _lxml_rows(document) if backend == 'lxml' else _soup_rows(document):
+                sink.write(row)
+                row_count += 1
+    except OSError as e:
+        # the sinks have already removed the partial output files
+        print(f"Error writing the output file(s): {e}")
+        return
     except Exception as e:
         print(f"An unexpected error occurred during XML processing: {e}")
         return
 
+    run_stats.count(stats, 'rows', row_count)
+    print(f"\nSuccessfully extracted {row_count} entries.")
+    print(f"Data saved to {', '.join(repr(path) for path in outputs)}")
+    return row_count
+
+def _lxml_did_fields(did):
+    fields = {}
+    for child in did:
+        if not isinstance(child.tag, str):
+            continue
+        key = _field_key(_local_name(child.tag), child.get('type'))
+        if key and key not in fields:
+            fields[key] = child
+
+    if 'date' not in fields and 'title' in fields:
+        for nested_date in fields['title'].iter('{*}unitdate'):
+            fields['date'] = nested_date
+            break
+    return fields
+
+def _open_outputs(paths):
+    return output_sinks.open_sinks(paths, CSV_HEADER, formula_columns=FORMULA_COLUMNS)
+
+def stream_ead_data_to_csv(xml_file, csv_file, stats=None, also=()):
+    """
+    Same output as extract_ead_data_to_csv, but parses incrementally:
+    each <did> is turned into a row when it closes, rows are written as soon
+    as their component's <scopecontent> is known, and finished subtrees are
+    cleared so memory does not grow with the size of the finding aid.
+    """
+    if not os.path.exists(xml_file):
+        print(f"Error: Input XML file not found at '{xml_file}'")
+        return
+
+    pending = deque()     # rows in document order, waiting on scopecontent
+    waiting = {}          # component element -> its row still waiting
+    own_scope = {}        # open component -> text of its own scopecontent
+    protected = 0         # open <did>/<scopecontent> subtrees not yet read
+    row_count = 0
+
+    def resolve(component, scope_content=''):
+        entry = waiting.pop(component, None)
+        if entry is not None:
+            entry[0][11] = scope_content
+            entry[1] = True
+
+    outputs = [csv_file, *also]
     try:
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                'tag_name', 'level', 'local_mss', 'local_mss_av', 'local_call', 
-                'box_type', 'box_indicator', 'folder_type', 'folder_indicator', 
-                'title', 'date', 'scopecontent', 'physdesc', 'did_note'
-            ])
-            writer.writerows(data_to_export)
-        
-        print(f"\nSuccessfully extracted {len(data_to_export)} entries.")
-        print(f"Data saved to '{csv_file}'")
+        with run_stats.phase(stats, 'stream'), _open_outputs(outputs) as sink:
+            for event, element in etree.iterparse(xml_file, events=('start', 'end')):
+                name = _local_name(element.tag)
+
+                if event == 'start':
+                    if name in ('did', 'scopecontent'):
+                        protected += 1
+                    elif name in COMPONENT_TAGS:
+                        # EAD puts a component's own notes before its child
+                        # components, so the parent's row can be released now
+                        resolve(element.getparent())
+                    continue
+
+                parent_element = element.getparent()
+                if name == 'did':
+                    protected -= 1
+                    entry = [_build_row(
+                        _local_name(parent_element.tag) if parent_element is not None else '',
+                        parent_element.get('level', '') if parent_element is not None else '',
+                        _lxml_did_fields(element), '', _element_text
+                    ), False]
+                    pending.append(entry)
+                    if parent_element is None:
+                        entry[1] = True
+                    elif parent_element in own_scope:
+                        entry[0][11] = own_scope[parent_element]
+                        entry[1] = True
+                    else:
+                        waiting[parent_element] = entry
+                elif name == 'scopecontent':
+                    protected -= 1
+                    if parent_element is not None and parent_element not in own_scope:
+                        scope_content = _element_text(element, " ")
+                        own_scope[parent_element] = scope_content
+                        resolve(parent_element, scope_content)
+
+                resolve(element)
+                own_scope.pop(element, None)
+                while pending and pending[0][1]:
+                    sink.write(pending.popleft()[0])
+                    row_count += 1
+
+                if protected == 0:
+                    element.clear(keep_tail=True)
+                    if parent_element is not None:
+                        while element.getprevious() is not None:
+                            del parent_element[0]
 
     except Exception as e:
-        print(f"Error writing to CSV file: {e}")
+        # the sinks have already removed the partial output files
+        print(f"An unexpected error occurred during XML processing: {e}")
+        return
 
-def main():
+    run_stats.count(stats, 'rows', row_count)
+    print(f"\nSuccessfully extracted {row_count} entries.")
+    print(f"Data saved to {', '.join(repr(path) for path in outputs)}")
+    return row_count
+
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Extracts EAD components to CSV with Tag Levels and Excel-safe formatting."
     )
     parser.add_argument('xml_file', help="Path to the input XML file.")
     parser.add_argument('csv_file', nargs='?', default='extracted_ead_data.csv', 
-                        help="Path for the output CSV file.")
-    args = parser.parse_args()
-    extract_ead_data_to_csv(args.xml_file, args.csv_file)
+                        help="Path for the output CSV file (.jsonl or .parquet for those formats).")
+    parser.add_argument('--also', action='append', default=[], metavar='PATH',
+                        help="Also write the rows to PATH (.csv, .jsonl or .parquet) in the same pass; repeatable.")
+    parser.add_argument('--stream', action='store_true',
+                        help="Parse incrementally with flat memory use (for very large files).")
+    parser.add_argument('--backend', choices=['bs4', 'lxml'], default='bs4',
+                        help="XML library for the in-memory extractor (Default: bs4).")
+    parser.add_argument('--cache', metavar='CACHE_DIR',
+                        help="Skip the run if this input was already exported (see build_cache.py).")
+    parser.add_argument('--force', action='store_true', help="Ignore the cache and rebuild.")
+    run_stats.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        output_sinks.check_paths([args.csv_file, *args.also])
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    with run_stats.session(args, 'export-components') as stats:
+        cache = None
+        if args.cache and args.also:
+            print("Note: --cache only tracks a single output, running without it")
+        elif args.cache:
+            if not os.path.exists(args.xml_file):
+                print(f"Error: Input XML file not found at '{args.xml_file}'")
+                return
+            cache = build_cache.BuildCache(args.cache, force=args.force)
+            if cache.is_current(args.xml_file, args.csv_file, 'export-components', TRANSFORM_VERSION):
+                cache.save()
+                print(f"'{args.xml_file}' unchanged, '{args.csv_file}' is up to date")
+                return
+
+        if args.stream:
+            row_count = stream_ead_data_to_csv(args.xml_file, args.csv_file, stats, args.also)
+        else:
+            row_count = extract_ead_data_to_csv(args.xml_file, args.csv_file, args.backend, stats, args.also)
+
+        if cache and row_count is not None:
+            cache.record(args.xml_file, args.csv_file, 'export-components', TRANSFORM_VERSION)
+            cache.save()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,33 +1,80 @@
 """reads XML file and looks for extra spaces between dashes in folder ranges, and delete the spaces"""
 """run in the command line: python3 old.xml new.xml"""
+"""add --backend lxml to work on an lxml tree instead of BeautifulSoup (much faster on large files)"""
+"""add --stats for parse/transform/serialize timings as JSON, --profile out.prof to profile the run"""
 
 from bs4 import BeautifulSoup
 import re
+import ead_lxml
+import run_stats
 
-def fix_folder_ranges(xml_content):
-    soup = BeautifulSoup(xml_content, 'xml')
+# bump when a change alters the output, so cached results are rebuilt
+TRANSFORM_VERSION = "1"
 
+# patterns like "1 - 2"
+FOLDER_RANGE_RE = re.compile(r"(\d+)\s*-\s*(\d+)")
+FOLDER_CONTAINERS = ead_lxml.etree.XPath("//*[local-name()='container'][@type='folder']")
+
+def fix_folder_ranges_soup(soup):
+    """fixes folder ranges in an already parsed document, in place"""
     # Find all container elements with type="folder"
     for container in soup.find_all('container', {'type': 'folder'}):
         if container.string:
             original_text = container.string
             # Replace patterns like "1 - 2" with "1-2"
-            fixed_text = re.sub(r"(\d+)\s*-\s*(\d+)", r"\1-\2", original_text)
+            fixed_text = FOLDER_RANGE_RE.sub(r"\1-\2", original_text)
             container.string.replace_with(fixed_text)
 
-    return str(soup)
+    return soup
 
-if __name__ == "__main__":
+def fix_folder_ranges_tree(root):
+    """lxml version of fix_folder_ranges_soup, for an ead_lxml.parse() root"""
+    for container in FOLDER_CONTAINERS(root):
+        holder = ead_lxml.string_holder(container)
+        if holder is not None:
+            holder.text = FOLDER_RANGE_RE.sub(r"\1-\2", holder.text)
+
+    return root
+
+def fix_folder_ranges(xml_content, backend="bs4", stats=None):
+    if backend == "lxml":
+        with run_stats.phase(stats, "parse"):
+            root = ead_lxml.parse(xml_content)
+        if stats:
+            stats.count("elements", ead_lxml.element_count(root))
+        with run_stats.phase(stats, "transform"):
+            fix_folder_ranges_tree(root)
+        with run_stats.phase(stats, "serialize"):
+            return ead_lxml.serialize(root)
+
+    with run_stats.phase(stats, "parse"):
+        soup = BeautifulSoup(xml_content, 'xml')
+    if stats:
+        stats.count("elements", len(soup.find_all(True)))
+    with run_stats.phase(stats, "transform"):
+        fix_folder_ranges_soup(soup)
+    with run_stats.phase(stats, "serialize"):
+        return str(soup)
+
+def main(argv=None):
     import argparse
     parser = argparse.ArgumentParser(description='Fix folder number ranges in XML')
     parser.add_argument('input', help='Input XML file')
     parser.add_argument('output', help='Output XML file')
-    args = parser.parse_args()
+    parser.add_argument('--backend', choices=['bs4', 'lxml'], default='bs4', help='XML library to use (Default: bs4)')
+    run_stats.add_arguments(parser)
+    args = parser.parse_args(argv)
 
-    with open(args.input, 'r', encoding='utf-8') as f:
-        xml_content = f.read()
+    with run_stats.session(args, 'folder_format_fixer') as stats:
+        with run_stats.phase(stats, 'read'):
+            with open(args.input, 'r', encoding='utf-8') as f:
+                xml_content = f.read()
 
-    updated_xml = fix_folder_ranges(xml_content)
+        updated_xml = fix_folder_ranges(xml_content, args.backend, stats)
 
-    with open(args.output, 'w', encoding='utf-8') as f:
-        f.write(updated_xml)
\ No newline at end of file
+        with run_stats.phase(stats, 'write'):
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(updated_xml)
+
+if __name__ == "__main__":
+    main()
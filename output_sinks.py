@@ -0,0 +1,185 @@
+"""
+output formats for the scripts that produce tables (export-components.py,
+er_json_to_csv.py): rows go to one or more sinks as they are produced, so
+one extraction pass can write several formats at once
+
+the format is picked from the file extension:
+
+    .csv              CSV, as before (Excel formula wrapping on the columns that use it)
+    .jsonl / .ndjson  one JSON object per line, raw values, null for empty
+    .parquet          typed, compressed columnar file, written in batches (needs pyarrow)
+    anything else     CSV
+
+    sink = output_sinks.open_sinks(["out.csv", "out.parquet"], CSV_HEADER)
+    sink.write(row)       # a list in column order
+    sink.close()          # or sink.abort() to remove the partial files
+"""
+import csv
+import functools
+import importlib.util
+import json
+import os
+
+# rows buffered before a Parquet record batch is written
+PARQUET_BATCH_SIZE = 65536
+
+PYARROW_MISSING = "Parquet output needs pyarrow (pip install pyarrow)"
+
+@functools.lru_cache(maxsize=None)
+def _pyarrow():
+    """(pyarrow, pyarrow.parquet), imported when the first Parquet file is opened."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:  # Parquet output is optional
+        raise ValueError(PYARROW_MISSING) from None
+    return pyarrow, pyarrow.parquet
+
+class CsvSink:
+    """
+    CSV file with a header row. Values in formula_columns are wrapped as
+    ="value" so Excel keeps them as text (leading zeros, ranges like 1-2).
+    """
+
+    def __init__(self, path, fieldnames, formula_columns=()):
+        self.path = path
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(fieldnames)
+        self.formula_indexes = [fieldnames.index(name) for name in formula_columns]
+
+    def write(self, row):
+        if self.formula_indexes:
+            row = list(row)
+            for index in self.formula_indexes:
+                if row[index]:
+                    row[index] = f'="{row[index]}"'
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+class JsonlSink:
+    """Newline-delimited JSON: one object per row, empty values as null."""
+
+    def __init__(self, path, fieldnames):
+        self.path = path
+        self.fieldnames = fieldnames
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, row):
+        record = {name: (value if value != '' else None) for name, value in zip(self.fieldnames, row)}
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def close(self):
+        self.file.close()
+
+class ParquetSink:
+    """
+    Parquet file written in record batches of PARQUET_BATCH_SIZE rows.
+    Columns are strings unless types maps a column name to an Arrow type
+    name such as 'int64'.
+    """
+
+    def __init__(self, path, fieldnames, types=None, batch_size=PARQUET_BATCH_SIZE):
+        pa, pq = _pyarrow()
+        self.path = path
+        types = types or {}
+        self.schema = pa.schema([(name, pa.type_for_alias(types.get(name, 'string'))) for name in fieldnames])
+        self.writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+        self.pa = pa
+        self.batch_size = batch_size
+        self.columns = [[] for _ in fieldnames]
+        self.buffered = 0
+
+    def write(self, row):
+        for column, value in zip(self.columns, row):
+            column.append(value if value != '' else None)
+        self.buffered += 1
+        if self.buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffered:
+            self.writer.write_batch(self.pa.record_batch(self.columns, schema=self.schema))
+            self.columns = [[] for _ in self.columns]
+            self.buffered = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+class MultiSink:
+    """Writes every row to several sinks."""
+
+    def __init__(self, sinks, fieldnames):
+        self.sinks = sinks
+        self.fieldnames = fieldnames
+
+    @property
+    def paths(self):
+        return [sink.path for sink in self.sinks]
+
+    def write(self, row):
+        for sink in self.sinks:
+            sink.write(row)
+
+    def write_dict(self, row):
+        """Writes a dict row (missing keys are empty), like csv.DictWriter."""
+        self.write([row.get(name, '') for name in self.fieldnames])
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def abort(self):
+        """Closes and deletes every output, after an error."""
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception:
+                pass
+            if os.path.exists(sink.path):
+                os.remove(sink.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet'}
+
+def output_format(path):
+    """'csv', 'jsonl' or 'parquet' from the file extension (CSV for anything unknown)."""
+    return FORMATS.get(os.path.splitext(path)[1].lower(), 'csv')
+
+def check_paths(paths):
+    """Raises ValueError if any path needs a library that isn't installed."""
+    for path in paths:
+        if output_format(path) == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+            raise ValueError(PYARROW_MISSING)
+
+def open_sinks(paths, fieldnames, formula_columns=(), types=None):
+    """
+    Opens a sink for every path (format from its extension) and returns them
+    as one MultiSink. formula_columns only applies to CSV, types only to
+    Parquet. Raises ValueError when pyarrow is needed but missing.
+    """
+    formats = [output_format(path) for path in paths]
+    sinks = []
+    try:
+        for path, output in zip(paths, formats):
+            if output == 'csv':
+                sinks.append(CsvSink(path, fieldnames, formula_columns))
+            elif output == 'jsonl':
+                sinks.append(JsonlSink(path, fieldnames))
+            else:
+                sinks.append(ParquetSink(path, fieldnames, types))
+    except Exception:
+        MultiSink(sinks, fieldnames).abort()
+        raise
+    return MultiSink(sinks, fieldnames)
@@ -17,12 +17,9 @@ prints:
 
 '''
 import datetime
-import holidays
-import math
-
-import datetime
-import holidays
+import holiday_calendars
 import math
+import workday_calendar
 
 def get_calendar_stats(total_working_days, staff_count, days_per_week):
     """
@@ -54,33 +51,19 @@ def get_completion_date(start_date, working_days, days_per_week):
     Steps through the calendar skipping weekends, US holidays, 
     and days exceeding the project's weekly schedule.
     """
-    us_holidays = holidays.US()
-    current_date = start_date
-    days_added = 0
-    
+    us_holidays = holiday_calendars.us_holidays()
     target_days = math.ceil(working_days)
+    if target_days < 1:
+        return start_date
 
-    while days_added < target_days:
-        current_date += datetime.timedelta(days=1)
-        
-        # 1. Skip Weekends (5=Sat, 6=Sun)
-        if current_date.weekday() >= 5:
-            continue
-            
-        # 2. Skip Holidays
-        if current_date in us_holidays:
-            continue
-            
-        # 3. Skip if day of week exceeds the project's set days per week
-        if current_date.weekday() >= days_per_week:
-            continue
-
-        days_added += 1
-    return current_date
+    # counting starts the day after start_date, on the first days_per_week weekdays (never Sat/Sun)
+    work_days = [day for day in range(5) if day < days_per_week]
+    return workday_calendar.add_working_days(start_date + datetime.timedelta(days=1), target_days,
+                                             work_days, us_holidays)
 
 def main():
     print("---- Archival Project Calculator ----")
-    us_holidays = holidays.US()
+    us_holidays = holiday_calendars.us_holidays()
     
     try:
         # 1. Inputs
@@ -17,19 +17,29 @@ options:
   --start START  Start date (YYYY-MM-DD). Defaults to today
   --days            Workdays indices 0-4 (Default: 0,1,2,3,4 for Mon-Fri)
 
+  Monte Carlo forecast (needs numpy):
+  --simulate N             Run N trials with varying rates and staff time, report P50/P90 dates
+  --tri_lin MIN,MODE,MAX   Triangular rate for linear feet (also --tri_ami, --tri_car, --tri_gb)
+                           (Default: the fixed rate, plus or minus --spread)
+  --spread SPREAD          Default rate range as a share of the rate (Default: 0.25)
+  --availability MIN,MODE,MAX  Share of the FTE actually spent on the project (Default: 1,1,1)
+  --seed SEED              Random seed, for repeatable forecasts
+
   To run script: python3 ap_project_planner.py -- enter details from above here 
 
   rates are hardcoded, but can be adjusted from command line with -- r_lin, -- r_ami -- r_car -- r_gb
   at least one extent type, staff required
 
   Also exports a visualization of staff effort for each format
+
+  python3 ap_project_planner.py --lin 200 --gb 50 --staff 2 --simulate 100000 --tri_lin 0.5,1,1.5 --availability 0.6,0.85,1
 """
 import datetime
-import holidays
+import holiday_calendars
+import workday_calendar
 import math
 import argparse
 import sys
-import matplotlib.pyplot as plt
 
 def get_calendar_stats(total_working_days, staff_count, work_days_indices):
     days_per_week = len(work_days_indices)
@@ -50,21 +60,90 @@ def get_calendar_stats(total_working_days, staff_count, work_days_indices):
     return total_stats, per_person_stats, days_per_person
 
 def get_completion_date(start_date, working_days, work_days_indices):
-    us_holidays = holidays.US()
-    current_date = start_date
-    days_added = 0
-    target_days = math.ceil(working_days)
+    us_holidays = holiday_calendars.us_holidays()
+    return workday_calendar.add_working_days(start_date, math.ceil(working_days), work_days_indices, us_holidays)
+
+# (label, quantity option, rate option) of every format, in the order of the effort chart
+FORMATS = [
+    ('Physical (Lin Ft)', 'lin', 'r_lin'),
+    ('AMI Recordings', 'ami', 'r_ami'),
+    ('Digital Carriers', 'car', 'r_car'),
+    ('Digital (GB)', 'gb', 'r_gb'),
+]
+DEFAULT_RATES = {'lin': 1.0, 'ami': 30.0, 'car': 1.0, 'gb': 0.2}
+PERCENTILES = [10, 50, 80, 90, 95]
+HISTOGRAM_BINS = 12
+
+def format_efforts(quantities, rates):
+    """{format label: days of labor} for {'lin': ..., 'gb': ...} quantities and rates (units per day)"""
+    # Uniform Logic: Total Days = Quantity / Rate
+    efforts = {}
+    for label, name, _ in FORMATS:
+        quantity, rate = quantities.get(name, 0), rates.get(name, DEFAULT_RATES[name])
+        efforts[label] = (quantity / rate) if quantity > 0 and rate > 0 else 0
+    return efforts
+
+def parse_triangle(text):
+    """'0.5,1,1.5' -> (0.5, 1.0, 1.5); raises ValueError unless 0 <= min <= mode <= max."""
+    values = [float(value) for value in text.split(",")]
+    if len(values) != 3 or not 0 <= values[0] <= values[1] <= values[2]:
+        raise ValueError(f"'{text}' is not MIN,MODE,MAX with 0 <= MIN <= MODE <= MAX")
+    return tuple(values)
+
+def _triangular(rng, triangle, size):
+    import numpy as np
+
+    low, mode, high = triangle
+    if low == high:
+        # numpy's triangular needs MIN < MAX
+        return np.full(size, low)
+    return rng.triangular(low, mode, high, size)
+
+def simulate_completion(quantities, rate_triangles, staff, availability, start_date, work_days_indices,
+                        trials, seed=None):
+    """
+    Monte Carlo version of the planner: every trial draws a rate for each
+    format and the share of the staff's time spent on the project from
+    triangular distributions. Returns (total effort in days, completion
+    dates as datetime64[D]), one per trial.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    total_days = np.zeros(trials)
+    for quantity, triangle in zip(quantities, rate_triangles):
+        if quantity > 0:
+            total_days += quantity / _triangular(rng, triangle, trials)
+    staff_days = staff * _triangular(rng, availability, trials)
+    calendar_days = np.divide(total_days, staff_days, out=np.zeros(trials), where=staff_days > 0)
 
-    if start_date.weekday() in work_days_indices and start_date not in us_holidays:
-        days_added = 1
+    # as get_completion_date, but each distinct number of working days is turned into a date once
+    targets, trial_targets = np.unique(np.ceil(calendar_days).astype(np.int64), return_inverse=True)
+    dates = workday_calendar.add_working_days_batch(np.full(targets.size, start_date, dtype="datetime64[D]"),
+                                                    targets, work_days_indices, holiday_calendars.us_holidays())
+    return total_days, dates[trial_targets.ravel()]
 
-    while days_added < target_days:
-        current_date += datetime.timedelta(days=1)
-        if current_date.weekday() in work_days_indices and current_date not in us_holidays:
-            days_added += 1
-    return current_date
+def print_simulation(total_days, dates):
+    import numpy as np
 
-def main():
+    # completion dates of the trials: the P90 date is the first one 90% of trials finish by
+    days = dates.astype(np.int64)
+    print(f"MONTE CARLO FORECAST ({days.size:,} trials)")
+    print("-" * 55)
+    for percentile in PERCENTILES:
+        day = np.percentile(days, percentile, method="inverted_cdf").astype("datetime64[D]").astype(object)
+        effort = np.percentile(total_days, percentile)
+        print(f"P{percentile:<3} {day.strftime('%a, %b %d, %Y'):<20} {effort:>10.1f} Working Days of effort")
+
+    print("-" * 55)
+    print("Total effort (Working Days)   share of trials")
+    counts, edges = np.histogram(total_days, bins=HISTOGRAM_BINS)
+    for count, low, high in zip(counts, edges, edges[1:]):
+        share = count / days.size
+        print(f"{low:>10.1f} - {high:<10.1f} {'#' * round(share * 40):<40} {share:6.1%}")
+    print("="*55 + "\n")
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Archival Project Calculator (Units per Day)")
 
     # Quantities
@@ -74,17 +153,28 @@ def main():
     parser.add_argument("--gb", type=float, default=0, help="Gigabytes of digital files")
 
     # Rates 
-    parser.add_argument("--r_lin", type=float, default=1.0, help="Rate: Linear feet per day (Default: 1.0)")
-    parser.add_argument("--r_ami", type=float, default=30.0, help="Rate: AMI per day")
-    parser.add_argument("--r_car", type=float, default=1.0, help="Rate: Carriers per day")
-    parser.add_argument("--r_gb", type=float, default=0.2, help="Rate: GB per day (Default: 0.2, i.e., 5 days/GB)")
+    parser.add_argument("--r_lin", type=float, default=DEFAULT_RATES['lin'], help="Rate: Linear feet per day (Default: 1.0)")
+    parser.add_argument("--r_ami", type=float, default=DEFAULT_RATES['ami'], help="Rate: AMI per day")
+    parser.add_argument("--r_car", type=float, default=DEFAULT_RATES['car'], help="Rate: Carriers per day")
+    parser.add_argument("--r_gb", type=float, default=DEFAULT_RATES['gb'], help="Rate: GB per day (Default: 0.2, i.e., 5 days/GB)")
 
     # Project Settings
     parser.add_argument("--staff", type=float, default=1.0, help="Number of archivists (FTE)")
     parser.add_argument("--start", type=str, help="Start date (YYYY-MM-DD)")
     parser.add_argument("--days", type=str, default="0,1,2,3,4", help="Workdays 0-4 (Mon-Fri)")
 
-    args = parser.parse_args()
+    # Monte Carlo forecast
+    parser.add_argument("--simulate", type=int, metavar="N", help="Run N trials with varying rates and staff time")
+    for _, name, rate in FORMATS:
+        parser.add_argument(f"--tri_{name}", type=str, metavar="MIN,MODE,MAX",
+                            help=f"Triangular rate for --{name} (Default: --{rate} plus or minus --spread)")
+    parser.add_argument("--spread", type=float, default=0.25,
+                        help="Default rate range as a share of the rate (Default: 0.25)")
+    parser.add_argument("--availability", type=str, default="1,1,1", metavar="MIN,MODE,MAX",
+                        help="Share of the FTE actually spent on the project (Default: 1,1,1)")
+    parser.add_argument("--seed", type=int, help="Random seed for --simulate")
+
+    args = parser.parse_args(argv)
     
     HOURS_PER_DAY = 7.0
     SHORT_DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri"]
@@ -97,16 +187,11 @@ def main():
         print("Error: Invalid workdays.")
         return
 
-    us_holidays = holidays.US()
+    us_holidays = holiday_calendars.us_holidays()
     start_date = datetime.datetime.strptime(args.start, "%Y-%m-%d").date() if args.start else datetime.date.today()
 
-    # Uniform Logic: Total Days = Quantity / Rate
-    efforts = {
-        'Physical (Lin Ft)': (args.lin / args.r_lin) if args.lin > 0 and args.r_lin > 0 else 0,
-        'AMI Recordings': (args.ami / args.r_ami) if args.ami > 0 and args.r_ami > 0 else 0,
-        'Digital Carriers': (args.car / args.r_car) if args.car > 0 and args.r_car > 0 else 0,
-        'Digital (GB)': (args.gb / args.r_gb) if args.gb > 0 and args.r_gb > 0 else 0
-    }
+    efforts = format_efforts({name: getattr(args, name) for _, name, _ in FORMATS},
+                             {name: getattr(args, rate) for _, name, rate in FORMATS})
 
     total_days = sum(efforts.values())
 
@@ -125,11 +210,45 @@ def main():
     print(f"Calendar Duration: {pp_stats[0]} Years, {pp_stats[1]} Months, {round(pp_stats[2], 1)} Days")
     print("="*55 + "\n")
 
+    if args.simulate:
+        try:
+            triangles = []
+            for _, name, rate in FORMATS:
+                given = getattr(args, f"tri_{name}")
+                fixed = getattr(args, rate)
+                triangles.append(parse_triangle(given) if given else
+                                 (fixed * max(1 - args.spread, 0), fixed, fixed * (1 + args.spread)))
+            availability = parse_triangle(args.availability)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        if any(triangle[0] <= 0 for triangle, (_, name, _) in zip(triangles, FORMATS) if getattr(args, name) > 0):
+            print("Error: Simulated rates must stay above 0 (check --spread and the --tri_ minimums).")
+            return
+        if availability[0] <= 0:
+            print("Error: The --availability minimum must be above 0.")
+            return
+        try:
+            total, dates = simulate_completion([getattr(args, name) for _, name, _ in FORMATS], triangles,
+                                               args.staff, availability, start_date, work_days_indices,
+                                               args.simulate, args.seed)
+        except ImportError:
+            print("Install numpy to run --simulate.")
+            return
+        print_simulation(total, dates)
+
     # Visualization
     labels = [k for k, v in efforts.items() if v > 0]
     values = [v for v in efforts.values() if v > 0]
 
     if labels:
+        try:
+            # imported here: matplotlib is slow to load and only needed for the chart
+            import matplotlib.pyplot as plt
+        except ImportError:
+            print("Install matplotlib to see the effort chart.")
+            return
+
         plt.figure(figsize=(10, 6))
         colors = ['#4285F4', '#EA4335', '#FBBC05', '#34A853']
         bars = plt.bar(labels, values, color=colors[:len(labels)])
@@ -24,7 +24,8 @@ To run enter in commandline: python3 ap_project_planner_ui.py
 
 """
 import datetime
-import holidays
+import holiday_calendars
+import workday_calendar
 import math
 import matplotlib.pyplot as plt
 
@@ -46,19 +47,8 @@ def get_calendar_stats(total_working_days, staff_count, work_days_indices):
     return per_person_stats, days_per_person
 
 def get_completion_date(start_date, working_days, work_days_indices):
-    us_holidays = holidays.US()
-    current_date = start_date
-    days_added = 0
-    target_days = math.ceil(working_days)
-
-    if start_date.weekday() in work_days_indices and start_date not in us_holidays:
-        days_added = 1
-
-    while days_added < target_days:
-        current_date += datetime.timedelta(days=1)
-        if current_date.weekday() in work_days_indices and current_date not in us_holidays:
-            days_added += 1
-    return current_date
+    us_holidays = holiday_calendars.us_holidays()
+    return workday_calendar.add_working_days(start_date, math.ceil(working_days), work_days_indices, us_holidays)
 
 def get_work_days_input():
     days_map = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
@@ -91,7 +81,7 @@ def get_numeric_input(prompt, default_val):
             print("  ! Invalid input. Please enter a number.")
 
 def get_valid_date_input(prompt, work_days_indices):
-    us_holidays = holidays.US()
+    us_holidays = holiday_calendars.us_holidays()
     days_map = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
     while True:
         start_str = input(f"{prompt} (YYYY-MM-DD) or press Enter for Today: ").strip()
@@ -0,0 +1,188 @@
+"""
+holiday calendars shared by the project calculators
+
+building a holidays table (holidays.US) costs far more than looking a date
+up in it, and importing the holidays package alone takes a good part of a
+calculator's start-up. each country (and subdivision) is compiled once,
+one decade at a time, into a sorted list of dates per year and saved to a
+JSON cache file, so later runs read the dates back without importing
+holidays at all:
+
+    calendar = holiday_calendars.us_holidays(2025, 2029)
+    date in calendar, calendar.get(date)        as with holidays.US
+    calendar.between(start, end)                sorted (date, name) pairs
+
+a calendar grows on its own when a date outside the compiled years is
+looked up, as holidays.US does, and the new years are added to the cache.
+the cache is rebuilt when the installed holidays version changes
+
+cache file: ~/.cache/archives/holidays.json, or the path in ARCHIVES_HOLIDAY_CACHE
+
+run in the command line to compile years ahead of time:
+python3 holiday_calendars.py 2020 2040
+    optional: --country US --subdiv CA
+"""
+import argparse
+import bisect
+import datetime
+import functools
+import json
+import os
+import sys
+import tempfile
+from importlib import metadata
+
+CACHE_ENV = "ARCHIVES_HOLIDAY_CACHE"
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "archives", "holidays.json")
+CACHE_FORMAT = 1
+
+# years are compiled a whole decade at a time, so stepping over a year boundary doesn't recompile
+BLOCK_YEARS = 10
+
+def cache_path():
+    return os.environ.get(CACHE_ENV) or DEFAULT_CACHE_PATH
+
+@functools.lru_cache(maxsize=None)
+def holidays_version():
+    try:
+        return metadata.version("holidays")
+    except metadata.PackageNotFoundError:
+        return None
+
+def _read_cache(path):
+    """{calendar key: {year (str): [[ordinal, name], ...]}} from the cache file, {} if unusable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("format") != CACHE_FORMAT or cache.get("holidays_version") != holidays_version():
+        return {}
+    return cache.get("calendars", {})
+
+def _write_cache(path, key, years):
+    """Merges one calendar's years into the cache file (written to a temporary file, then renamed)."""
+    calendars = _read_cache(path)
+    calendars.setdefault(key, {}).update(years)
+    directory = os.path.dirname(path) or "."
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, delete=False, suffix=".tmp") as f:
+            json.dump({"format": CACHE_FORMAT, "holidays_version": holidays_version(), "calendars": calendars},
+                      f, separators=(",", ":"))
+        os.replace(f.name, path)
+    except OSError as e:
+        # the calendar still works, it is just compiled again next time
+        print(f"Warning: Could not save the holiday cache to '{path}': {e}", file=sys.stderr)
+
+def compile_years(country, subdiv, first_year, last_year):
+    """{year (str): [[ordinal, name], ...]} from the holidays package, dates sorted."""
+    import holidays
+    table = holidays.country_holidays(country, subdiv=subdiv, years=range(first_year, last_year + 1))
+    years = {str(year): [] for year in range(first_year, last_year + 1)}
+    for day, name in sorted(table.items()):
+        years[str(day.year)].append([day.toordinal(), name])
+    return years
+
+class HolidayCalendar:
+    """Holidays of one country (and subdivision), compiled per year and cached on disk."""
+
+    def __init__(self, country="US", subdiv=None, path=None):
+        self.country = country
+        self.subdiv = subdiv
+        self.key = f"{country}-{subdiv}" if subdiv else country
+        self.path = path or cache_path()
+        self.years = set()
+        self._names = {}  # date -> name, every compiled year
+        self._ordinals = {}  # year -> sorted ordinals
+        self._stored = None  # the cache file's years for this calendar, read on first use
+
+    def _add_years(self, years):
+        for year, entries in years.items():
+            year = int(year)
+            self.years.add(year)
+            self._ordinals[year] = [ordinal for ordinal, _ in entries]
+            for ordinal, name in entries:
+                self._names[datetime.date.fromordinal(ordinal)] = name
+
+    def cover(self, first_year, last_year=None):
+        """Makes sure first_year..last_year are compiled; returns the calendar."""
+        last_year = first_year if last_year is None else last_year
+        missing = [year for year in range(first_year, last_year + 1) if year not in self.years]
+        if not missing:
+            return self
+        if self._stored is None:
+            self._stored = _read_cache(self.path).get(self.key, {})
+        self._add_years({str(year): self._stored[str(year)] for year in missing if str(year) in self._stored})
+
+        missing = [year for year in missing if year not in self.years]
+        if missing:
+            first_block = missing[0] - missing[0] % BLOCK_YEARS
+            last_block = missing[-1] - missing[-1] % BLOCK_YEARS + BLOCK_YEARS - 1
+            years = compile_years(self.country, self.subdiv, max(first_block, 1), last_block)
+            self._add_years(years)
+            self._stored.update(years)
+            _write_cache(self.path, self.key, years)
+        return self
+
+    def __contains__(self, date):
+        if date.year not in self.years:
+            self.cover(date.year)
+        return date in self._names
+
+    def get(self, date, default=None):
+        if date.year not in self.years:
+            self.cover(date.year)
+        return self._names.get(date, default)
+
+    def __iter__(self):
+        return iter(sorted(self._names))
+
+    def __len__(self):
+        return len(self._names)
+
+    def between(self, start, end):
+        """Sorted (date, name) pairs of the holidays from start to end, both included."""
+        self.cover(start.year, end.year)
+        first, last = start.toordinal(), end.toordinal()
+        pairs = []
+        for year in range(start.year, end.year + 1):
+            ordinals = self._ordinals[year]
+            for ordinal in ordinals[bisect.bisect_left(ordinals, first):bisect.bisect_right(ordinals, last)]:
+                day = datetime.date.fromordinal(ordinal)
+                pairs.append((day, self._names[day]))
+        return pairs
+
+@functools.lru_cache(maxsize=None)
+def holiday_calendar(country="US", subdiv=None):
+    """The shared HolidayCalendar of a country (and subdivision) for this process."""
+    return HolidayCalendar(country, subdiv)
+
+def us_holidays(first_year=None, last_year=None):
+    """The US holiday calendar, with first_year..last_year compiled (it grows when other years are looked up)."""
+    calendar = holiday_calendar("US")
+    if first_year is not None:
+        calendar.cover(first_year, last_year)
+    return calendar
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile holidays into the holiday cache ahead of time.")
+    parser.add_argument("first_year", type=int, help="First year to compile")
+    parser.add_argument("last_year", type=int, help="Last year to compile")
+    parser.add_argument("--country", default="US", help="Country code (Default: US)")
+    parser.add_argument("--subdiv", help="State or other subdivision code, e.g. CA")
+    args = parser.parse_args(argv)
+
+    if args.last_year < args.first_year:
+        print("Error: last_year is before first_year.")
+        return
+    try:
+        calendar = holiday_calendar(args.country, args.subdiv).cover(args.first_year, args.last_year)
+    except NotImplementedError as e:
+        print(f"Error: {e}")
+        return
+    count = len(calendar.between(datetime.date(args.first_year, 1, 1), datetime.date(args.last_year, 12, 31)))
+    print(f"{count} holidays for {calendar.key}, {args.first_year}-{args.last_year}, cached in {calendar.path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
-"”"uses holidays module to list holidays for a specific year.
+"""uses holidays module to list holidays for a specific year.
 year is hard coded and needs to be revised. 
-also works for other countries' holidays"""
+also works for other countries' holidays (holiday_calendars.holiday_calendar("CA"))"""
 
-import holidays
-us_holidays = holidays.US(years=2015) # revise for specific year
+import datetime
+import holiday_calendars
 
-for date, name in sorted(us_holidays.items()):
-    print(f"{date}: {name}")
\ No newline at end of file
+year = 2015 # revise for specific year
+us_holidays = holiday_calendars.us_holidays(year, year)
+
+for date, name in us_holidays.between(datetime.date(year, 1, 1), datetime.date(year, 12, 31)):
+    print(f"{date}: {name}")
@@ -4,10 +4,14 @@
     start date
     days of week
     number of days
-    script will provide end date"""
+    script will provide end date
+    many projects at once from a CSV file (see project_batch.py):
+    python3 hybrid_project_calculator.py --batch projects.csv end_dates.csv"""
 
 import datetime
-import holidays
+import holiday_calendars
+import project_batch
+import workday_calendar
 import argparse
 import sys
 
@@ -77,7 +81,7 @@ def calculate_end_date(start_date_str, duration_days, days_per_week, specified_w
     if not start_date:
         return "Error: Invalid start date format. Please use MM/DD/YY (e.g., 06/05/25)."
 
-    us_holidays = holidays.US(years=range(start_date.year, start_date.year + 5))
+    us_holidays = holiday_calendars.us_holidays(start_date.year, start_date.year + 4)
 
     work_week_days = []
     if specified_working_days is not None:
@@ -98,45 +102,25 @@ def calculate_end_date(start_date_str, duration_days, days_per_week, specified_w
     if start_date.weekday() not in work_week_days:
         return f"Error: Start date {start_date.strftime('%m/%d/%y')} is not one of your specified working days ({', '.join(datetime.date(1,1,day).strftime('%a') for day in sorted(work_week_days))})."
 
-    current_date = start_date
-    working_days_counted = 0
-    
-   
-    if current_date.weekday() in work_week_days and not is_holiday(current_date, us_holidays):
-        working_days_counted = 1
-    else:
-      
-        pass 
-
-        if working_days_counted == 0:
-            while True:
-                current_date += datetime.timedelta(days=1)
-                if current_date.weekday() in work_week_days and not is_holiday(current_date, us_holidays):
-                    working_days_counted = 1 # Start counting from this valid day
-                    break
-                if current_date > start_date + datetime.timedelta(days=365*2): 
-                    return "Error: Could not find a valid first working day within two years of the start date."
-
-    while working_days_counted < duration_days:
-        current_date += datetime.timedelta(days=1) 
-        
-        if current_date.weekday() in work_week_days and not is_holiday(current_date, us_holidays):
-            working_days_counted += 1
-  
-    if current_date.weekday() not in work_week_days or is_holiday(current_date, us_holidays):
-        return f"Internal Error: Calculated end date {current_date.strftime('%m/%d/%y')} is not a valid working day."
-
+    # the start date is a working day (checked above), so it counts as the first one
+    current_date = workday_calendar.add_working_days(start_date, duration_days, work_week_days, us_holidays)
 
     return current_date.strftime('%m/%d/%y')
 
-if __name__ == "__main__":
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Calculate project end date (skip weekends, holidays, and non-working days).")
     parser.add_argument("start_date", type=str, nargs='?', help="Start date in MM/DD/YY (e.g., 06/05/25)")
     parser.add_argument("duration", type=int, nargs='?', help="Total duration in working days")
     parser.add_argument("days_per_week", type=int, nargs='?', help="Number of days worked per week (1-5)")
     parser.add_argument("--working_days", type=str, help="Comma-separated list of working days (e.g., Monday,Tuesday,Wednesday or 0,1,2). Only applies if days_per_week < 5.")
+    parser.add_argument("--batch", nargs=2, metavar=("INPUT_CSV", "OUTPUT_CSV"),
+                        help="Answer every project (start_date, duration or end_date, working_days columns) in a CSV file")
+
+    args = parser.parse_args(argv)
 
-    args = parser.parse_args()
+    if args.batch:
+        project_batch.run_csv(*args.batch, hybrid=True)
+        return
 
     if all([args.start_date, args.duration, args.days_per_week]):
 
@@ -194,7 +178,7 @@ if __name__ == "__main__":
 
     else:
         today_year = datetime.date.today().year
-        us_holidays = holidays.US(years=range(today_year, today_year + 5))
+        us_holidays = holiday_calendars.us_holidays(today_year, today_year + 4)
 
         while True:
             try:
@@ -248,4 +232,7 @@ if __name__ == "__main__":
         if "Error:" in end_date:
             print(end_date)
         else:
-            print(f"Project starting on {start_date_str} with {duration} working days, worked {days_per_week} days/week, ends on: {end_date}")
\ No newline at end of file
+            print(f"Project starting on {start_date_str} with {duration} working days, worked {days_per_week} days/week, ends on: {end_date}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+schedules a portfolio of processing projects over a shared pool of staff
+
+each project's effort comes from the ap_project_planner.py model (quantity
+divided by a rate, per format, in days of labor); each archivist works
+their FTE share of a day on each of their own working days (weekday set,
+US holidays skipped). the schedule is an event simulation: whenever
+someone is free, they join the most urgent project that has been released
+and still has room (lowest priority number first, then earliest deadline,
+then file order), and stay on it until it is finished - nobody is taken
+off a project once on it. events (a project released, a person starting,
+a project finished) come off a heap in date order
+
+projects CSV columns (only name is required):
+    name, priority (lower first, Default: 0), deadline (YYYY-MM-DD),
+    start (earliest start, YYYY-MM-DD, Default: --start), max_staff (Default: 1),
+    lin, ami, car, gb (quantities), r_lin, r_ami, r_car, r_gb (rates, Default: --r_lin...)
+
+staff CSV columns (only name is required):
+    name, fte (Default: 1), days (weekdays worked, 0-6, Default: 0,1,2,3,4),
+    start (available from, YYYY-MM-DD)
+
+prints every project's start and end date and every person's utilization
+(days on projects / working days from the portfolio start to its end)
+
+run in the command line:
+python3 portfolio_scheduler.py projects.csv staff.csv
+    optional: --start 2025-07-01 --output schedule.csv --staff-output utilization.csv
+              --assignments assignments.csv --r_lin 1.5
+"""
+import argparse
+import csv
+import datetime
+import heapq
+import math
+import sys
+
+import ap_project_planner
+import holiday_calendars
+import workday_calendar
+
+# days of work below this are rounding left-overs, not work
+EPSILON = 1e-9
+
+# event kinds, in the order they're handled on the same date
+FINISH, STAFF, RELEASE = 0, 1, 2
+
+class Project:
+    def __init__(self, index, name, effort, priority=0, deadline=None, release=None, max_staff=1):
+        self.index = index
+        self.name = name
+        self.effort = effort
+        self.priority = priority
+        self.deadline = deadline
+        self.release = release
+        self.max_staff = max_staff
+        self.remaining = effort
+        self.team = []
+        self.updated = None  # date up to which (excluded) the team's work has been taken off remaining
+        self.version = 0  # bumped when the team changes, so an older finish event is ignored
+        self.start = None
+        self.end = None
+        self.staff_names = []
+
+    def sort_key(self):
+        deadline = self.deadline.toordinal() if self.deadline else math.inf
+        return (self.priority, deadline, self.index)
+
+class Person:
+    def __init__(self, index, name, fte=1.0, weekdays=workday_calendar.WEEKDAYS, start=None, holidays=None):
+        self.index = index
+        self.name = name
+        self.fte = fte
+        self.weekdays = tuple(weekdays)
+        self.start = start
+        self.calendar = workday_calendar.calendar_for(self.weekdays, holidays)
+        self.busy_days = 0  # working days spent on projects (not weighted by FTE)
+
+    def sort_key(self):
+        # the free person who gets the most done goes first
+        return (-self.fte, self.index)
+
+def _day_before(date):
+    return date - datetime.timedelta(days=1)
+
+class Scheduler:
+    """Event simulation of one portfolio; run() fills in each project's start, end and staff."""
+
+    def __init__(self, projects, people, start_date):
+        self.projects = projects
+        self.people = people
+        self.start_date = start_date
+        self.events = []
+        self.waiting = []  # released projects with room for more staff, by urgency
+        self.free = []  # people without a project, by FTE
+        self.assignments = []  # (person, project, first day, last day)
+        self._joined = {}  # (person index, project index) -> date the person joined
+        self._sequence = 0
+
+    def _push(self, date, kind, item, version=0):
+        self._sequence += 1
+        heapq.heappush(self.events, (date, kind, self._sequence, item, version))
+
+    def _advance(self, project, date):
+        """Takes the team's work up to date (excluded) off the project's remaining effort."""
+        if project.updated is not None and date > project.updated:
+            last = _day_before(date)
+            for person in project.team:
+                days = person.calendar.count(project.updated, last)
+                project.remaining -= person.fte * days
+                person.busy_days += days
+        project.updated = date
+
+    def _finish_day(self, project, date):
+        """Last day of work on project if its team carries on from date."""
+        if len(project.team) == 1:
+            person = project.team[0]
+            return person.calendar.add(date, math.ceil(project.remaining / person.fte - EPSILON))
+
+        def done_by(last):
+            return sum(person.fte * person.calendar.count(date, last) for person in project.team) \
+                >= project.remaining - EPSILON
+
+        # double a window until the work fits in it, then bisect on the day
+        low, width = date.toordinal(), 7
+        while not done_by(datetime.date.fromordinal(low + width)):
+            width *= 2
+        high = low + width
+        while low < high:
+            middle = (low + high) // 2
+            if done_by(datetime.date.fromordinal(middle)):
+                high = middle
+            else:
+                low = middle + 1
+        return datetime.date.fromordinal(low)
+
+    def _dispatch(self, date):
+        """Puts free people on the most urgent waiting projects, starting on date."""
+        changed = []
+        while self.free and self.waiting:
+            _, project = self.waiting[0]
+            _, person = heapq.heappop(self.free)
+            if project not in changed:
+                self._advance(project, date)
+                changed.append(project)
+            project.team.append(person)
+            project.staff_names.append(person.name)
+            self._joined[(person.index, project.index)] = date
+            first_day = person.calendar.add(date, 1)
+            project.start = first_day if project.start is None else min(project.start, first_day)
+            if len(project.team) >= project.max_staff:
+                heapq.heappop(self.waiting)
+        for project in changed:
+            project.version += 1
+            end = self._finish_day(project, date)
+            self._push(end + datetime.timedelta(days=1), FINISH, project, project.version)
+            project.end = end
+
+    def _finish(self, project, date):
+        self._advance(project, date)
+        for person in project.team:
+            self.assignments.append((person, project, self._joined.pop((person.index, project.index)),
+                                     _day_before(date)))
+            heapq.heappush(self.free, (person.sort_key(), person))
+        project.team = []
+        if (project.sort_key(), project) in self.waiting:
+            self.waiting.remove((project.sort_key(), project))
+            heapq.heapify(self.waiting)
+
+    def run(self):
+        for project in self.projects:
+            self._push(max(project.release or self.start_date, self.start_date), RELEASE, project)
+        for person in self.people:
+            self._push(max(person.start or self.start_date, self.start_date), STAFF, person)
+
+        while self.events:
+            date = self.events[0][0]
+            # everything that happens on this date, then one dispatch
+            while self.events and self.events[0][0] == date:
+                _, kind, _, item, version = heapq.heappop(self.events)
+                if kind == FINISH:
+                    if version == item.version:
+                        self._finish(item, date)
+                elif kind == STAFF:
+                    heapq.heappush(self.free, (item.sort_key(), item))
+                elif item.remaining <= EPSILON:
+                    # nothing to do: done the day it's released
+                    item.start = item.end = date
+                else:
+                    heapq.heappush(self.waiting, (item.sort_key(), item))
+            self._dispatch(date)
+        return self
+
+    def end_date(self):
+        ends = [project.end for project in self.projects if project.end]
+        return max(ends) if ends else self.start_date
+
+    def utilization(self):
+        """(person, working days on projects, working days available) from the portfolio start to its end."""
+        end = self.end_date()
+        rows = []
+        for person in self.people:
+            available = person.calendar.count(max(person.start or self.start_date, self.start_date), end)
+            rows.append((person, person.busy_days, available))
+        return rows
+
+def _date(text, column):
+    text = (text or "").strip()
+    if not text:
+        return None
+    try:
+        return datetime.datetime.strptime(text, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Invalid {column} '{text}'. Please use YYYY-MM-DD.") from None
+
+def _number(text, column, default, kind=float):
+    text = (text or "").strip()
+    if not text:
+        return default
+    try:
+        return kind(text)
+    except ValueError:
+        raise ValueError(f"Invalid {column} '{text}'.") from None
+
+def read_projects(path, rates, release=None):
+    """Projects from a CSV file; rates are the defaults for rows without their own r_lin... columns."""
+    projects = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for index, row in enumerate(csv.DictReader(f)):
+            name = (row.get("name") or "").strip() or f"Project {index + 1}"
+            quantities = {key: _number(row.get(key), key, 0) for _, key, _ in ap_project_planner.FORMATS}
+            row_rates = {key: _number(row.get(rate), rate, rates[key]) for _, key, rate in ap_project_planner.FORMATS}
+            effort = sum(ap_project_planner.format_efforts(quantities, row_rates).values())
+            max_staff = _number(row.get("max_staff"), "max_staff", 1, int)
+            if max_staff < 1:
+                raise ValueError(f"max_staff of '{name}' must be at least 1.")
+            projects.append(Project(index, name, effort, _number(row.get("priority"), "priority", 0),
+                                    _date(row.get("deadline"), "deadline"),
+                                    _date(row.get("start"), "start") or release, max_staff))
+    return projects
+
+def read_staff(path, holidays):
+    people = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for index, row in enumerate(csv.DictReader(f)):
+            name = (row.get("name") or "").strip() or f"Archivist {index + 1}"
+            fte = _number(row.get("fte"), "fte", 1.0)
+            days = (row.get("days") or "").strip()
+            try:
+                weekdays = sorted({int(day) for day in days.split(",")}) if days else list(workday_calendar.WEEKDAYS)
+                if not all(0 <= day <= 6 for day in weekdays):
+                    raise ValueError
+            except ValueError:
+                raise ValueError(f"Invalid days '{days}' for '{name}'. Please use weekday numbers, e.g. 0,2,4.") from None
+            if fte <= 0 or not weekdays:
+                raise ValueError(f"'{name}' needs an FTE above 0 and at least one working day.")
+            people.append(Person(index, name, fte, weekdays, _date(row.get("start"), "start"), holidays))
+    return people
+
+def schedule(projects, people, start_date):
+    """Runs the simulation; returns the Scheduler with every project's start, end and staff filled in."""
+    return Scheduler(projects, people, start_date).run()
+
+def write_schedule(path, scheduler):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "priority", "effort_days", "start", "end", "deadline", "days_late", "staff"])
+        for project in scheduler.projects:
+            late = (project.end - project.deadline).days if project.end and project.deadline else ""
+            writer.writerow([project.name, f"{project.priority:g}", round(float(project.effort), 2),
+                             project.start or "", project.end or "", project.deadline or "",
+                             max(late, 0) if late != "" else "", "; ".join(project.staff_names)])
+
+def write_utilization(path, scheduler):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "fte", "days_on_projects", "working_days", "utilization"])
+        for person, busy, available in scheduler.utilization():
+            writer.writerow([person.name, f"{person.fte:g}", busy, available,
+                             round(busy / available, 4) if available else ""])
+
+def write_assignments(path, scheduler):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["person", "project", "from", "to"])
+        for person, project, first, last in scheduler.assignments:
+            writer.writerow([person.name, project.name, first, last])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule processing projects over a shared pool of staff.")
+    parser.add_argument("projects_csv", help="Projects: name, priority, deadline, start, max_staff, lin, ami, car, gb")
+    parser.add_argument("staff_csv", help="Staff: name, fte, days, start")
+    parser.add_argument("--start", type=str, help="Portfolio start date (YYYY-MM-DD). Defaults to today")
+    parser.add_argument("--output", help="Path for the project schedule CSV")
+    parser.add_argument("--staff-output", help="Path for the staff utilization CSV")
+    parser.add_argument("--assignments", help="Path for a CSV of who worked on what, and when")
+    for _, name, rate in ap_project_planner.FORMATS:
+        parser.add_argument(f"--{rate}", type=float, default=ap_project_planner.DEFAULT_RATES[name],
+                            help=f"Default rate for --{name}, units per day (Default: {ap_project_planner.DEFAULT_RATES[name]:g})")
+    args = parser.parse_args(argv)
+
+    try:
+        start_date = _date(args.start, "start date") or datetime.date.today()
+        rates = {name: getattr(args, rate) for _, name, rate in ap_project_planner.FORMATS}
+        projects = read_projects(args.projects_csv, rates)
+        people = read_staff(args.staff_csv, holiday_calendars.us_holidays())
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if not people:
+        print("Error: No staff to schedule.")
+        sys.exit(1)
+
+    scheduler = schedule(projects, people, start_date)
+
+    print(f"{'project':<30} {'effort':>8} {'start':>11} {'end':>11} {'late':>5}  staff")
+    for project in projects:
+        late = (project.end - project.deadline).days if project.deadline else 0
+        print(f"{project.name[:30]:<30} {project.effort:>8.1f} {str(project.start):>11} {str(project.end):>11} "
+              f"{max(late, 0) or '':>5}  {', '.join(project.staff_names)}")
+    print()
+    print(f"{'archivist':<30} {'fte':>5} {'on projects':>12} {'working days':>13} {'utilization':>12}")
+    for person, busy, available in scheduler.utilization():
+        share = f"{busy / available:.0%}" if available else "-"
+        print(f"{person.name[:30]:<30} {person.fte:>5g} {busy:>12} {available:>13} {share:>12}")
+
+    late = sum(1 for project in projects if project.deadline and project.end > project.deadline)
+    print(f"\n{len(projects)} projects, {len(people)} staff: done by {scheduler.end_date()}, {late} late")
+
+    for path, write in [(args.output, write_schedule), (args.staff_output, write_utilization),
+                        (args.assignments, write_assignments)]:
+        if path:
+            write(path, scheduler)
+            print(f"Saved '{path}'")
+
+if __name__ == "__main__":
+    main()
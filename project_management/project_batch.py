@@ -0,0 +1,163 @@
+"""
+CSV in, CSV out for project_calculator.py and hybrid_project_calculator.py:
+every row of the input file is one project, and all of them are answered
+in one vectorized pass (workday_calendar.add_working_days_batch) instead
+of one calculate_end_date call per project
+
+input columns:
+    start_date      MM/DD/YY
+    duration        working days, end_date (MM/DD/YY) is added
+    end_date        on rows without a duration: the working days from
+                    start_date to end_date (both included) are added as working_day_count
+    days_per_week   hybrid only, optional: must match working_days
+    working_days    hybrid only: the weekdays worked, e.g. 0,2,4 or Monday,Wednesday,Friday
+                    (Default: Monday-Friday)
+
+every input column is kept; a row that can't be answered gets the reason
+in an "error" column, with the same checks as calculate_end_date
+(start date on a weekend, a holiday or a day that isn't worked...)
+
+run in the command line:
+python3 project_calculator.py --batch projects.csv end_dates.csv
+python3 hybrid_project_calculator.py --batch projects.csv end_dates.csv
+"""
+import csv
+import datetime
+import functools
+
+import holiday_calendars
+import workday_calendar
+
+DAY_NAMES = {
+    'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3, 'friday': 4,
+    'saturday': 5, 'sunday': 6,
+}
+DAY_ABBREVIATIONS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+@functools.lru_cache(maxsize=None)
+def parse_date(date_str):
+    # portfolios repeat the same few hundred start dates, each is parsed once
+    try:
+        return datetime.datetime.strptime(date_str.strip(), '%m/%d/%y').date()
+    except ValueError:
+        return None
+
+@functools.lru_cache(maxsize=None)
+def parse_weekdays(days_str):
+    """'0,2,4' or 'Monday,Wed,Fri' -> (0, 2, 4). Raises ValueError on a weekend or an unknown day."""
+    days = set()
+    for part in days_str.split(','):
+        part = part.strip().lower()
+        if part.isdigit() and 0 <= int(part) <= 6:
+            day = int(part)
+        else:
+            day = next((number for name, number in DAY_NAMES.items() if len(part) >= 3 and name.startswith(part)), None)
+            if day is None:
+                raise ValueError(f"Invalid day '{part}' in working_days. Please use day names (e.g., Monday) "
+                                 f"or numbers (0-4 for weekdays).")
+        if day >= 5:
+            raise ValueError(f"Day '{part}' in working_days is a weekend. Please select only weekdays.")
+        days.add(day)
+    return tuple(sorted(days))
+
+def _weekdays(row, hybrid):
+    if not hybrid:
+        return workday_calendar.WEEKDAYS
+    days_str = (row.get("working_days") or "").strip()
+    weekdays = parse_weekdays(days_str) if days_str else workday_calendar.WEEKDAYS
+    days_per_week = (row.get("days_per_week") or "").strip()
+    if days_per_week and days_per_week != str(len(weekdays)):
+        raise ValueError(f"The number of working days ({len(weekdays)}) does not match "
+                         f"'days per week' ({days_per_week}).")
+    return weekdays
+
+def check_row(row, us_holidays, hybrid=False):
+    """
+    (start date, duration or None, end date or None, weekdays) for one
+    input row. Raises ValueError with the reason the row can't be answered.
+    """
+    start_date = parse_date(row.get("start_date") or "")
+    if not start_date:
+        raise ValueError("Invalid start date format. Please use MM/DD/YY (e.g., 06/05/25).")
+    weekdays = _weekdays(row, hybrid)
+
+    duration = (row.get("duration") or "").strip()
+    if not duration:
+        end_date = parse_date(row.get("end_date") or "")
+        if not end_date:
+            raise ValueError("Give a duration, or an end date in MM/DD/YY.")
+        if end_date < start_date:
+            raise ValueError("End date is before the start date.")
+        return start_date, None, end_date, weekdays
+
+    try:
+        duration = int(duration)
+    except ValueError:
+        raise ValueError(f"Invalid duration '{duration}'. Please use a whole number of working days.") from None
+    if start_date.weekday() >= 5:
+        raise ValueError("Start date cannot be on a weekend. Please choose a weekday.")
+    if start_date in us_holidays:
+        raise ValueError(f"Start date {start_date.strftime('%m/%d/%y')} is a holiday: {us_holidays.get(start_date)}.")
+    if start_date.weekday() not in weekdays:
+        raise ValueError(f"Start date {start_date.strftime('%m/%d/%y')} is not one of the working days "
+                         f"({', '.join(DAY_ABBREVIATIONS[day] for day in weekdays)}).")
+    return start_date, duration, None, weekdays
+
+def answer_rows(rows, hybrid=False):
+    """
+    Adds end_date, working_day_count and error to every row (dicts, changed in
+    place): the end dates of all rows with a duration are worked out in one
+    batch, the working-day counts of the rest in another.
+    """
+    us_holidays = holiday_calendars.us_holidays()
+    ends, counts = [], []  # (row, start, duration or end, weekdays)
+    for row in rows:
+        row.setdefault("end_date", "")
+        row["working_day_count"] = ""
+        row["error"] = ""
+        try:
+            start_date, duration, end_date, weekdays = check_row(row, us_holidays, hybrid)
+        except ValueError as e:
+            row["error"] = str(e)
+            continue
+        if duration is None:
+            counts.append((row, start_date, end_date, weekdays))
+        else:
+            ends.append((row, start_date, duration, weekdays))
+
+    if ends:
+        rows_, starts, durations, weekdays = zip(*ends)
+        end_dates = workday_calendar.add_working_days_batch(starts, durations, weekdays, us_holidays)
+        # numpy writes dates as YYYY-MM-DD, the calculators answer in MM/DD/YY
+        for row, text in zip(rows_, end_dates.astype(str).tolist()):
+            row["end_date"] = f"{text[5:7]}/{text[8:10]}/{text[2:4]}"
+    if counts:
+        rows_, starts, end_dates, weekdays = zip(*counts)
+        working_days = workday_calendar.count_working_days_batch(starts, end_dates, weekdays, us_holidays)
+        for row, count in zip(rows_, working_days.tolist()):
+            row["working_day_count"] = count
+    return rows
+
+def run_csv(input_file, output_file, hybrid=False):
+    """Answers every project in input_file and writes them to output_file. Returns (rows, errors)."""
+    with open(input_file, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames or [])
+        rows = list(reader)
+
+    if "start_date" not in fieldnames or not {"duration", "end_date"} & set(fieldnames):
+        print("Error: The CSV file needs a start_date column and a duration or end_date column.")
+        return 0, 0
+
+    answer_rows(rows, hybrid)
+
+    added = ["end_date", "working_day_count", "error"]
+    fieldnames += [name for name in added if name not in fieldnames]
+    with open(output_file, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+    errors = sum(1 for row in rows if row["error"])
+    print(f"{len(rows)} projects ({errors} with errors) saved to {output_file}")
+    return len(rows), errors
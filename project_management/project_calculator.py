@@ -2,10 +2,15 @@
     a start date
     total number of days 
  calculates the end date 
-  skips holidays and weekends"""
+  skips holidays and weekends
+
+ many projects at once from a CSV file (see project_batch.py):
+  python3 project_calculator.py --batch projects.csv end_dates.csv"""
 
 import datetime
-import holidays 
+import holiday_calendars
+import project_batch
+import workday_calendar
 import argparse
 import sys
 
@@ -26,39 +31,40 @@ def calculate_end_date(start_date_str, duration_days):
     if not start_date:
         return "Error: Invalid start date format. Please use MM/DD/YY (e.g., 06/05/25)."
 
-    us_holidays = holidays.US(years=range(start_date.year, start_date.year + 5))
+    us_holidays = holiday_calendars.us_holidays(start_date.year, start_date.year + 4)
 
     if is_weekend(start_date):
         return "Error: Start date cannot be on a weekend. Please choose a weekday."
     if is_holiday(start_date, us_holidays):
         return f"Error: Start date {start_date} is a holiday: {us_holidays.get(start_date)}."
 
-    current_date = start_date
-    working_days_counted = 0
-
-    while working_days_counted < duration_days:
-        if current_date.weekday() < 5 and current_date not in us_holidays:
-            working_days_counted += 1
-        if working_days_counted == duration_days:
-            break
-        current_date += datetime.timedelta(days=1)
-
-    return current_date.strftime('%m/%d/%y')
+    end_date = workday_calendar.add_working_days(start_date, duration_days, workday_calendar.WEEKDAYS, us_holidays)
+    return end_date.strftime('%m/%d/%y')
 
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:
         parser = argparse.ArgumentParser(description="Calculate project end date (skip weekends and holidays)")
-        parser.add_argument("start_date", type=str, help="Start date in MM/DD/YY")
-        parser.add_argument("duration", type=int, help="Duration in working days")
-        args = parser.parse_args()
+        parser.add_argument("start_date", type=str, nargs='?', help="Start date in MM/DD/YY")
+        parser.add_argument("duration", type=int, nargs='?', help="Duration in working days")
+        parser.add_argument("--batch", nargs=2, metavar=("INPUT_CSV", "OUTPUT_CSV"),
+                            help="Answer every project (start_date, duration or end_date columns) in a CSV file")
+        args = parser.parse_args(argv)
+
+        if args.batch:
+            project_batch.run_csv(*args.batch)
+            return
+        if args.start_date is None or args.duration is None:
+            parser.error("start_date and duration are required (or use --batch)")
 
         start_date_obj = parse_date(args.start_date)
         if not start_date_obj:
             print("Error: Invalid date format. Please use MM/DD/YY.")
             sys.exit(1)
 
-        us_holidays = holidays.US(years=range(start_date_obj.year, start_date_obj.year + 5))
+        us_holidays = holiday_calendars.us_holidays(start_date_obj.year, start_date_obj.year + 4)
 
         if is_weekend(start_date_obj):
             print("Error: Start date cannot be on a weekend.")
@@ -73,7 +79,7 @@ if __name__ == "__main__":
     else:
         # Interactive input
         today_year = datetime.date.today().year
-        us_holidays = holidays.US(years=range(today_year, today_year + 5))
+        us_holidays = holiday_calendars.us_holidays(today_year, today_year + 4)
 
         while True:
             start_date_str = input("Enter start date (MM/DD/YY): ")
@@ -91,4 +97,7 @@ if __name__ == "__main__":
 
         duration = int(input("Enter duration in working days: "))
         end_date = calculate_end_date(start_date_str, duration)
-        print(f"Project starting on {start_date_str} with {duration} working days ends on: {end_date}")
\ No newline at end of file
+        print(f"Project starting on {start_date_str} with {duration} working days ends on: {end_date}")
+
+if __name__ == "__main__":
+    main()
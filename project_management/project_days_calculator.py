@@ -2,7 +2,8 @@
 calculates the total days in a projct
 skips weekends and holidays"""
 
-import holidays
+import holiday_calendars
+import workday_calendar
 import datetime
 import argparse
 import sys
@@ -30,16 +31,10 @@ def parse_working_days(working_days_str):
     return days
 
 def calculate_custom_working_days(start_date, end_date, allowed_weekdays, holiday_calendar):
-    current_date = start_date
-    working_days_count = 0
-    while current_date <= end_date:
-        if current_date.weekday() in allowed_weekdays and current_date not in holiday_calendar:
-            working_days_count += 1
-        current_date += datetime.timedelta(days=1)
-    return working_days_count
+    return workday_calendar.count_working_days(start_date, end_date, allowed_weekdays, holiday_calendar)
 
 def get_us_holidays(start_year, end_year):
-    return holidays.US(years=range(start_year, end_year + 1))
+    return holiday_calendars.us_holidays(start_year, end_year)
 
 def validate_dates(start_date_str, end_date_str, us_holidays):
     start_date = parse_date(start_date_str)
@@ -163,16 +158,19 @@ def run_cli(args):
     duration = calculate_custom_working_days(start_date, end_date, allowed_weekdays, us_holidays)
     print(f"\n Working days between {start_date_str} and {end_date_str} on {working_days_input}: {duration}")
 
-if __name__ == "__main__":
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Calculate project duration skipping weekends and holidays.")
     parser.add_argument("start_date", nargs='?', help="Start date (M/D/YY)")
     parser.add_argument("end_date", nargs='?', help="End date (M/D/YY)")
     parser.add_argument("days_per_week", type=int, nargs='?', help="Number of days per week the project runs (1–5)")
     parser.add_argument("working_days", nargs='?', help="Comma-separated list of days (e.g., Monday,Wednesay,Friday) if < 5 days/week")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.start_date and args.end_date and args.days_per_week:
         run_cli(args)
     else:
         run_interactive()
+
+if __name__ == "__main__":
+    main()
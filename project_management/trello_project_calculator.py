@@ -4,7 +4,8 @@
 
 import requests
 import datetime
-import holidays
+import holiday_calendars
+import workday_calendar
 
 """replace section below with trello credetials
 append .json to find identifer numbers and search for needed field """
@@ -15,8 +16,8 @@ BOARD_ID = 'Board ID'
 DURATION_FIELD_ID = 'Duration ID' # create custon field for project duration
 WORKDAYS_FIELD_ID = 'Workdays ID' # create custon field for days of week
 
-# US holiday calendar
-holiday_calendar = holidays.US(years=range(datetime.datetime.now().year, datetime.datetime.now().year + 5))
+# US holiday calendar, this year and the next four compiled up front (later years are added when looked up)
+holiday_calendar = holiday_calendars.us_holidays(datetime.datetime.now().year, datetime.datetime.now().year + 4)
 
 def parse_trello_date(date_str):
     try:
@@ -30,17 +31,7 @@ def parse_allowed_weekdays(days_str):
     return sorted([day_map[d.strip().lower()[:3]] for d in days_str.split(',') if d.strip().lower()[:3] in day_map])
 
 def calculate_end_date(start_date, duration_days, allowed_weekdays):
-    current_date = start_date
-    working_days_counted = 0
-
-    while working_days_counted < duration_days:
-        if current_date.weekday() in allowed_weekdays and current_date not in holiday_calendar:
-            working_days_counted += 1
-        if working_days_counted == duration_days:
-            break
-        current_date += datetime.timedelta(days=1)
-
-    return current_date
+    return workday_calendar.add_working_days(start_date, duration_days, allowed_weekdays, holiday_calendar)
 
 # Get all cards from the board
 cards_url = f"https://api.trello.com/1/boards/{BOARD_ID}/cards"
@@ -0,0 +1,266 @@
+"""
+working-day arithmetic shared by the project calculators
+
+    add_working_days(start, count, weekdays, holidays)    the count-th working day on or after start
+    count_working_days(start, end, weekdays, holidays)    working days from start to end, both included
+
+a working day is a date whose weekday (0 = Monday) is in weekdays and that
+isn't in holidays (a holiday_calendars calendar, a holidays.US calendar or
+any collection of dates). the answers are the ones the calculators'
+day-by-day loops give, but whole weeks are skipped with arithmetic and
+holidays are counted by bisecting a sorted list, so a five-year project
+costs a handful of steps instead of some 1,800 loop turns with a holiday
+lookup each
+
+holidays are read one year at a time, only for the years a calculation
+reaches; a calendar that grows on lookup (holidays.US, holiday_calendars)
+fills those years in as it does when a date is looked up in it
+
+for many projects at once, the batch versions take arrays (numpy
+datetime64[D] or anything np.asarray turns into one) and answer every
+project in one numpy.busday_offset / busday_count pass per weekday set:
+
+    add_working_days_batch(starts, counts, weekdays, holidays)
+    count_working_days_batch(starts, ends, weekdays, holidays)
+"""
+import bisect
+import datetime
+import functools
+
+WEEKDAYS = (0, 1, 2, 3, 4)  # Monday-Friday
+
+# calendars kept for the (weekdays, holidays) pairs used most recently
+_CACHE_SIZE = 64
+_calendars = {}
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    # only the batch functions need numpy
+    import numpy
+    return numpy
+
+def _weekday(ordinal):
+    # date.fromordinal(1) is a Monday
+    return (ordinal - 1) % 7
+
+def holidays_in_year(holidays, year):
+    """The dates in holidays (None, a calendar or a collection of dates) that fall in year."""
+    if holidays is None:
+        return []
+    if hasattr(holidays, "between"):
+        # a holiday_calendars.HolidayCalendar hands over one year's dates directly
+        return [day for day, _ in holidays.between(datetime.date(year, 1, 1), datetime.date(year, 12, 31))]
+    if hasattr(holidays, "years"):
+        # a holidays calendar fills a year in when a date of that year is looked up
+        datetime.date(year, 1, 1) in holidays
+    return [day for day in holidays if day.year == year]
+
+class WorkdayCalendar:
+    """Working days for one set of weekdays and one holiday calendar."""
+
+    def __init__(self, weekdays=WEEKDAYS, holidays=None):
+        working = {int(day) for day in weekdays}
+        self.mask = tuple(day in working for day in range(7))
+        self.days_per_week = sum(self.mask)
+        self.holidays = holidays
+        self._years = set()
+        self._holidays = []  # ordinals of the holidays that fall on a working weekday, sorted
+
+        # _within[w][k]: working days among the k days starting on weekday w (k = 0..7)
+        # _offset[w][r]: days from a weekday w to the (r + 1)-th working day on or after it
+        self._within, self._offset = [], []
+        for first in range(7):
+            counts, offsets = [0], []
+            for k in range(7):
+                if self.mask[(first + k) % 7]:
+                    offsets.append(k)
+                counts.append(len(offsets))
+            self._within.append(counts)
+            self._offset.append(offsets)
+
+    def _load_years(self, first_year, last_year):
+        added = False
+        for year in range(first_year, last_year + 1):
+            if year in self._years:
+                continue
+            self._years.add(year)
+            for day in holidays_in_year(self.holidays, year):
+                if self.mask[day.weekday()]:
+                    self._holidays.append(day.toordinal())
+                    added = True
+        if added:
+            self._holidays.sort()
+
+    def _holidays_between(self, first, last):
+        """Holidays on working weekdays from ordinal first to last, both included."""
+        self._load_years(datetime.date.fromordinal(first).year, datetime.date.fromordinal(last).year)
+        return bisect.bisect_right(self._holidays, last) - bisect.bisect_left(self._holidays, first)
+
+    def is_working_day(self, date):
+        if not self.mask[date.weekday()]:
+            return False
+        self._load_years(date.year, date.year)
+        ordinal = date.toordinal()
+        index = bisect.bisect_left(self._holidays, ordinal)
+        return index == len(self._holidays) or self._holidays[index] != ordinal
+
+    def count(self, start, end):
+        """Working days from start to end, both included (0 when end is before start)."""
+        first, last = start.toordinal(), end.toordinal()
+        if last < first:
+            return 0
+        weeks, days = divmod(last - first + 1, 7)
+        plain = weeks * self.days_per_week + self._within[_weekday(first)][days]
+        return plain - self._holidays_between(first, last)
+
+    def add(self, start, count):
+        """
+        The count-th working day on or after start (start itself when it is a
+        working day and count is 1); start when count is less than 1.
+        """
+        if count < 1:
+            return start
+        if not self.days_per_week:
+            raise ValueError("No working days in the week.")
+        first, remaining = start.toordinal(), count
+        while True:
+            # the remaining-th working weekday from first, then make up for the holidays on the way
+            weeks, nth = divmod(remaining - 1, self.days_per_week)
+            last = first + 7 * weeks + self._offset[_weekday(first)][nth]
+            remaining = self._holidays_between(first, last)
+            if not remaining:
+                return datetime.date.fromordinal(last)
+            first = last + 1
+
+def calendar_for(weekdays=WEEKDAYS, holidays=None):
+    """A WorkdayCalendar for these weekdays and holidays, reused while the same holidays object is passed."""
+    key = (frozenset(int(day) for day in weekdays), id(holidays))
+    cached = _calendars.get(key)
+    if cached is None or cached.holidays is not holidays:
+        if len(_calendars) >= _CACHE_SIZE:
+            _calendars.clear()
+        cached = _calendars[key] = WorkdayCalendar(weekdays, holidays)
+    return cached
+
+def add_working_days(start, count, weekdays=WEEKDAYS, holidays=None):
+    """The count-th working day on or after start; start when count is less than 1."""
+    return calendar_for(weekdays, holidays).add(start, count)
+
+def count_working_days(start, end, weekdays=WEEKDAYS, holidays=None):
+    """Working days from start to end, both included."""
+    return calendar_for(weekdays, holidays).count(start, end)
+
+# --- batch versions (numpy) ---
+
+def weekmask(weekdays):
+    """'1111100' (numpy's weekmask) for a collection of weekday numbers, 0 = Monday."""
+    working = {int(day) for day in weekdays}
+    return "".join("1" if day in working else "0" for day in range(7))
+
+def _weekmasks(weekdays, size):
+    """
+    (distinct weekmasks, index into them for every project): weekdays is a
+    single collection of weekday numbers (or a '1111100' weekmask) for every
+    project, or one per project.
+    """
+    np = _numpy()
+    if isinstance(weekdays, str):
+        return [weekdays], np.zeros(size, dtype=np.intp)
+    weekdays = list(weekdays)
+    if not weekdays or not isinstance(weekdays[0], (str, list, tuple, set, frozenset, range)):
+        return [weekmask(weekdays)], np.zeros(size, dtype=np.intp)
+    if len(weekdays) != size:
+        raise ValueError(f"Got {len(weekdays)} sets of weekdays for {size} projects.")
+
+    # a portfolio uses a handful of weekday sets, each is turned into a weekmask once
+    numbers, masks, indexes = {}, [], []
+    for days in weekdays:
+        key = days if isinstance(days, str) else tuple(days)
+        number = numbers.get(key)
+        if number is None:
+            mask = days if isinstance(days, str) else weekmask(days)
+            if mask in masks:
+                number = masks.index(mask)
+            else:
+                number = len(masks)
+                masks.append(mask)
+            numbers[key] = number
+        indexes.append(number)
+    return masks, np.array(indexes, dtype=np.intp)
+
+_UNIX_EPOCH = datetime.date(1970, 1, 1).toordinal()
+
+def _dates(values):
+    """values as a datetime64[D] array; lists of datetime.date go through their ordinals, much faster"""
+    np = _numpy()
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+        if values and all(type(value) is datetime.date for value in values):
+            ordinals = np.array([value.toordinal() for value in values], dtype=np.int64)
+            return (ordinals - _UNIX_EPOCH).astype("datetime64[D]")
+    return np.asarray(values, dtype="datetime64[D]")
+
+def _year(day):
+    return _numpy().datetime64(day, "D").astype(object).year
+
+def _by_weekmask(masks, indexes, holidays, years, compute):
+    """Runs compute(busdaycalendar, projects) once for every distinct weekmask."""
+    np = _numpy()
+    holiday_dates = np.array([day for year in range(years[0], years[1] + 1)
+                              for day in holidays_in_year(holidays, year)], dtype="datetime64[D]")
+    for number, mask in enumerate(masks):
+        if "1" not in mask:
+            raise ValueError("No working days in the week.")
+        projects = np.flatnonzero(indexes == number) if len(masks) > 1 else slice(None)
+        compute(np.busdaycalendar(weekmask=mask, holidays=holiday_dates), projects)
+
+def add_working_days_batch(starts, counts, weekdays=WEEKDAYS, holidays=None):
+    """
+    add_working_days for many projects: the counts[i]-th working day on or
+    after starts[i] (starts[i] when counts[i] is less than 1), as a
+    datetime64[D] array. weekdays is one set for every project or one per project.
+    """
+    np = _numpy()
+    starts = _dates(starts)
+    counts = np.asarray(counts, dtype=np.int64)
+    ends = starts.copy()
+    if not starts.size:
+        return ends
+    masks, indexes = _weekmasks(weekdays, starts.size)
+    steps = np.maximum(counts - 1, 0)
+
+    def compute(calendar, projects):
+        ends[projects] = np.busday_offset(starts[projects], steps[projects], roll="forward", busdaycal=calendar)
+
+    # holidays only push an end date later, so once every end date falls in
+    # the years whose holidays were given, each one is exact. the first guess
+    # leaves room for a month of holidays a year
+    per_week = np.array([max(mask.count("1"), 1) for mask in masks])[indexes]
+    latest_guess = (starts + (steps * 7 // per_week) * 13 // 12 + 14).max()
+    first_year, last_year = _year(starts.min()), _year(latest_guess)
+    while True:
+        _by_weekmask(masks, indexes, holidays, (first_year, last_year), compute)
+        latest = _year(ends.max())
+        if latest <= last_year:
+            break
+        last_year = latest + 1
+    return np.where(counts < 1, starts, ends)
+
+def count_working_days_batch(starts, ends, weekdays=WEEKDAYS, holidays=None):
+    """
+    count_working_days for many projects: working days from starts[i] to
+    ends[i], both included (0 when ends[i] is before starts[i]), as an int64 array.
+    """
+    np = _numpy()
+    starts = _dates(starts)
+    ends = _dates(ends)
+    counts = np.zeros(starts.size, dtype=np.int64)
+    if not starts.size:
+        return counts
+    masks, indexes = _weekmasks(weekdays, starts.size)
+
+    def compute(calendar, projects):
+        counts[projects] = np.busday_count(starts[projects], ends[projects] + 1, busdaycal=calendar)
+
+    _by_weekmask(masks, indexes, holidays, (_year(starts.min()), _year(ends.max())), compute)
+    return np.where(ends < starts, 0, counts)
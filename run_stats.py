@@ -0,0 +1,173 @@
+"""
+timing and profiling for the command line scripts (--stats / --profile)
+
+every script's main() opens a session; the work inside is split into named
+phases (read, parse, transform, serialize, write...) so a slow run shows
+where the time goes:
+
+    with run_stats.session(args, "dacs_date_fixer") as stats:
+        with run_stats.phase(stats, "read"):
+            ...
+        stats.count("rows", row_count)
+
+--stats [PATH]   writes a JSON report: wall and CPU seconds per phase,
+                 counts (elements, rows...) and peak memory; without PATH
+                 it goes to stderr, so it doesn't mix with the script's output
+--profile PATH   writes cProfile data to PATH (open with pstats or snakeviz)
+                 and sampled call stacks to PATH.folded, in the collapsed
+                 format flamegraph.pl and speedscope read
+
+library functions take stats=None and use run_stats.phase(stats, name),
+which does nothing when no session is running
+"""
+import cProfile
+import contextlib
+import json
+import sys
+import threading
+import time
+from collections import Counter
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# seconds between call stack samples for the .folded output
+SAMPLE_INTERVAL = 0.005
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+class RunStats:
+    """Collects per-phase wall/CPU time and counts for one run of a script."""
+
+    def __init__(self, script):
+        self.script = script
+        self.phases = {}
+        self.counts = Counter()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Times the block; a phase entered several times adds up."""
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.phases.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "calls": 0})
+            totals["wall_seconds"] += time.perf_counter() - wall_start
+            totals["cpu_seconds"] += time.process_time() - cpu_start
+            totals["calls"] += 1
+
+    def count(self, name, amount=1):
+        self.counts[name] += amount
+
+    def report(self):
+        wall = time.perf_counter() - self._wall_start
+        return {
+            "script": self.script,
+            "argv": sys.argv[1:],
+            "wall_seconds": wall,
+            "cpu_seconds": time.process_time() - self._cpu_start,
+            "peak_rss_mb": peak_rss_mb(),
+            "phases": self.phases,
+            "counts": dict(self.counts),
+            "rates": {f"{name}_per_second": amount / wall for name, amount in self.counts.items() if wall},
+        }
+
+def phase(stats, name):
+    """stats.phase(name), or a no-op when stats is None."""
+    return stats.phase(name) if stats is not None else contextlib.nullcontext()
+
+def count(stats, name, amount=1):
+    if stats is not None:
+        stats.count(name, amount)
+
+class StackSampler:
+    """
+    Samples the main thread's call stack every SAMPLE_INTERVAL seconds and
+    counts identical stacks, for flame graphs (one 'a;b;c count' line each).
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._target = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, samples in self.stacks.most_common():
+                f.write(f"{stack} {samples}\n")
+
+def add_arguments(parser):
+    """Adds --stats and --profile to a script's argparse parser."""
+    parser.add_argument("--stats", nargs="?", const="-", metavar="PATH",
+                        help="Write per-phase timings, counts and peak memory as JSON (Default: stderr)")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Write cProfile data to PATH and collapsed stacks to PATH.folded")
+
+def write_report(stats, path):
+    text = json.dumps(stats.report(), indent=2)
+    if path == "-":
+        print(text, file=sys.stderr)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+@contextlib.contextmanager
+def session(args, script):
+    """
+    Runs the body of a script's main() with the instrumentation asked for on
+    the command line. Yields a RunStats, or None when neither flag is set.
+    The report and profile are written even if the run fails.
+    """
+    stats_path = getattr(args, "stats", None)
+    profile_path = getattr(args, "profile", None)
+    if not stats_path and not profile_path:
+        yield None
+        return
+
+    stats = RunStats(script)
+    profiler = sampler = None
+    if profile_path:
+        sampler = StackSampler()
+        sampler.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield stats
+    finally:
+        if profiler:
+            profiler.disable()
+            sampler.stop()
+            profiler.dump_stats(profile_path)
+            sampler.write(profile_path + ".folded")
+        if stats_path:
+            write_report(stats, stats_path)
@@ -2,62 +2,145 @@
 """then script formats the <unitdate> into DACS compliant formatting and deletes <unittitle> if it's empty"""
 """also adds 'inclusive' attribites to the <unitdate> field"""
 """run in the command line: python3 file.xml newfile.xml"""
+"""add --backend lxml to work on an lxml tree instead of BeautifulSoup (much faster on large files)"""
+"""add --stats for parse/transform/serialize timings as JSON, --profile out.prof to profile the run"""
+"""every component level (c, c01-c12) is handled, each from the <unittitle> and <unitdate> in its own <did>"""
 
 from bs4 import BeautifulSoup
 import re
-from datetime import datetime
+import ead_lxml
+import run_stats
+from dacs_dates import MONTH_NUMBERS
+
+# bump when a change alters the output, so cached results are rebuilt
+TRANSFORM_VERSION = "2"
+
+COMPONENT_TAGS = ["c"] + [f"c{level:02d}" for level in range(1, 13)]
+# component tags in any namespace, for root.iter (an XPath local-name() test over
+# elements nested in each other sorts its results and gets slow on deep documents)
+COMPONENT_ELEMENTS = tuple(f"{{*}}{tag}" for tag in COMPONENT_TAGS)
+# month name + day at the start of a title, like "March 1"
+TITLE_DATE_RE = re.compile(r"([A-Za-z]+)\s+(\d{1,2})")
 
 def normalize_date(year, month, day):
     """Return normal attribute in YYYY-MM-DD format."""
-    month_num = datetime.strptime(month, "%B").month
+    month_num = MONTH_NUMBERS.get(month.lower())
+    if month_num is None:
+        raise ValueError(f"'{month}' is not a month name")
     return f"{year}-{month_num:02d}-{int(day):02d}"
 
-def process_xml(xml_content):
-    soup = BeautifulSoup(xml_content, "xml")
+def split_title_date(title_text, year_text):
+    """
+    For a title like "March 1" and a year like "1950" returns
+    (new unitdate text, normal attribute, remaining title text), else None.
+    """
+    # Match month + day like "March 1"; titles like "Box 12" are left alone
+    match = TITLE_DATE_RE.match(title_text)
+    if match and year_text.isdigit() and match.group(1).lower() in MONTH_NUMBERS:
+        month, day = match.groups()
+        year = year_text
 
-    for component in soup.find_all(["c", "c01", "c02", "c03", "c04", "c05", "c06", "c07"]):
-        unittitle = component.find("unittitle")
-        unitdate = component.find("unitdate")
+        # Format according to DACS
+        new_text = f"{year} {month} {int(day)}"
+        normal_attr = normalize_date(year, month, day)
 
-        if unittitle and unitdate:
-            title_text = unittitle.get_text(strip=True)
-            year_text = unitdate.get_text(strip=True)
+        # Remove the date from the start of the unittitle text
+        new_unittitle = title_text[match.end():].strip()
+        return new_text, normal_attr, new_unittitle
+    return None
 
-            # Match month + day like "March 1" 
-            match = re.match(r"([A-Za-z]+)\s+(\d{1,2})", title_text)
-            if match and year_text.isdigit():
-                month, day = match.groups()
-                year = year_text
+def process_soup(soup):
+    """moves split dates into <unitdate> in an already parsed document, in place"""
+    for component in soup.find_all(COMPONENT_TAGS):
+        # only the component's own <did>: a search of all descendants would
+        # let a series take the title or date of its first file
+        did = component.find("did", recursive=False)
+        if did is None:
+            continue
+        unittitle = did.find("unittitle")
+        unitdate = did.find("unitdate")
 
-                # Format according to DACS
-                new_text = f"{year} {month} {int(day)}"
-                normal_attr = normalize_date(year, month, day)
+        if unittitle and unitdate:
+            split = split_title_date(unittitle.get_text(strip=True), unitdate.get_text(strip=True))
+            if split:
+                new_text, normal_attr, new_unittitle = split
 
                 # Replace unitdate text and add attributes
                 unitdate.string = new_text
                 unitdate["type"] = "inclusive"
                 unitdate["normal"] = normal_attr
 
-                # Remove the date from unittitle text
-                new_unittitle = re.sub(rf"{month}\s+{day}", "", title_text).strip()
                 if new_unittitle:
                     unittitle.string = new_unittitle
                 else:
                     unittitle.decompose()
 
-    return str(soup)
+    return soup
 
-if __name__ == "__main__":
+def process_tree(root):
+    """lxml version of process_soup, for an ead_lxml.parse() root"""
+    for component in root.iter(*COMPONENT_ELEMENTS):
+        did = component.find("{*}did")
+        if did is None:
+            continue
+        unittitle = next(did.iter("{*}unittitle"), None)
+        unitdate = next(did.iter("{*}unitdate"), None)
+
+        if unittitle is not None and unitdate is not None:
+            split = split_title_date(ead_lxml.element_text(unittitle), ead_lxml.element_text(unitdate))
+            if split:
+                new_text, normal_attr, new_unittitle = split
+
+                ead_lxml.set_text(unitdate, new_text)
+                unitdate.set("type", "inclusive")
+                unitdate.set("normal", normal_attr)
+
+                if new_unittitle:
+                    ead_lxml.set_text(unittitle, new_unittitle)
+                else:
+                    ead_lxml.remove_element(unittitle)
+
+    return root
+
+def process_xml(xml_content, backend="bs4", stats=None):
+    if backend == "lxml":
+        with run_stats.phase(stats, "parse"):
+            root = ead_lxml.parse(xml_content)
+        if stats:
+            stats.count("elements", ead_lxml.element_count(root))
+        with run_stats.phase(stats, "transform"):
+            process_tree(root)
+        with run_stats.phase(stats, "serialize"):
+            return ead_lxml.serialize(root)
+
+    with run_stats.phase(stats, "parse"):
+        soup = BeautifulSoup(xml_content, "xml")
+    if stats:
+        stats.count("elements", len(soup.find_all(True)))
+    with run_stats.phase(stats, "transform"):
+        process_soup(soup)
+    with run_stats.phase(stats, "serialize"):
+        return str(soup)
+
+def main(argv=None):
     import argparse
     parser = argparse.ArgumentParser(description="Move dates from unittitle into unitdate")
     parser.add_argument("input", help="Input XML file")
     parser.add_argument("output", help="Output XML file")
-    args = parser.parse_args()
+    parser.add_argument("--backend", choices=["bs4", "lxml"], default="bs4", help="XML library to use (Default: bs4)")
+    run_stats.add_arguments(parser)
+    args = parser.parse_args(argv)
 
-    with open(args.input, "r", encoding="utf-8") as f:
-        xml_content = f.read()
+    with run_stats.session(args, "title-date_combine") as stats:
+        with run_stats.phase(stats, "read"):
+            with open(args.input, "r", encoding="utf-8") as f:
+                xml_content = f.read()
 
-    updated_xml = process_xml(xml_content)
+        updated_xml = process_xml(xml_content, args.backend, stats)
 
-    with open(args.output, "w", encoding="utf-8") as f:
-        f.write(updated_xml)
\ No newline at end of file
+        with run_stats.phase(stats, "write"):
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(updated_xml)
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,42 @@
 """script that pareses XML file for <unittitle> and capitializes the first letter of each word"""
 """Similar to the =PROPER() function in excel/google sheets"""
 
+import argparse
 from bs4 import BeautifulSoup
 
+# bump when a change alters the output, so cached results are rebuilt
+TRANSFORM_VERSION = "1"
+
 def proper_title(tag):
 
     for element in tag.contents:
         if isinstance(element, str):
             tag.string = element.title()
 
+def proper_title_soup(soup):
+    """applies proper_title to every <unittitle> in a parsed document, in place"""
+    for unittitle in soup.find_all('unittitle'):
+        proper_title(unittitle)
+
+    return soup
+
 def process_xml(input_file, output_file):
 
     with open(input_file, 'r') as file:
         soup = BeautifulSoup(file, 'xml')
 
-    for unittitle in soup.find_all('unittitle'):
-        proper_title(unittitle)
+    proper_title_soup(soup)
 
     with open(output_file, 'w', encoding='utf-8') as file:
         file.write(str(soup))
 
-input_filename = 'input.xml'
-output_filename = 'output.xml'
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Capitalize the first letter of each word in <unittitle>.")
+    parser.add_argument("input", nargs="?", default="input.xml", help="Input XML file (Default: input.xml)")
+    parser.add_argument("output", nargs="?", default="output.xml", help="Output XML file (Default: output.xml)")
+    args = parser.parse_args(argv)
+
+    process_xml(args.input, args.output)
 
-process_xml(input_filename, output_filename)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
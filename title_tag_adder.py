@@ -1,29 +1,163 @@
 """"script to add <title> tags to fileds in an excel file"""
 """can be revised to add different types of tags to use for ASpace processing spreadsheets"""
 """run in the command line: python3 inputfile.xlsx outputfile.xlsx column index number"""
+"""several columns are wrapped in the same run: python3 title_tag_adder.py in.xlsx out.xlsx 2 5 7"""
+"""add --tag emph (or any tag name) to wrap with a different tag; .csv files work as input and output"""
+"""add --stream for very large sheets: rows are read and written in chunks of --chunk-size rows,
+   so the whole sheet is never in memory"""
 
-import pandas as pd
 import argparse
+import csv
+import os
+# pandas and openpyxl are imported in the functions that use them, so --help starts quickly
 
-def wrap_with_title_tag(input_file, output_file, column_index):
-    df = pd.read_excel(input_file)
+# rows wrapped together in --stream mode
+CHUNK_SIZE = 10000
 
-    if column_index < 0 or column_index >= len(df.columns):
-        raise IndexError(f"Column index {column_index} is out of range.")
+def wrap_values(values, tag='title'):
+    """
+    Wraps every non-empty value of a Series with <tag></tag>; missing and
+    blank values are left as they are.
+    """
+    text = values.astype(str)
+    wrap = values.notna() & text.str.strip().ne("")
+    return values.mask(wrap, f"<{tag}>" + text + f"</{tag}>")
 
-    col_name = df.columns[column_index]
+def _column_indexes(column_index, column_count):
+    indexes = [column_index] if isinstance(column_index, int) else list(column_index)
+    for index in indexes:
+        if index < 0 or index >= column_count:
+            raise IndexError(f"Column index {index} is out of range.")
+    return indexes
 
-    df[col_name] = df[col_name].apply(
-        lambda x: f"<title>{x}</title>" if pd.notna(x) and str(x).strip() != "" else x
-    )
-    df.to_excel(output_file, index=False)
-    print(f" Updated Excel file saved as '{output_file}'.")
+def _is_csv(path):
+    return os.path.splitext(path)[1].lower() == '.csv'
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Wrap text in a column (by index) with <title> tags.")
-    parser.add_argument("input_file", help="Path to input Excel file (.xlsx)")
-    parser.add_argument("output_file", help="Path to save the output Excel file")
-    parser.add_argument("column_index", type=int, help="Zero-based index of the column to wrap")
+def read_rows(input_file):
+    """Yields the rows of a CSV file or of the first sheet of an .xlsx file, header first."""
+    if _is_csv(input_file):
+        with open(input_file, 'r', newline='', encoding='utf-8') as f:
+            yield from csv.reader(f)
+        return
+
+    import openpyxl
+    workbook = openpyxl.load_workbook(input_file, read_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+class RowWriter:
+    """Appends rows to a CSV file or to a write-only .xlsx workbook."""
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        if _is_csv(output_file):
+            self.file = open(output_file, 'w', newline='', encoding='utf-8')
+            self.writer = csv.writer(self.file)
+            self.workbook = None
+        else:
+            import openpyxl
+            self.workbook = openpyxl.Workbook(write_only=True)
+            self.writer = self.workbook.create_sheet('Sheet1')
+
+    def write_rows(self, rows):
+        if self.workbook is None:
+            self.writer.writerows(rows)
+        else:
+            for row in rows:
+                self.writer.append(row)
+
+    def close(self):
+        if self.workbook is None:
+            self.file.close()
+        else:
+            self.workbook.save(self.output_file)
+
+def wrap_chunk(rows, column_indexes, tag='title'):
+    """Wraps the given columns of a list of rows, a column at a time."""
+    import pandas as pd
+    width = max(column_indexes) + 1
+    rows = [list(row) + [None] * (width - len(row)) if len(row) < width else list(row) for row in rows]
+    for index in column_indexes:
+        wrapped = wrap_values(pd.Series([row[index] for row in rows], dtype=object), tag)
+        for row, value in zip(rows, wrapped.tolist()):
+            row[index] = value
+    return rows
+
+def stream_wrap_tags(input_file, output_file, column_index, tag='title', chunk_size=CHUNK_SIZE):
+    """
+    wrap_with_title_tag, reading and writing chunk_size rows at a time
+    (openpyxl read-only and write-only modes for .xlsx files). Returns the
+    number of data rows.
+    """
+    rows = read_rows(input_file)
+    header = next(rows, None)
+    if header is None:
+        raise IndexError("The input file is empty.")
+    column_indexes = _column_indexes(column_index, len(header))
 
-    args = parser.parse_args()
-    wrap_with_title_tag(args.input_file, args.output_file, args.column_index)
+    writer = RowWriter(output_file)
+    row_count = 0
+    try:
+        writer.write_rows([header])
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                writer.write_rows(wrap_chunk(chunk, column_indexes, tag))
+                row_count += len(chunk)
+                chunk = []
+        writer.write_rows(wrap_chunk(chunk, column_indexes, tag))
+        row_count += len(chunk)
+    finally:
+        writer.close()
+    return row_count
+
+def wrap_with_title_tag(input_file, output_file, column_index, tag='title', stream=False, chunk_size=CHUNK_SIZE):
+    """
+    Wraps the values in column_index (a zero-based index or a list of them)
+    with <tag></tag>. .csv files are read and written as CSV, anything else
+    as Excel.
+    """
+    if stream:
+        stream_wrap_tags(input_file, output_file, column_index, tag, chunk_size)
+        print(f" Updated file saved as '{output_file}'.")
+        return
+
+    import pandas as pd
+    if _is_csv(input_file):
+        df = pd.read_csv(input_file, dtype=str, keep_default_na=False)
+    else:
+        df = pd.read_excel(input_file)
+
+    for index in _column_indexes(column_index, len(df.columns)):
+        col_name = df.columns[index]
+        df[col_name] = wrap_values(df[col_name], tag)
+
+    if _is_csv(output_file):
+        df.to_csv(output_file, index=False)
+    else:
+        df.to_excel(output_file, index=False)
+    print(f" Updated file saved as '{output_file}'.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wrap text in columns (by index) with <title> tags.")
+    parser.add_argument("input_file", help="Path to input Excel file (.xlsx) or CSV file")
+    parser.add_argument("output_file", help="Path to save the output file (.xlsx or .csv)")
+    parser.add_argument("column_index", type=int, nargs='+', help="Zero-based index of the column(s) to wrap")
+    parser.add_argument("--tag", default="title", help="Tag to wrap the values with (Default: title)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Read and write the sheet in chunks instead of loading it whole")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help=f"Rows per chunk with --stream (Default: {CHUNK_SIZE})")
+
+    args = parser.parse_args(argv)
+    try:
+        wrap_with_title_tag(args.input_file, args.output_file, args.column_index, args.tag,
+                            args.stream, args.chunk_size)
+    except IndexError as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()